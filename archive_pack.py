@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Dienas XML paziņojumi vienā meklējamā arhīvā bez atarhivēšanas
+
+tar.gz ir viena nepārtraukta gzip plūsma - atsevišķu failu nevar nolasīt,
+neatspiežot visu iepriekšējo. Tāpēc arhīvs vienreiz tiek pārpakots: katrs
+XML fails tiek saspiests kā atsevišķs gzip posms un pierakstīts
+DD_MM_YYYY.xmlpack failam (tas joprojām ir derīgs vairāku posmu .gz fails).
+Blakus JSON indeksā katram failam ir saspiestā posma nobīde un garums, tāpēc
+meklētājs nolasa tikai vajadzīgo paziņojumu un XML_DIR nav tūkstošiem sīku
+failu.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import tarfile
+import threading
+from pathlib import Path
+
+# Dienas arhīvs XML failu mapē: DD_MM_YYYY.xmlpack un DD_MM_YYYY.xmlpack.json
+PACK_SUFFIX = '.xmlpack'
+INDEX_SUFFIX = '.json'
+PACK_VERSION = 1
+
+COMPRESS_LEVEL = 6
+
+
+def pack_path_for(folder):
+    """Dienas mapes arhīva ceļš (EIS-XML-Files/DD_MM_YYYY -> EIS-XML-Files/DD_MM_YYYY.xmlpack)"""
+    folder = Path(folder)
+    return folder.with_name(folder.name + PACK_SUFFIX)
+
+
+def pack_index_path(pack_path):
+    """Arhīva nobīžu indeksa ceļš"""
+    pack_path = Path(pack_path)
+    return pack_path.with_name(pack_path.name + INDEX_SUFFIX)
+
+
+def _load_index(pack_path):
+    """{nosaukums: [nobīde, garums, izmērs]} vai None, ja indeksa nav vai tas ir citas versijas"""
+    try:
+        with open(pack_index_path(pack_path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != PACK_VERSION:
+        return None
+    return data['members']
+
+
+def _tar_members(tar):
+    """XML faili no tar plūsmas: (nosaukums, dati, mtime)"""
+    for member in tar:
+        if not member.isfile() or not member.name.endswith('.xml'):
+            continue
+        # Drošības pārbaude - izvairās no path traversal
+        if os.path.isabs(member.name) or ".." in member.name:
+            logging.warning(f"Izlaižu potenciāli bīstamu failu: {member.name}")
+            continue
+        with tar.extractfile(member) as source:
+            yield os.path.basename(member.name), source.read(), member.mtime
+
+
+def _write_pack(pack_path, items, replace):
+    """Ieraksta failus arhīvā, atgriež pievienoto failu skaitu
+
+    Jauns vai aizstājams arhīvs tiek rakstīts pagaidu failā un pārvietots vietā
+    (os.replace) pirms indeksa, tāpēc lasītāji un pārtraukta pārpakošana nekad
+    neredz daļēji pārrakstītu arhīvu. Esošam arhīvam faili tiek pievienoti
+    beigās - vecās nobīdes paliek derīgas, un indekss tiek aizstāts pēc datiem.
+    """
+    pack_path = Path(pack_path)
+    members = None if replace else _load_index(pack_path)
+    if members is None:
+        members = {}
+        target = pack_path.with_name(f"{pack_path.name}.{os.getpid()}.tmp")
+        mode = 'wb'
+    else:
+        target = pack_path
+        mode = 'ab'
+
+    added = 0
+    try:
+        with open(target, mode) as pack:
+            # Nobīde - arī pēc pārtrauktas pievienošanas, kuras dati nav indeksā
+            offset = pack.seek(0, io.SEEK_END)
+            for name, data, mtime in items:
+                block = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=mtime)
+                pack.write(block)
+                members[name] = [offset, len(block), len(data)]
+                offset += len(block)
+                added += 1
+        if target != pack_path:
+            os.replace(target, pack_path)
+    except BaseException:
+        if target != pack_path:
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+        raise
+
+    index_path = pack_index_path(pack_path)
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': PACK_VERSION, 'members': members}, f)
+    os.replace(tmp_path, index_path)
+    return added
+
+
+def pack_archive(tar_path, pack_path, replace=False):
+    """Pārpako tar.gz XML failus dienas arhīvā, atgriež pievienoto failu skaitu
+
+    Bez replace faili tiek pievienoti esošajam arhīvam (vairāki arhīvi vienā
+    dienā), ar replace - arhīvs tiek izveidots no jauna.
+    """
+    with tarfile.open(tar_path, 'r|gz') as tar:
+        added = _write_pack(pack_path, _tar_members(tar), replace)
+    logging.info(f"Pārpakoti {added} XML faili no {os.path.basename(tar_path)} arhīvā {Path(pack_path).name}")
+    return added
+
+
+def pack_folder(folder, pack_path=None):
+    """Pārpako atarhivētas dienas mapes XML failus arhīvā (mapi nedzēš)"""
+    folder = Path(folder)
+    pack_path = pack_path or pack_path_for(folder)
+
+    def items():
+        for xml_path in sorted(folder.glob('*.xml')):
+            yield xml_path.name, xml_path.read_bytes(), int(xml_path.stat().st_mtime)
+
+    added = _write_pack(pack_path, items(), replace=True)
+    logging.info(f"Pārpakoti {added} XML faili no mapes {folder.name} arhīvā {Path(pack_path).name}")
+    return added
+
+
+def remove_pack(folder):
+    """Dzēš dienas mapes arhīvu un tā indeksu"""
+    pack_path = pack_path_for(folder)
+    for path in (pack_path, pack_index_path(pack_path)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class PackMember:
+    """Viens XML fails dienas arhīvā (name un parent - kā Path dienas mapē)"""
+
+    __slots__ = ('pack', 'name')
+
+    def __init__(self, pack, name):
+        self.pack = pack
+        self.name = name
+
+    @property
+    def parent(self):
+        return self.pack.folder
+
+    def read_bytes(self):
+        return self.pack.read(self.name)
+
+    def __str__(self):
+        return f"{self.pack.path}:{self.name}"
+
+    def __repr__(self):
+        return f"PackMember({str(self)!r})"
+
+
+class ArchivePack:
+    """Dienas arhīva lasītājs - XML fails tiek atspiests pēc nobīdes indeksā"""
+
+    def __init__(self, pack_path, members):
+        self.path = Path(pack_path)
+        self.folder = self.path.with_name(self.path.name[:-len(PACK_SUFFIX)])
+        self.members = members
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_folder(cls, folder):
+        """Dienas mapes arhīvs vai None, ja tā nav"""
+        pack_path = pack_path_for(folder)
+        if not pack_path.exists():
+            return None
+        # Fails tiek atvērts pirms indeksa nolasīšanas - aizstāts arhīvs paliek
+        # pieejams lasītājam, kas to jau atvēris
+        try:
+            handle = open(pack_path, 'rb')
+        except OSError:
+            return None
+        members = _load_index(pack_path)
+        if members is None:
+            handle.close()
+            return None
+        pack = cls(pack_path, members)
+        pack._file = handle
+        return pack
+
+    def xml_files(self):
+        """Arhīva XML faili nosaukumu secībā"""
+        return [PackMember(self, name) for name in sorted(self.members)]
+
+    def member(self, name):
+        return PackMember(self, name)
+
+    def read(self, name):
+        """Atspiež vienu XML failu (nolasa tikai tā posmu)"""
+        offset, length, _ = self.members[name]
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            self._file.seek(offset)
+            block = self._file.read(length)
+        return gzip.decompress(block)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+tar.gz arhīva atarhivēšana tieši no FTP plūsmas
+
+Lejupielādes gabali tiek vienlaikus rakstīti arhīva failā un nodoti
+atsevišķam pavedienam, kas tos atspiež (tarfile 'r|' virs gzip) un ieraksta
+katru XML failu dienas mapē, tiklīdz tas saņemts. Tā atspiešana notiek
+paralēli tīkla pārsūtīšanai un arhīvs pēc lejupielādes nav jālasa no diska.
+
+gzip plūsma tiek nolasīta līdz beigām, tāpēc CRC32 un garums tiek pārbaudīti
+tāpat kā ftp_pool.verify_archive; SHA-256 tiek aprēķināta no saņemtajiem
+baitiem. Ja plūsma tiek pārtraukta (piem., lejupielāde atsākta no sākuma),
+finish() atgriež None un arhīvs jāatarhivē no diska kā līdz šim.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import queue
+import tarfile
+import threading
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveStream:
+    """Atarhivē saņemtos arhīva gabalus pavedienā; XML faili tiek rakstīti xml_date_dir"""
+
+    def __init__(self, xml_date_dir, queue_size=64):
+        self.xml_date_dir = Path(xml_date_dir)
+        self.xml_date_dir.mkdir(parents=True, exist_ok=True)
+        self.received = 0
+        self.extracted = 0
+        self.error = None
+        self.done = False
+        self._digest = hashlib.sha256()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._buffer = bytearray()
+        self._eof = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def feed(self, position, chunk):
+        """Nākamais arhīva gabals (ftp_pool on_chunk); pārrāvums plūsmā to pārtrauc"""
+        if self._closed:
+            return
+        if position != self.received:
+            self.error = self.error or ValueError(f"plūsma pārtraukta pie {self.received}, turpinājums no {position}")
+            self.close()
+            return
+        self.received += len(chunk)
+        self._digest.update(chunk)
+        self._queue.put(bytes(chunk))
+
+    def read(self, size=-1):
+        """Lasīšana atspiešanas pavedienam (bloķē, līdz dati saņemti)"""
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._queue.get()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _run(self):
+        try:
+            with gzip.GzipFile(fileobj=self, mode='rb') as gz:
+                with tarfile.open(fileobj=gz, mode='r|') as tar:
+                    for member in tar:
+                        self._write_member(tar, member)
+                # Atlikušie baiti - gzip pārbauda CRC32 un garumu tikai plūsmas beigās
+                while gz.read(CHUNK_SIZE):
+                    pass
+            self.done = True
+        except Exception as e:
+            self.error = self.error or e
+            # Izlasa atlikušo, lai feed() nenobloķētos pie pilnas rindas
+            while not self._eof:
+                self._eof = self._queue.get() is None
+
+    def _write_member(self, tar, member):
+        """Ieraksta XML failu mapē (atomāri - caur pagaidu failu)"""
+        if not member.isfile() or not member.name.endswith('.xml'):
+            return
+        # Drošības pārbaude - izvairās no path traversal
+        if os.path.isabs(member.name) or ".." in member.name:
+            logging.warning(f"Izlaižu potenciāli bīstamu failu: {member.name}")
+            return
+
+        name = os.path.basename(member.name)
+        final_path = self.xml_date_dir / name
+        tmp_path = self.xml_date_dir / f".{name}.tmp"
+        with tar.extractfile(member) as source, open(tmp_path, 'wb') as target:
+            while True:
+                data = source.read(CHUNK_SIZE)
+                if not data:
+                    break
+                target.write(data)
+        os.utime(tmp_path, (member.mtime, member.mtime))
+        os.replace(tmp_path, final_path)
+        self.extracted += 1
+
+    def close(self):
+        """Plūsmas beigas (atkārtoti izsaukumi tiek ignorēti)"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+
+    def finish(self):
+        """Gaida atarhivēšanas beigas; atgriež XML failu skaitu vai None, ja plūsma nav pilnīga"""
+        self.close()
+        self._thread.join()
+        if not self.done or self.error is not None:
+            logging.info(f"Plūsmas atarhivēšana {self.xml_date_dir.name} neizdevās: {self.error}")
+            return None
+        return self.extracted
+
+    def sha256(self):
+        """Saņemto baitu SHA-256"""
+        return self._digest.hexdigest()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Trigrammu indekss pasūtītāju nosaukumiem - contracting_authorities filtrs
+
+Filtra vārdi ir nosaukumu daļas ("pašvaldīb", "sporta centr"). Katram
+normalizētajam nosaukumam tiek saglabāti tā trigrammi, un vārda kandidāti
+ir visu tā trigrammu sarakstu šķēlums; tikai tie tiek pārbaudīti ar
+apakšvirknes meklēšanu. Rezultāts tiek kešots katram atšķirīgajam
+nosaukumam, jo tie paši pasūtītāji atkārtojas daudzos paziņojumos.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+
+from prefilter import CASE_FOLD_EXTRA
+from text_normalizer import normalize_latvian_text
+
+
+def normalize_authority(name):
+    """Nosaukums salīdzināšanai - mazie burti, bez garumzīmēm, vienkāršas atstarpes"""
+    return ' '.join(normalize_latvian_text(name).translate(CASE_FOLD_EXTRA).split())
+
+
+def trigrams(text):
+    """Visas teksta trīs rakstzīmju apakšvirknes"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class AuthorityIndex:
+    """Atšķirīgie pasūtītāju nosaukumi un trigrammu saraksti (nosaukumu ID augošā secībā)"""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.normalized = []
+        self.ids = {}
+        self.postings = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        """Pievieno nosaukumu (ja vēl nav), atgriež tā ID"""
+        name_id = self.ids.get(name)
+        if name_id is not None:
+            return name_id
+
+        name_id = len(self.names)
+        normalized = normalize_authority(name)
+        self.names.append(name)
+        self.normalized.append(normalized)
+        self.ids[name] = name_id
+        for gram in trigrams(normalized):
+            self.postings.setdefault(gram, array('i')).append(name_id)
+        return name_id
+
+    def search(self, pattern, start=0):
+        """Nosaukumu ID (sākot no start), kuros ir pattern (normalizēts) kā apakšvirkne"""
+        pattern = normalize_authority(pattern)
+        grams = trigrams(pattern)
+        if not grams:
+            # Īsāks par trigrammu - jāpārbauda visi nosaukumi
+            candidates = range(start, len(self.names))
+        else:
+            # Saraksti ir augošā secībā - vecākie ID tiek izlaisti ar bisect
+            lists = []
+            for gram in grams:
+                posting = self.postings.get(gram, ())
+                lists.append(posting[bisect_left(posting, start):])
+            lists.sort(key=len)
+            if not lists[0]:
+                return set()
+            candidates = set(lists[0])
+            for posting in lists[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return set()
+
+        return {name_id for name_id in candidates if pattern in self.normalized[name_id]}
+
+
+class AuthorityFilter:
+    """contracting_authorities filtrs ar rezultātu kešu katram nosaukumam
+
+    Tukšs vārdu saraksts nozīmē, ka filtrs netiek piemērots.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = [pattern for pattern in patterns if normalize_authority(pattern)]
+        self.index = AuthorityIndex()
+        self._matching_ids = set()
+        self._checked = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def _refresh(self):
+        """Pārbauda indeksā kopš pēdējās reizes pievienotos nosaukumus"""
+        if self._checked == len(self.index):
+            return
+        for pattern in self.patterns:
+            self._matching_ids |= self.index.search(pattern, self._checked)
+        self._checked = len(self.index)
+
+    def allowed(self, names):
+        """Nosaukumi no names, kas atbilst filtram (visi uzreiz - caur indeksa šķēlumiem)"""
+        if not self.patterns:
+            return set(names)
+        with self._lock:
+            for name in names:
+                self.index.add(name or '')
+            self._refresh()
+            return {name for name in names if self.index.ids[name or ''] in self._matching_ids}
+
+    def matches(self, name):
+        """Vai pasūtītāja nosaukums atbilst kādam filtra vārdam"""
+        if not self.patterns:
+            return True
+        name = name or ''
+        result = self._cache.get(name)
+        if result is None:
+            result = name in self.allowed([name])
+            self._cache[name] = result
+        return result
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Atslēgvārdu salīdzināšanas mērījums - dokumenti sekundē pirms un pēc CompiledCriteria
+"""
+
+import json
+import random
+import re
+import time
+
+from local_procurement_searcher import OptimizedLocalSearcher
+from text_normalizer import NormalizedText
+
+WORDS = ('piegāde iegāde remontdarbi būvniecība pakalpojumi sporta inventārs skolas '
+         'ģimnāzijas pašvaldība dome ceļu uzturēšana datortehnika programmatūra '
+         'apkure ūdensapgāde elektroenerģija transportlīdzekļi medicīnas ierīces '
+         'mēbeles tīrīšana apsardze ēdināšana konsultācijas projektēšana zāles '
+         'akumulatori rezerves daļas degviela apdrošināšana mācības').split()
+
+
+def legacy_text_contains_keyword(searcher, text, keyword):
+    """Iepriekšējā _text_contains_keyword versija (variācijas katram dokumentam)"""
+    text_lower = text.lower()
+    text_normalized = searcher.normalize_latvian_text(text)
+
+    if ' ' in keyword:
+        for word in keyword.split():
+            word_found = False
+            for variation in searcher.create_word_variations(word):
+                pattern = r'\b' + re.escape(variation) + r'\b'
+                if re.search(pattern, text_lower, re.IGNORECASE):
+                    word_found = True
+                    break
+            if not word_found:
+                return False
+        return True
+
+    for variation in searcher.create_word_variations(keyword):
+        pattern = r'\b' + re.escape(variation) + r'\b'
+        if re.search(pattern, text_lower, re.IGNORECASE):
+            return True
+
+        pattern_norm = r'\b' + re.escape(searcher.normalize_latvian_text(variation)) + r'\b'
+        if re.search(pattern_norm, text_normalized, re.IGNORECASE):
+            return True
+
+    return False
+
+
+def make_documents(count, seed=1):
+    """Sintētiski latviešu teksti (nosaukums, apraksts, pasūtītājs)"""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 40))]
+        if rng.random() < 0.5:
+            words = [word.upper() if rng.random() < 0.2 else word for word in words]
+        docs.append(' '.join(words))
+    return docs
+
+
+def load_keywords():
+    """Atslēgvārdi no config.json vai noklusējuma saraksts"""
+    try:
+        with open('config.json', encoding='utf-8') as f:
+            criteria = json.load(f).get('search_criteria', {})
+    except FileNotFoundError:
+        criteria = {}
+    keywords = criteria.get('keywords') or ['sporta inventārs', 'trenažieri', 'skola', 'akumulators']
+    excludes = criteria.get('exclude_keywords') or ['apdrošināšana']
+    return keywords, excludes
+
+
+def main():
+    keywords, excludes = load_keywords()
+    searcher = OptimizedLocalSearcher(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': keywords, 'exclude_keywords': excludes}
+    docs = make_documents(2000)
+
+    start = time.perf_counter()
+    legacy = []
+    for doc in docs:
+        matched = [kw for kw in keywords if legacy_text_contains_keyword(searcher, doc, kw)]
+        excluded = any(legacy_text_contains_keyword(searcher, doc, ex) for ex in excludes)
+        legacy.append((matched, excluded))
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    criteria = searcher.get_compiled_criteria()
+    compiled = []
+    for doc in docs:
+        normalized = NormalizedText(doc)
+        compiled.append((criteria.matched_keywords(normalized), criteria.is_excluded(normalized)))
+    compiled_time = time.perf_counter() - start
+
+    assert compiled == legacy
+
+    stem_searcher = OptimizedLocalSearcher(config={'parse_cache': False, 'keyword_matcher': 'stem'})
+    stem_searcher.search_criteria = searcher.search_criteria
+    start = time.perf_counter()
+    stem_criteria = stem_searcher.get_compiled_criteria()
+    for doc in docs:
+        normalized = NormalizedText(doc)
+        stem_criteria.matched_keywords(normalized), stem_criteria.is_excluded(normalized)
+    stem_time = time.perf_counter() - start
+
+    print(f"Dokumenti: {len(docs)}, atslēgvārdi: {keywords}, izslēgtie: {excludes}\n")
+    print(f"{'Versija':<20}{'dok./s':>12}")
+    print(f"{'pirms':<20}{len(docs) / legacy_time:>12.0f}")
+    print(f"{'CompiledCriteria':<20}{len(docs) / compiled_time:>12.0f}")
+    print(f"{'celmi (stem)':<20}{len(docs) / stem_time:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
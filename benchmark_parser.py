@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+XML parsētāja veiktspējas mērījums - koka gājienu skaits un ātrums
+Salīdzina koka režīmu (lauku plāns uz pilna koka) ar iterparse plūsmas režīmu
+un ar sākotnējo find_element meklēšanu (katram tagam './/' meklēšana un
+daļējas atbilstības gājiens pa visu koku), kuru aizstāja tagu indekss un pēc
+tam lauku plāni.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from local_procurement_searcher import FIELD_PLANS, ImprovedXMLParser, USE_LXML, detect_layout
+
+
+class WalkCounter:
+    """Apvalks ap root elementu, kas skaita pilnus koka gājienus"""
+
+    def __init__(self, root):
+        self._root = root
+        self.walks = 0
+
+    def iter(self, *args):
+        self.walks += 1
+        return self._root.iter(*args)
+
+    def find(self, path, *args):
+        if path.startswith('.//'):
+            self.walks += 1
+        return self._root.find(path, *args)
+
+    def findall(self, path, *args):
+        if path.startswith('.//'):
+            self.walks += 1
+        return self._root.findall(path, *args)
+
+    def __iter__(self):
+        return iter(self._root)
+
+    def __len__(self):
+        return len(self._root)
+
+    def __getattr__(self, name):
+        return getattr(self._root, name)
+
+
+def _plan_tags(plan):
+    """Lauku plāna beigu tagi - tie paši lauki, ko meklēja find_element"""
+    for value in plan.values():
+        if isinstance(value, dict):
+            yield from _plan_tags(value)
+            continue
+        for path in value:
+            tag = path.split('/@')[0].rstrip('/').split('/')[-1]
+            if tag not in ('', '.', '*'):
+                yield tag
+
+
+LEGACY_TAGS = {layout: list(dict.fromkeys(_plan_tags(plan))) for layout, plan in FIELD_PLANS.items()}
+
+
+def legacy_lookups(root):
+    """Sākotnējā find_element meklēšana visiem plāna laukiem (salīdzinājumam)"""
+    found = {}
+    for tag in LEGACY_TAGS[detect_layout(root)]:
+        elem = root.find(f".//{tag}")
+        if elem is None:
+            # Daļēja atbilstība - gājiens pa visu koku
+            for candidate in root.iter():
+                if isinstance(candidate.tag, str) and tag.lower() in candidate.tag.lower():
+                    elem = candidate
+                    break
+        found[tag] = elem
+    return found
+
+
+def measure_walks(paths, lookup=None):
+    """Vidējais pilno koka gājienu skaits uz paziņojumu lauku izvilkšanā"""
+    parser = ImprovedXMLParser()
+    lookup = lookup or parser.parse_root
+    walks = 0
+    for path in paths:
+        counter = WalkCounter(parser.load_root(str(path)))
+        lookup(counter)
+        walks += counter.walks
+    return walks / len(paths)
+
+
+def measure_lookups(paths, lookup, rounds):
+    """Sekundes lauku izvilkšanai no jau ielādētiem kokiem rounds reizes"""
+    parser = ImprovedXMLParser()
+    roots = [parser.load_root(str(path)) for path in paths]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for root in roots:
+            lookup(root)
+    return time.perf_counter() - start
+
+
+def measure(paths, streaming, rounds):
+    """Sekundes, lai parsētu visus failus rounds reizes"""
+    parser = ImprovedXMLParser()
+    parse = parser.parse_xml_streaming if streaming else parser.parse_xml_comprehensive
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            parse(str(path))
+    return time.perf_counter() - start
+
+
+def main():
+    xml_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path('EIS-XML-Files')
+    paths = sorted(xml_dir.rglob('*.xml'))[:2000] if xml_dir.exists() else []
+    if not paths:
+        paths = [Path('768142.xml')]
+
+    rounds = max(1, 2000 // len(paths))
+
+    print(f"Paziņojumi: {len(paths)}, atkārtojumi: {rounds}, lxml: {USE_LXML}\n")
+
+    walks = measure_walks(paths)
+    legacy_walks = measure_walks(paths, legacy_lookups)
+    tree_time = measure(paths, streaming=False, rounds=rounds)
+    stream_time = measure(paths, streaming=True, rounds=rounds)
+    plan_lookup_time = measure_lookups(paths, ImprovedXMLParser().parse_root, rounds)
+    legacy_lookup_time = measure_lookups(paths, legacy_lookups, rounds)
+
+    total = len(paths) * rounds
+    print(f"Pilni koka gājieni uz paziņojumu: {walks:.1f} (find_element: {legacy_walks:.1f})\n")
+    print(f"{'Lauku izvilkšana':<20}{'paziņ./s':>12}")
+    print(f"{'lauku plāni':<20}{total / plan_lookup_time:>12.0f}")
+    print(f"{'find_element':<20}{total / legacy_lookup_time:>12.0f}")
+    print(f"Paātrinājums: {legacy_lookup_time / plan_lookup_time:.1f}x\n")
+    print(f"{'Režīms':<20}{'paziņ./s':>12}")
+    print(f"{'koks':<20}{total / tree_time:>12.0f}")
+    print(f"{'plūsma':<20}{total / stream_time:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Paralēlās meklēšanas mērījums - pavedienu un procesu režīms ar 1..N darbiniekiem
+Ja nav norādīta EIS-XML-Files mape, izveido sintētisku 90 dienu korpusu no 768142.xml
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from local_procurement_searcher import OptimizedLocalSearcher
+
+TITLES = ['Akumulatoru piegāde', 'Sporta inventāra iegāde', 'Ceļa remontdarbi', 'Datortehnikas noma']
+
+
+def build_corpus(xml_dir, days=90, per_day=40, start_date='2025-04-01'):
+    """Izveido dienu mapes (DD_MM_GGGG) ar 768142.xml variantiem, atgriež beigu datumu"""
+    template = Path(__file__).with_name('768142.xml').read_text(encoding='utf-8')
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    for day in range(days):
+        date = start + timedelta(days=day)
+        folder = Path(xml_dir) / date.strftime('%d_%m_%Y')
+        folder.mkdir(parents=True, exist_ok=True)
+        for n in range(per_day):
+            notice_id = f"{day:03d}{n:03d}"
+            content = (template
+                       .replace('<id>768142</id>', f'<id>{notice_id}</id>')
+                       .replace('LDZ 2025/39-SPAV', f'LDZ 2025/{notice_id}')
+                       .replace('Akumulatoru piegāde', TITLES[n % len(TITLES)]))
+            (folder / f'{notice_id}.xml').write_text(content, encoding='utf-8')
+    return (start + timedelta(days=days - 1)).strftime('%Y-%m-%d')
+
+
+def measure(xml_dir, mode, workers, start_date, end_date):
+    """Sekundes un rezultātu skaits vienai meklēšanai"""
+    config = {
+        'search_criteria': {'keywords': ['akumulators', 'sporta'], 'cpv_codes': []},
+        'parallel_mode': mode,
+        'parse_cache': False
+    }
+    searcher = OptimizedLocalSearcher(config=config, xml_dir=xml_dir)
+    searcher.num_workers = workers
+
+    start = time.perf_counter()
+    results = searcher.search_date_range_parallel(start_date, end_date)
+    return time.perf_counter() - start, len(results)
+
+
+def main():
+    workdir = None
+    if len(sys.argv) > 2:
+        xml_dir, start_date, end_date = sys.argv[1], sys.argv[2], sys.argv[3]
+    else:
+        workdir = tempfile.mkdtemp()
+        xml_dir, start_date = workdir, '2025-04-01'
+        end_date = build_corpus(xml_dir, start_date=start_date)
+
+    try:
+        cores = os.cpu_count() or 1
+        print(f"Korpuss: {xml_dir} ({start_date} - {end_date}), kodoli: {cores}\n")
+        print(f"{'Režīms':<10}{'darbinieki':>12}{'sekundes':>12}{'rezultāti':>12}")
+
+        for mode in ('thread', 'process'):
+            workers = 1
+            while True:
+                seconds, count = measure(xml_dir, mode, workers, start_date, end_date)
+                print(f"{mode:<10}{workers:>12}{seconds:>12.2f}{count:>12}")
+                if workers >= cores:
+                    break
+                workers = min(workers * 2, cores)
+    finally:
+        if workdir:
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Kompilēti meklēšanas kritēriji - atslēgvārdu variācijas tiek izveidotas un
+apvienotas regulārajās izteiksmēs vienreiz meklēšanas sākumā, nevis katram dokumentam
+"""
+
+import re
+
+from authority_index import AuthorityFilter
+from contract_value import value_in_range, value_limit_cents
+from cpv_index import clean_cpv, cpv_matches
+from latvian_stemmer import StemmedText, StemPattern
+from text_normalizer import as_normalized
+
+
+def trie_regex(words):
+    """Regulārā izteiksme vārdu kopai, kas veidota no prefiksu koka
+
+    Variācijām ir kopīgs sākums (vārda sakne), tāpēc koks ir daudz īsāks
+    par vienkāršu alternāciju un re to pārbauda ātrāk.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_node_regex(trie)
+
+
+def _trie_node_regex(node):
+    """Viena prefiksu koka mezgla izteiksme"""
+    optional = '' in node
+    branches = [re.escape(char) + _trie_node_regex(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    if len(branches) == 1 and len(node) == 2 and len(branches[0]) == 1:
+        return branches[0] + '?'
+
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if optional else pattern
+
+
+def word_pattern(variations):
+    """Izteiksme, kas atrod jebkuru variāciju kā veselu vārdu"""
+    return re.compile(r'\b(?:' + trie_regex(variations) + r')\b', re.IGNORECASE)
+
+
+class KeywordPattern:
+    """Viena atslēgvārda (vai frāzes) kompilētā izteiksme
+
+    Vienam vārdam pietiek ar normalizēto tekstu: ja variācija ir tekstā ar
+    garumzīmēm, tās normalizētā forma ir normalizētajā tekstā tajā pašā vietā.
+    Frāzēm katram vārdam jābūt tekstā bez normalizācijas (kā iepriekš).
+    """
+
+    def __init__(self, keyword, create_word_variations, normalize_text):
+        self.keyword = keyword
+        self.is_phrase = ' ' in keyword
+
+        if self.is_phrase:
+            self.word_variations = [create_word_variations(word) for word in keyword.split()]
+            self.patterns = [word_pattern(variations) for variations in self.word_variations]
+            self.normalized = {normalize_text(v) for variations in self.word_variations for v in variations}
+        else:
+            self.normalized = {normalize_text(v) for v in create_word_variations(keyword)}
+            self.patterns = [word_pattern(self.normalized)]
+
+    def matches(self, doc):
+        """Vai atslēgvārds ir tekstā (NormalizedText)"""
+        if self.is_phrase:
+            return all(pattern.search(doc.lower) for pattern in self.patterns)
+        return self.patterns[0].search(doc.normalized) is not None
+
+
+class CompiledCriteria:
+    """Meklēšanas kritēriji ar kompilētām atslēgvārdu izteiksmēm
+
+    Variāciju režīmā (matcher='variants') vispirms viena kopēja izteiksme
+    pārbauda, vai tekstā ir kaut viens atslēgvārds; lielākajai daļai
+    dokumentu ar to pietiek. Tikai tad, ja kaut kas atrasts, tiek
+    noskaidrots, kuri tieši atslēgvārdi sakrita.
+
+    Celmu režīmā (matcher='stem') teksts tiek sadalīts vārdos un celmots
+    vienreiz, vienvārda atslēgvārds ir celmu kopas pārbaude, frāze - celmu
+    secības pārbaude.
+
+    Ar cpv_hierarchy meklētais CPV kods atrod arī visus savus apakšlīmeņus
+    (37400000 -> 374xxxxx), citādi kodiem jāsakrīt precīzi.
+    """
+
+    def __init__(self, search_criteria, create_word_variations, normalize_text, matcher='variants',
+                 cpv_hierarchy=False):
+        self.normalize_text = normalize_text
+        self.matcher = matcher
+        self.cpv_hierarchy = cpv_hierarchy
+        self.show_all = bool(search_criteria.get('show_all', False))
+
+        if matcher == 'stem':
+            make_pattern = lambda keyword: StemPattern(keyword, normalize_text)
+        else:
+            make_pattern = lambda keyword: KeywordPattern(keyword, create_word_variations, normalize_text)
+
+        self.keywords = [make_pattern(kw) for kw in search_criteria.get('keywords', [])]
+        self.exclude_keywords = [make_pattern(ex) for ex in search_criteria.get('exclude_keywords', [])]
+
+        if matcher == 'stem':
+            self.any_keyword = self.any_exclude = None
+        else:
+            self.any_keyword = self._any_pattern(self.keywords)
+            self.any_exclude = self._any_pattern(self.exclude_keywords)
+
+        # Attīrīti CPV kodi (bez kontrolcipara)
+        self.cpv_codes = [clean_cpv(cpv) for cpv in search_criteria.get('cpv_codes', [])]
+
+        # Pasūtītāju nosaukumu daļas (trigrammu indekss, rezultāts kešots katram nosaukumam)
+        self.authorities = AuthorityFilter(search_criteria.get('contracting_authorities', []))
+
+        # Summas robežas centos (None - bez ierobežojuma)
+        self.min_cents = value_limit_cents(search_criteria.get('min_value'))
+        self.max_cents = value_limit_cents(search_criteria.get('max_value'))
+
+    def _any_pattern(self, patterns):
+        """Kopēja izteiksme visām normalizētajām variācijām"""
+        variations = set()
+        for pattern in patterns:
+            variations |= pattern.normalized
+        # Tukšs atslēgvārds vai tukša frāze - ātrā pārbaude nav iespējama
+        if not variations or '' in variations or any(not p.patterns for p in patterns):
+            return None
+        return word_pattern(variations)
+
+    def _matching(self, patterns, any_pattern, text):
+        """Atslēgvārdi no patterns, kas ir tekstā, kritēriju secībā"""
+        if not patterns:
+            return []
+
+        doc = as_normalized(text)
+        if self.matcher == 'stem':
+            # Celmi tiek aprēķināti vienreiz dokumentam (atslēgvārdiem un izslēgtajiem vārdiem)
+            if doc.stemmed is None:
+                doc.stemmed = StemmedText(doc.normalized)
+            return [p.keyword for p in patterns if p.matches(doc.stemmed)]
+
+        if any_pattern is not None and not any_pattern.search(doc.normalized):
+            return []
+
+        return [p.keyword for p in patterns if p.matches(doc)]
+
+    def matched_keywords(self, text):
+        """Atslēgvārdi, kas atrodami tekstā (virkne vai NormalizedText)"""
+        return self._matching(self.keywords, self.any_keyword, text)
+
+    def is_excluded(self, text):
+        """Vai tekstā ir kāds no izslēgtajiem vārdiem (virkne vai NormalizedText)"""
+        return bool(self._matching(self.exclude_keywords, self.any_exclude, text))
+
+    def matched_cpv_codes(self, cpv_codes):
+        """Meklētie CPV kodi, kas ir dokumenta kodu sarakstā (kritēriju secībā)"""
+        if not self.cpv_hierarchy:
+            return [cpv for cpv in self.cpv_codes if cpv in cpv_codes]
+        return [cpv for cpv in self.cpv_codes
+                if any(cpv_matches(cpv, code, True) for code in cpv_codes)]
+
+    def value_matches(self, cents, currency):
+        """Vai paziņojuma summa (centos) atbilst min_value/max_value"""
+        return value_in_range(cents, currency, self.min_cents, self.max_cents)
+
+    def matching_notice_cpv_codes(self, cpv_codes):
+        """Dokumenta CPV kodi, kas atbilst kādam meklētajam kodam (dokumenta secībā)"""
+        return [code for code in cpv_codes
+                if any(cpv_matches(cpv, code, self.cpv_hierarchy) for cpv in self.cpv_codes)]
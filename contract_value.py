@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Līguma summas veselos centos un valūtas kods - min/max summas filtri
+
+Summa tiek normalizēta parsēšanas laikā (value_cents, currency_code), un
+korpusa summu indekss ir sakārtots masīvs, kurā diapazons ir divi bisect.
+Filtri salīdzina tikai EUR summas (vai summas bez valūtas - EIS tās ir EUR);
+paziņojumi bez summas vai citā valūtā netiek izslēgti.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# EIS skaitliskie valūtu kodi
+EIS_CURRENCY_CODES = {
+    '1': 'LVL',
+    '2': 'EUR',
+}
+
+# Valūtas, kuru summas tiek salīdzinātas ar filtra robežām
+FILTER_CURRENCIES = ('EUR', '')
+
+
+def parse_cents(value_str):
+    """Summa veselos centos no teksta ('4790.4', '12 345,67', '1.234,50') vai None"""
+    if value_str is None:
+        return None
+    text = str(value_str).replace('\xa0', '').replace(' ', '').strip()
+    if not text:
+        return None
+
+    # Ja ir gan punkts, gan komats, decimālatdalītājs ir pēdējais no tiem
+    if ',' in text and '.' in text:
+        decimal_sep = ',' if text.rfind(',') > text.rfind('.') else '.'
+        thousands_sep = '.' if decimal_sep == ',' else ','
+        text = text.replace(thousands_sep, '').replace(decimal_sep, '.')
+    else:
+        text = text.replace(',', '.')
+
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    return int((amount * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def normalize_currency(code):
+    """ISO valūtas kods (EIS skaitliskie kodi tiek pārveidoti, nezināmie paliek kā ir)"""
+    code = (code or '').strip()
+    return EIS_CURRENCY_CODES.get(code, code.upper())
+
+
+def notice_value_cents(info):
+    """Paziņojuma summa centos - value, ja nav, tad value_max vai value_min"""
+    for key in ('value', 'value_max', 'value_min'):
+        cents = parse_cents(info.get(key))
+        if cents is not None:
+            return cents
+    return None
+
+
+def value_limit_cents(value):
+    """Filtra robeža (EUR) centos; 0, tukšs vai None - bez ierobežojuma"""
+    if value in (None, '', 0):
+        return None
+    cents = parse_cents(value)
+    if cents is None or cents < 0:
+        raise ValueError(f"Nederīga summa: {value}")
+    return cents or None
+
+
+def value_in_range(cents, currency, min_cents=None, max_cents=None):
+    """Vai summa ir filtra robežās (nezināma summa vai cita valūta - vienmēr)"""
+    if cents is None or currency not in FILTER_CURRENCIES:
+        return True
+    if min_cents is not None and cents < min_cents:
+        return False
+    if max_cents is not None and cents > max_cents:
+        return False
+    return True
+
+
+def apply_value_filter(search_criteria, payload):
+    """Ieraksta /api/search pieprasījuma min_value/max_value meklēšanas kritērijos
+
+    Kļūdainas vai pretrunīgas robežas - ValueError (atbilde 400).
+    """
+    min_cents = value_limit_cents(payload.get('min_value'))
+    max_cents = value_limit_cents(payload.get('max_value'))
+    if min_cents is not None and max_cents is not None and min_cents > max_cents:
+        raise ValueError("Minimālā summa ir lielāka par maksimālo")
+
+    for key, cents in (('min_value', min_cents), ('max_value', max_cents)):
+        if cents is None:
+            search_criteria.pop(key, None)
+        else:
+            search_criteria[key] = cents / 100
+    return search_criteria
+
+
+class ValueIndex:
+    """Salīdzināmās summas (centos) un paziņojumu ID sakārtotos paralēlos masīvos"""
+
+    def __init__(self, pairs=()):
+        pairs = sorted(set(pairs))
+        self.cents = array('q', (cents for cents, _ in pairs))
+        self.ids = array('q', (notice_id for _, notice_id in pairs))
+
+    def __len__(self):
+        return len(self.cents)
+
+    def in_range(self, min_cents=None, max_cents=None):
+        """Paziņojumi ar summu robežās (ieskaitot)"""
+        lo = 0 if min_cents is None else bisect_left(self.cents, min_cents)
+        hi = len(self.cents) if max_cents is None else bisect_right(self.cents, max_cents)
+        return set(self.ids[lo:hi])
+
+    def outside(self, min_cents=None, max_cents=None):
+        """Paziņojumi ar zināmu summu ārpus robežām (tos filtrs izslēdz)"""
+        lo = 0 if min_cents is None else bisect_left(self.cents, min_cents)
+        hi = len(self.cents) if max_cents is None else bisect_right(self.cents, max_cents)
+        return set(self.ids[:lo]) | set(self.ids[hi:])
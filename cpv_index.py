@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Hierarhisks CPV kodu indekss - kods -> paziņojumu ID sakārtotos masīvos
+
+CPV koda līmeni nosaka beigu nulles: 37000000 ir nodaļa, 37400000 grupa,
+37410000 klase, 37411000 kategorija. Meklējot 37400000, der visi kodi ar
+prefiksu 374, un sakārtotā masīvā tas ir viens intervāls (bisect).
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Īsākais nozīmīgais prefikss - nodaļa (divi cipari)
+DIVISION_LENGTH = 2
+
+
+def clean_cpv(code):
+    """CPV kods bez kontrolcipara (31400000-4 -> 31400000)"""
+    return code.split('-')[0] if '-' in code else code
+
+
+def cpv_prefix(code):
+    """Nozīmīgā koda daļa bez beigu nullēm (37400000 -> 374, 45000000 -> 45)"""
+    code = clean_cpv(code).strip()
+    if not code.isdigit():
+        return code
+    return code.rstrip('0').ljust(DIVISION_LENGTH, '0')
+
+
+def cpv_matches(search_code, notice_code, hierarchy=False):
+    """Vai paziņojuma kods atbilst meklētajam (hierarhijā - arī apakšlīmeņi)"""
+    if hierarchy:
+        return notice_code.startswith(cpv_prefix(search_code))
+    return notice_code == clean_cpv(search_code)
+
+
+class CpvIndex:
+    """CPV kodi un paziņojumu ID divos paralēlos sakārtotos masīvos
+
+    codes[i] ir kods, ids[i] - paziņojums, kurā tas ir. Pāri sakārtoti pēc
+    koda, tāpēc visi prefiksa kodi ir blakus un tiek atrasti ar bisect.
+    """
+
+    def __init__(self, pairs=()):
+        pairs = sorted(set(pairs))
+        self.codes = [code for code, _ in pairs]
+        self.ids = array('q', (notice_id for _, notice_id in pairs))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def exact(self, code):
+        """Paziņojumi ar tieši šo kodu"""
+        code = clean_cpv(code)
+        return set(self.ids[bisect_left(self.codes, code):bisect_right(self.codes, code)])
+
+    def prefix(self, prefix):
+        """Paziņojumi ar jebkuru kodu, kas sākas ar prefix"""
+        # Visi kodi ar šo prefiksu ir starp prefix un prefix + lielākā rakstzīme
+        lo = bisect_left(self.codes, prefix)
+        hi = bisect_left(self.codes, prefix + '\U0010ffff', lo)
+        return set(self.ids[lo:hi])
+
+    def lookup(self, search_code, hierarchy=False):
+        """Paziņojumi, kas atbilst meklētajam kodam"""
+        if hierarchy:
+            return self.prefix(cpv_prefix(search_code))
+        return self.exact(search_code)
+
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Dienu mapju manifests - XML failu saraksts, izmēri un paziņojumu skaits
+katrai EIS-XML-Files/<DD_MM_GGGG> mapei
+
+Manifestu raksta lejupielādētājs pēc atarhivēšanas. Meklēšana un statusa
+pārbaude to nolasa, nevis katru reizi pārlasa visu mapju saturu - katrai
+dienai pietiek ar vienu mapes stat (mtime salīdzināšanai).
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+# Manifesta datnes nosaukums XML failu (EIS-XML-Files) mapē
+MANIFEST_FILE_NAME = 'manifest.json'
+
+MANIFEST_VERSION = 1
+
+
+class DateManifest:
+    """Dienu mapju manifests (JSON datne XML failu mapē)"""
+
+    def __init__(self, xml_dir):
+        self.xml_dir = Path(xml_dir)
+        self.path = self.xml_dir / MANIFEST_FILE_NAME
+        self._days = None
+        self._mtime_ns = None
+
+    def exists(self):
+        """Vai manifests jau ir izveidots"""
+        return self.path.exists()
+
+    def days(self):
+        """Visi ieraksti {mapes nosaukums: ieraksts} (nolasīti no jauna, ja datne mainīta)"""
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+
+        if self._days is None or mtime_ns != self._mtime_ns:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._days = data.get('days', {}) if data.get('version') == MANIFEST_VERSION else {}
+            except (OSError, ValueError) as e:
+                logging.error(f"Kļūda lasot manifestu {self.path}: {e}")
+                self._days = {}
+            self._mtime_ns = mtime_ns
+        return self._days
+
+    def _save(self, days):
+        """Saglabā manifestu (atomāri - caur pagaidu datni)"""
+        self.xml_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'days': days}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._days = days
+        self._mtime_ns = self.path.stat().st_mtime_ns
+
+    def record_folder(self, folder, notice_count=None):
+        """Ieraksta mapes failu sarakstu (izsauc pēc atarhivēšanas)"""
+        folder = Path(folder)
+        files = []
+        for entry in sorted(os.scandir(folder), key=lambda entry: entry.name):
+            if entry.name.endswith('.xml') and entry.is_file():
+                files.append([entry.name, entry.stat().st_size])
+
+        try:
+            date = datetime.strptime(folder.name, '%d_%m_%Y').strftime('%Y-%m-%d')
+        except ValueError:
+            date = ''
+
+        days = dict(self.days())
+        days[folder.name] = {
+            'date': date,
+            'files': files,
+            'xml_count': len(files),
+            'total_bytes': sum(size for _, size in files),
+            'notice_count': len(files) if notice_count is None else notice_count,
+            'folder_mtime_ns': folder.stat().st_mtime_ns,
+            'updated': datetime.now().isoformat(),
+        }
+        self._save(days)
+        return days[folder.name]
+
+    def remove_folder(self, folder):
+        """Izņem mapi no manifesta (izsauc, kad mape tiek dzēsta)"""
+        days = dict(self.days())
+        if days.pop(Path(folder).name, None) is None:
+            return False
+        self._save(days)
+        return True
+
+    def current_entry(self, folder):
+        """Mapes ieraksts, ja mape kopš tā ierakstīšanas nav mainīta, citādi None"""
+        entry = self.days().get(Path(folder).name)
+        if entry is None:
+            return None
+        try:
+            if Path(folder).stat().st_mtime_ns != entry['folder_mtime_ns']:
+                return None
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def xml_files(self, folder):
+        """Mapes XML faili no manifesta vai None, ja ieraksts nav aktuāls"""
+        entry = self.current_entry(folder)
+        if entry is None:
+            return None
+        folder = Path(folder)
+        return [folder / name for name, _ in entry['files']]
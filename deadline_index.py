@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Iesniegšanas termiņi kā dienas kopš 1970-01-01 - deadline_status filtrs
+
+Termiņš tiek pārveidots vienreiz parsēšanas laikā (deadline_day), un
+meklēšanā to salīdzina ar šodienas dienas numuru, kas tiek noteikts katras
+meklēšanas sākumā (ilgi strādājošā lietotnē pēc pusnakts mainās arī tas).
+Termiņš ir aktīvs visu tā dienu; paziņojumi bez termiņa vienmēr ir aktīvi.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from datetime import date
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Datumu formāti parsētājā (GGGGMMDD, GGGG-MM-DD, DD.MM.GGGG, DD/MM/GGGG) - gads, mēnesis, diena
+DATE_FORMATS = (
+    (re.compile(r'^(\d{4})(\d{2})(\d{2})$'), (1, 2, 3)),
+    (re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$'), (1, 2, 3)),
+    (re.compile(r'^(\d{1,2})\.(\d{1,2})\.(\d{4})$'), (3, 2, 1)),
+    (re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$'), (3, 2, 1)),
+)
+
+ISO_DATE = DATE_FORMATS[1][0]
+
+
+def _make_date(match, order):
+    """Datums no regulārās izteiksmes grupām vai None, ja tāda datuma nav"""
+    year, month, day = (int(match.group(i)) for i in order)
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def format_date(date_str):
+    """Datums formātā GGGG-MM-DD (nezināms formāts - oriģinālais teksts)"""
+    if not date_str:
+        return ''
+    for pattern, order in DATE_FORMATS:
+        match = pattern.match(date_str)
+        if match:
+            parsed = _make_date(match, order)
+            if parsed is not None:
+                return parsed.isoformat()
+    return date_str
+
+
+def epoch_day(value):
+    """Dienas numurs (date vai datetime) kopš 1970-01-01"""
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def today_epoch_day():
+    """Šodienas (vietējais laiks) dienas numurs"""
+    return epoch_day(date.today())
+
+
+def deadline_epoch_day(deadline_str):
+    """Termiņš (GGGG-MM-DD) kā dienas numurs vai None, ja to nevar nolasīt"""
+    match = ISO_DATE.match(deadline_str or '')
+    if not match:
+        return None
+    parsed = _make_date(match, (1, 2, 3))
+    return None if parsed is None else epoch_day(parsed)
+
+
+def is_active_day(deadline_day, today):
+    """Vai termiņš nav beidzies (nezināms termiņš - aktīvs)"""
+    return deadline_day is None or deadline_day >= today
+
+
+class DeadlineIndex:
+    """Zināmie termiņi (dienas) un paziņojumu ID sakārtotos paralēlos masīvos"""
+
+    def __init__(self, pairs=()):
+        pairs = sorted(set(pairs))
+        self.days = array('i', (day for day, _ in pairs))
+        self.ids = array('q', (notice_id for _, notice_id in pairs))
+
+    def __len__(self):
+        return len(self.days)
+
+    def expired(self, today):
+        """Paziņojumi, kuru termiņš ir pirms šodienas"""
+        return set(self.ids[:bisect_left(self.days, today)])
+
+    def active(self, today):
+        """Paziņojumi ar zināmu termiņu šodien vai vēlāk"""
+        return set(self.ids[bisect_left(self.days, today):])
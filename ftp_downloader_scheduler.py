@@ -15,6 +15,17 @@ import time
 import shutil
 import tarfile
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from parse_cache import ParseCache, CACHE_FILE_NAME
+from notice_index import NoticeIndex, INDEX_FILE_NAME
+from notice_snapshot import write_snapshot, remove_snapshot
+from date_manifest import DateManifest
+from result_cache import DataGeneration
+from ftp_pool import FTPConnectionPool, PART_SUFFIX, verify_archive
+from ftp_listing import MonthListingCache, archive_changed
+from archive_stream import ArchiveStream
+from archive_pack import pack_archive, pack_folder, pack_path_for, remove_pack
 
 # Logging konfigurācija
 logging.basicConfig(
@@ -38,6 +49,19 @@ class FTPDownloader:
         self.metadata_file = self.download_dir / 'download_metadata.json'
         self.days_to_download = 90  # Lejupielādē pēdējo 90 dienu failus
         self.days_to_keep = 90  # Glabā failus 90 dienas
+        self.ftp_connections = 4  # Paralēlie lejupielādes savienojumi
+        self.ftp_retries = 3  # Atkārtojumi pārejošām kļūdām
+        self.extract_workers = 1  # Atarhivēšanas darbinieki
+        self.stream_extract = True  # Atarhivē XML failus jau lejupielādes laikā
+        self.pack_archives = False  # XML failu vietā - dienas arhīvs ar nobīžu indeksu (archive_pack)
+        self.pack_after_days = 30  # Jaunākās dienas paliek mapēs (indekss, momentuzņēmumi, manifests)
+        
+        # Datu paaudze - meklētāja rezultātu kešs izmanto tikai pašreizējās paaudzes ierakstus
+        self.data_generation = DataGeneration(self.xml_dir)
+        self.data_changed = False
+        
+        # Mēneša mapju saraksti (viena lejupielādes gājiena laikā)
+        self.listings = None
         
     def connect_ftp(self):
         """Pieslēdzas FTP serverim"""
@@ -75,13 +99,22 @@ class FTPDownloader:
         return dates
         
     def download_file(self, remote_path, local_path):
-        """Lejupielādē failu no FTP"""
+        """Lejupielādē failu no FTP (pagaidu failā, turpinot ar REST; vietā - pēc pārbaudes)"""
+        part_path = local_path.with_name(local_path.name + PART_SUFFIX)
         try:
             # Izveido direktoriju, ja neeksistē
             local_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(local_path, 'wb') as f:
-                self.ftp.retrbinary(f'RETR {remote_path}', f.write)
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                self.ftp.retrbinary(f'RETR {remote_path}', f.write, rest=offset or None)
+            
+            try:
+                verify_archive(part_path)
+            except ValueError:
+                part_path.unlink()
+                raise
+            os.replace(part_path, local_path)
             
             # Saglabā faila metadata
             file_size = os.path.getsize(local_path)
@@ -105,19 +138,44 @@ class FTPDownloader:
             json.dump(metadata, f, indent=2)
             
     def is_file_downloaded(self, file_key, metadata):
-        """Pārbauda vai fails jau ir lejupielādēts"""
+        """Pārbauda vai fails jau ir lejupielādēts un pārbaudīts (bez faila nolasīšanas)"""
         if file_key in metadata['downloads']:
-            # Pārbauda vai lokālais fails eksistē
-            local_path = Path(metadata['downloads'][file_key]['local_path'])
-            if local_path.exists():
+            # Pārbauda vai lokālais fails eksistē un nav mainījies kopš pārbaudes
+            entry = metadata['downloads'][file_key]
+            local_path = Path(entry['local_path'])
+            if entry.get('sha256') and local_path.exists() and local_path.stat().st_size == entry.get('size'):
                 return True
         return False
         
-    def extract_tar_gz_files(self, tar_path, date_folder):
-        """Atarhivē tar.gz failu un saglabā XML failus datuma mapē"""
+    def local_checksum(self, file_key, local_path, remote_size, metadata):
+        """Lokālā arhīva SHA-256 vai None, ja faila nav vai tas ir bojāts
+        
+        Jau pārbaudīti faili netiek nolasīti; pārējie (piem., no vecākas versijas
+        vai pārtrauktas lejupielādes) tiek pārbaudīti, bojātie - dzēsti.
+        """
+        if metadata and self.is_file_downloaded(file_key, metadata):
+            return metadata['downloads'][file_key]['sha256']
+        if not local_path.exists():
+            return None
+        try:
+            return verify_archive(local_path, remote_size)
+        except ValueError as e:
+            logging.warning(f"Lokālais arhīvs nav derīgs, lejupielādēšu no jauna: {e}")
+            local_path.unlink()
+            return None
+        
+    def extract_tar_gz_files(self, tar_path, date_folder, replace=False):
+        """Atarhivē tar.gz failu un saglabā XML failus datuma mapē
+        
+        replace - no jauna publicēts arhīvs: mapes vecie XML faili tiek dzēsti,
+        lai paziņojumi, kuru jaunajā arhīvā vairs nav, neparādītos meklēšanā.
+        """
         xml_date_dir = self.xml_dir / date_folder
         xml_date_dir.mkdir(exist_ok=True)
         
+        if replace:
+            self.clear_xml_folder(xml_date_dir)
+            
         try:
             with tarfile.open(tar_path, 'r:gz') as tar:
                 # Izvelk tikai XML failus
@@ -144,95 +202,334 @@ class FTPDownloader:
                         shutil.move(str(extracted_path), str(final_path))
                         
                 logging.info(f"Atarhivēti {len(xml_members)} XML faili no {os.path.basename(tar_path)}")
-                return len(xml_members)
                 
         except Exception as e:
             logging.error(f"Kļūda atarhivējot {tar_path}: {e}")
             return 0
             
-    def download_date_files(self, date_info, metadata):
-        """Lejupielādē visus failus konkrētam datumam"""
-        downloaded_count = 0
-        extracted_count = 0
-        year_path = f"/{date_info['year']}"
+        return self.ingest_folder(xml_date_dir, len(xml_members))
+        
+    def should_pack(self, date_folder):
+        """Vai dienu glabā arhīvā - tikai ar pack_archives un vecākas par pack_after_days
+        
+        Indekss, momentuzņēmumi, manifests un parsēšanas kešatmiņa ir veidoti
+        dienu mapēm, tāpēc meklēšanas logā esošās dienas netiek pārpakotas.
+        """
+        if not self.pack_archives:
+            return False
+        try:
+            day = datetime.strptime(date_folder, '%d_%m_%Y')
+        except ValueError:
+            return False
+        return day < datetime.now() - timedelta(days=self.pack_after_days)
+        
+    def pack_tar_gz_file(self, tar_path, date_folder, replace=False):
+        """Pārpako tar.gz dienas arhīvā DD_MM_YYYY.xmlpack (XML faili netiek atarhivēti)
+        
+        Meklētājs nolasa arhīva failus pēc nobīdes; indekss, momentuzņēmums un
+        manifests ir veidoti dienu mapēm, tāpēc šīm dienām netiek atjaunoti
+        (should_pack - tikai dienām ārpus meklēšanas loga).
+        """
+        try:
+            count = pack_archive(tar_path, pack_path_for(self.xml_dir / date_folder), replace)
+        except Exception as e:
+            logging.error(f"Kļūda pārpakojot {tar_path}: {e}")
+            return 0
+        self.data_changed = True
+        return count
+        
+    def clear_xml_folder(self, xml_date_dir):
+        """Dzēš mapes XML failus pirms no jauna publicēta arhīva atarhivēšanas"""
+        for old_path in xml_date_dir.glob('*.xml'):
+            old_path.unlink()
+        logging.info(f"Mape {xml_date_dir.name} tiek aizstāta ar no jauna publicētu arhīvu")
+        
+    def ingest_folder(self, xml_date_dir, xml_count):
+        """Atjauno indeksu, momentuzņēmumu un manifestu pēc XML failu atarhivēšanas"""
+        self.update_notice_index(xml_date_dir)
+        notice_count = self.update_snapshot(xml_date_dir)
+        self.update_manifest(xml_date_dir, notice_count)
+        self.data_changed = True
+        return xml_count
+        
+    def update_notice_index(self, xml_date_dir):
+        """Papildina pilna teksta indeksu ar mapes jaunajiem paziņojumiem"""
+        # Parsētājs tiek importēts šeit, lai local_procurement_searcher nepārrakstītu šī moduļa logging konfigurāciju
+        from local_procurement_searcher import ImprovedXMLParser
+        
+        try:
+            index = NoticeIndex(self.xml_dir / INDEX_FILE_NAME, ImprovedXMLParser())
+            index.index_folder(xml_date_dir)
+            index.close()
+        except Exception as e:
+            logging.error(f"Kļūda atjaunojot indeksu {xml_date_dir}: {e}")
+            
+    def update_snapshot(self, xml_date_dir):
+        """Pārraksta mapes kolonnu momentuzņēmumu meklēšanas filtriem"""
+        from local_procurement_searcher import ImprovedXMLParser, PARSER_VERSION
+        
+        try:
+            return write_snapshot(self.xml_dir, xml_date_dir, ImprovedXMLParser().parse_xml_comprehensive,
+                                  PARSER_VERSION)
+        except Exception as e:
+            logging.error(f"Kļūda veidojot momentuzņēmumu {xml_date_dir}: {e}")
+            return None
+            
+    def update_manifest(self, xml_date_dir, notice_count=None):
+        """Ieraksta mapes failu sarakstu dienu manifestā"""
+        try:
+            DateManifest(self.xml_dir).record_folder(xml_date_dir, notice_count)
+        except Exception as e:
+            logging.error(f"Kļūda atjaunojot manifestu {xml_date_dir}: {e}")
+            
+    def list_date_files(self, date_info, metadata=None):
+        """Datuma arhīvu darbi (mēneša mapes saraksts tiek nolasīts vienreiz gājienā)
+        
+        Katrs darbs: remote_path, local_path, date_folder, file_key, remote_size,
+        remote_modify, sha256 - pārbaudīta lokālā faila kontrolsumma,
+        extract_only - fails jau ir lokāli, bet XML nav atarhivēti,
+        un republished - serverī arhīva izmērs vai laiks mainīts kopš lejupielādes.
+        """
+        jobs = []
+        downloads = metadata['downloads'] if metadata else {}
         month_folder = f"{date_info['month']}_{date_info['year']}"
         date_folder = f"{date_info['day']}_{date_info['month']}_{date_info['year']}"
+        remote_dir = f"/{date_info['year']}/{month_folder}"
         
+        if self.listings is None:
+            self.listings = MonthListingCache(self.ftp)
         try:
-            # Navigē uz mēneša mapi
-            self.ftp.cwd(year_path)
-            self.ftp.cwd(month_folder)
+            files = self.listings.files(remote_dir)
+        except Exception as e:
+            logging.warning(f"Kļūda apstrādājot {date_info['full']}: {e}")
+            return jobs
             
-            # Iegūst failu sarakstu
-            files = []
-            self.ftp.retrlines('NLST', lambda x: files.append(x))
+        # Struktūra: /2025/07_2025/01_07_2025.tar.gz - tikai šī datuma arhīvi
+        tar_files = sorted(f for f in files if f.startswith(date_folder) and f.endswith('.tar.gz'))
+        logging.info(f"Datumam {date_info['full']} atrasti {len(tar_files)} arhīva faili")
+        
+        xml_date_dir = self.xml_dir / date_folder
+        extracted = (xml_date_dir.exists() and any(xml_date_dir.glob('*.xml'))) or pack_path_for(xml_date_dir).exists()
+        for tar_file in tar_files:
+            local_path = self.download_dir / date_info['year'] / month_folder / tar_file
+            file_key = f"{date_info['full']}/{tar_file}"
+            facts = files[tar_file]
+            republished = archive_changed(downloads.get(file_key), facts)
+            checksum = None if republished else self.local_checksum(file_key, local_path, facts['size'], metadata)
+            exists = checksum is not None
+            if republished:
+                logging.info(f"Arhīvs {tar_file} publicēts no jauna (izmērs {facts['size']}, "
+                             f"laiks {facts['modify']}) - lejupielādēju atkārtoti")
+            elif exists and extracted:
+                logging.debug(f"Fails {tar_file} jau eksistē, izlaižu lejupielādi")
+                if file_key in downloads:
+                    downloads[file_key]['sha256'] = checksum
+                    self.record_remote_facts(downloads[file_key], facts)
+                continue
+            jobs.append({
+                'remote_path': f"{remote_dir}/{tar_file}",
+                'local_path': local_path,
+                'date_folder': date_folder,
+                'date': date_info['full'],
+                'file_key': file_key,
+                'remote_size': facts['size'],
+                'remote_modify': facts['modify'],
+                'sha256': checksum,
+                'extract_only': exists,
+                # Vienīgais dienas arhīvs - mapi var aizstāt pilnībā
+                'republished': republished,
+                'replace': republished and len(tar_files) == 1,
+            })
+        return jobs
+        
+    def record_remote_facts(self, entry, facts):
+        """Saglabā servera izmēru un laiku (ja zināmi) salīdzināšanai nākamajā gājienā"""
+        if facts.get('size') is not None:
+            entry['remote_size'] = facts['size']
+        if facts.get('modify') is not None:
+            entry['remote_modify'] = facts['modify']
             
-            # Filtrē tikai .tar.gz failus
-            tar_files = [f for f in files if f.endswith('.tar.gz')]
+    def record_download(self, job, extracted, metadata):
+        """Atjaunina lejupielādes metadatus"""
+        facts = {'size': job.get('remote_size'), 'modify': job.get('remote_modify')}
+        if job['extract_only'] and job['file_key'] in metadata['downloads']:
+            metadata['downloads'][job['file_key']]['sha256'] = job['sha256']
+            self.record_remote_facts(metadata['downloads'][job['file_key']], facts)
+            return
+        entry = metadata['downloads'][job['file_key']] = {
+            'local_path': str(job['local_path']),
+            'download_time': datetime.now().isoformat(),
+            'date': job['date'],
+            'size': os.path.getsize(job['local_path']),
+            'sha256': job['sha256'],
+            'xml_extracted': extracted,
+            'xml_folder': str(self.xml_dir / job['date_folder'])
+        }
+        self.record_remote_facts(entry, facts)
+        
+    def fetch_archive(self, pool, job):
+        """Lejupielādē arhīvu pagaidu failā (turpinot ar REST), pārbauda un pārvieto vietā
+        
+        Gala ceļā fails parādās tikai pēc izmēra un gzip pārbaudes, tāpēc
+        pārtraukta lejupielāde nekad netiek uzskatīta par pabeigtu. Ar
+        stream_extract XML faili tiek atarhivēti jau lejupielādes laikā
+        (job['streamed'] - to skaits) pagaidu mapē; to dienas mapē pārvieto
+        atarhivēšanas darbinieks (install_streamed), un tikai tad arhīvs tiek
+        pārvietots vietā. Ja plūsma nav pilnīga, pagaidu mape tiek dzēsta un
+        arhīvs tiek pārbaudīts un atarhivēts no diska.
+        """
+        local_path = job['local_path']
+        part_path = local_path.with_name(local_path.name + PART_SUFFIX)
+        if job['republished']:
+            # Iepriekšējās versijas nepabeigtu failu nevar turpināt
+            part_path.unlink(missing_ok=True)
             
-            logging.info(f"Datumam {date_info['full']} atrasti {len(tar_files)} arhīva faili")
+        # Iepriekšējā gājienā iesāktam failam plūsmas sākums nav pieejams
+        stream = None
+        if self.stream_extract and not self.should_pack(job['date_folder']) and not part_path.exists():
+            staging_dir = self.xml_dir / f".{local_path.name}.staging"
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            stream = ArchiveStream(staging_dir)
             
-            for tar_file in tar_files:
-                # Nosaka lokālo ceļu
-                local_path = self.download_dir / date_info['year'] / month_folder / tar_file
+        try:
+            pool.retrieve(job['remote_path'], part_path, resume=True, expected_size=job['remote_size'],
+                          on_chunk=stream.feed if stream else None)
+        finally:
+            streamed = stream.finish() if stream else None
+            if stream and streamed is None:
+                shutil.rmtree(staging_dir, ignore_errors=True)
                 
-                # Pārbauda vai fails jau eksistē
-                if local_path.exists():
-                    logging.debug(f"Fails {tar_file} jau eksistē, izlaižu lejupielādi")
+        if streamed is not None:
+            # Mapi un arhīvu vietā pārvieto atarhivēšanas darbinieks
+            job['sha256'] = stream.sha256()
+            job['streamed'] = streamed
+            job['staging_dir'] = staging_dir
+            return os.path.getsize(part_path)
+            
+        try:
+            job['sha256'] = verify_archive(part_path, job['remote_size'])
+        except ValueError:
+            part_path.unlink()
+            raise
+        os.replace(part_path, local_path)
+        return os.path.getsize(local_path)
+        
+    def install_streamed(self, job):
+        """Pārvieto plūsmā atarhivētos XML failus dienas mapē, tad arhīvu vietā un atjauno indeksus
+        
+        Izsauc atarhivēšanas darbinieks, tāpēc dienas mapi vienlaikus nemaina
+        vairāki pavedieni. Ja pārvietošana neizdodas, pagaidu mape un arhīvs
+        tiek dzēsti un job['failed'] - nākamajā gājienā arhīvs tiek lejupielādēts
+        no jauna.
+        """
+        local_path = job['local_path']
+        part_path = local_path.with_name(local_path.name + PART_SUFFIX)
+        xml_date_dir = self.xml_dir / job['date_folder']
+        try:
+            self.install_staged(job['staging_dir'], xml_date_dir, job['replace'])
+            os.replace(part_path, local_path)
+        except Exception as e:
+            logging.error(f"Kļūda pārvietojot {local_path.name} XML failus uz {xml_date_dir}: {e}")
+            shutil.rmtree(job['staging_dir'], ignore_errors=True)
+            part_path.unlink(missing_ok=True)
+            job['failed'] = True
+            return 0
+        logging.info(f"Plūsmā atarhivēti {job['streamed']} XML faili no {local_path.name}")
+        return self.ingest_folder(xml_date_dir, job['streamed'])
+        
+    def install_staged(self, staging_dir, xml_date_dir, replace=False):
+        """Pārvieto pārbaudītas plūsmas XML failus dienas mapē
+        
+        replace - vecā mape tiek aizstāta visa uzreiz (pārdēvējot), citādi faili
+        tiek pievienoti esošajai mapei (vairāki arhīvi vienā dienā).
+        """
+        if not xml_date_dir.exists():
+            os.replace(staging_dir, xml_date_dir)
+        elif replace:
+            old_dir = staging_dir.with_name(staging_dir.name + '.old')
+            os.replace(xml_date_dir, old_dir)
+            try:
+                os.replace(staging_dir, xml_date_dir)
+            except OSError:
+                os.replace(old_dir, xml_date_dir)
+                raise
+            shutil.rmtree(old_dir, ignore_errors=True)
+            logging.info(f"Mape {xml_date_dir.name} aizstāta ar no jauna publicētu arhīvu")
+        else:
+            for staged in staging_dir.iterdir():
+                os.replace(staged, xml_date_dir / staged.name)
+            staging_dir.rmdir()
+        
+    def download_parallel(self, jobs, metadata):
+        """Lejupielādē arhīvus pa ftp_connections savienojumiem, atarhivē atsevišķā darbiniekā
+        
+        Arhīvs tiek atarhivēts, tiklīdz tā lejupielāde beigusies, kamēr pārējie
+        savienojumi turpina lejupielādi. Atgriež lejupielādēto failu skaitu.
+        """
+        downloaded_count = 0
+        extracted_count = 0
+        extractions = []
+        pool = FTPConnectionPool(self.ftp_host, self.ftp_user, self.ftp_pass,
+                                 size=self.ftp_connections, retries=self.ftp_retries)
+        
+        def extract(tar_path, date_folder, replace=False):
+            if self.should_pack(date_folder):
+                return self.pack_tar_gz_file(tar_path, date_folder, replace)
+            return self.extract_tar_gz_files(tar_path, date_folder, replace)
+            
+        # Viens atarhivēšanas darbinieks - vienas dienas mapi neatjauno vienlaicīgi
+        with ThreadPoolExecutor(max_workers=self.extract_workers) as extractor:
+            for job in jobs:
+                if job['extract_only']:
+                    logging.info(f"Atarhivēju esošo failu {job['local_path'].name}")
+                    extractions.append((job, extractor.submit(
+                        extract, job['local_path'], job['date_folder'])))
                     
-                    # Pārbauda vai XML faili ir atarhivēti
-                    xml_date_dir = self.xml_dir / date_folder
-                    if not xml_date_dir.exists() or len(list(xml_date_dir.glob('*.xml'))) == 0:
-                        # Atarhivē esošo failu
-                        logging.info(f"Atarhivēju esošo failu {tar_file}")
-                        extracted = self.extract_tar_gz_files(local_path, date_folder)
-                        extracted_count += extracted
+            with ThreadPoolExecutor(max_workers=self.ftp_connections) as downloader:
+                futures = {downloader.submit(self.fetch_archive, pool, job): job
+                           for job in jobs if not job['extract_only']}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        file_size = future.result()
+                    except Exception as e:
+                        logging.error(f"Kļūda lejupielādējot {job['remote_path']}: {e}")
+                        continue
                         
-                        # Atjaunina metadatus
-                        file_key = f"{date_info['full']}/{tar_file}"
-                        if file_key not in metadata['downloads']:
-                            metadata['downloads'][file_key] = {
-                                'local_path': str(local_path),
-                                'download_time': datetime.now().isoformat(),
-                                'date': date_info['full'],
-                                'size': os.path.getsize(local_path),
-                                'xml_extracted': extracted,
-                                'xml_folder': str(self.xml_dir / date_folder)
-                            }
-                    continue
-                
-                # Lejupielādē failu
-                if self.download_file(tar_file, local_path):
+                    logging.info(f"Lejupielādēts: {job['remote_path']} ({file_size:,} baiti)")
                     downloaded_count += 1
+                    if job.get('streamed') is not None:
+                        extractions.append((job, extractor.submit(self.install_streamed, job)))
+                    else:
+                        extractions.append((job, extractor.submit(
+                            extract, job['local_path'], job['date_folder'], job.get('replace', False))))
                     
-                    # Uzreiz atarhivē XML failus
-                    extracted = self.extract_tar_gz_files(local_path, date_folder)
-                    extracted_count += extracted
-                    
-                    # Atjaunina metadatus
-                    file_key = f"{date_info['full']}/{tar_file}"
-                    metadata['downloads'][file_key] = {
-                        'local_path': str(local_path),
-                        'download_time': datetime.now().isoformat(),
-                        'date': date_info['full'],
-                        'size': os.path.getsize(local_path),
-                        'xml_extracted': extracted,
-                        'xml_folder': str(self.xml_dir / date_folder)
-                    }
-                    
-            # Atgriežas uz root
-            self.ftp.cwd('/')
-            
-        except Exception as e:
-            logging.warning(f"Kļūda apstrādājot {date_info['full']}: {e}")
-            
-        logging.info(f"Lejupielādēti {downloaded_count} jauni faili, atarhivēti {extracted_count} XML faili")
+            for job, future in extractions:
+                extracted = future.result()
+                if job.get('failed'):
+                    downloaded_count -= 1
+                    continue
+                extracted_count += extracted
+                self.record_download(job, extracted, metadata)
+                
+        pool.close()
+        logging.info(f"Lejupielādēti {downloaded_count} jauni faili, atarhivēti {extracted_count} XML faili "
+                     f"({pool.connections_opened} FTP savienojumi)")
         return downloaded_count
         
+    def download_date_files(self, date_info, metadata):
+        """Lejupielādē visus failus konkrētam datumam"""
+        return self.download_parallel(self.list_date_files(date_info, metadata), metadata)
+        
     def cleanup_old_files(self, metadata, days_to_keep=90):
         """Dzēš vecos failus (vecākus par 90 dienām)"""
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
         files_to_remove = []
+        cache_file = self.xml_dir / CACHE_FILE_NAME
+        parse_cache = ParseCache(cache_file) if cache_file.exists() else None
+        index_file = self.xml_dir / INDEX_FILE_NAME
+        notice_index = NoticeIndex(index_file) if index_file.exists() else None
+        manifest = DateManifest(self.xml_dir)
         
         for file_key, file_info in metadata['downloads'].items():
             download_time = datetime.fromisoformat(file_info['download_time'])
@@ -249,6 +546,16 @@ class FTPDownloader:
                     shutil.rmtree(xml_folder)
                     logging.info(f"Dzēsta XML mape: {xml_folder}")
                     
+                # Dzēš mapes ierakstus no parsēšanas kešatmiņas
+                if xml_folder and parse_cache is not None:
+                    parse_cache.prune_folder(xml_folder)
+                if xml_folder and notice_index is not None:
+                    notice_index.prune_folder(xml_folder)
+                if xml_folder:
+                    remove_snapshot(self.xml_dir, xml_folder)
+                    manifest.remove_folder(xml_folder)
+                    remove_pack(xml_folder)
+                    
                 files_to_remove.append(file_key)
                 
         # Noņem no metadatiem
@@ -258,6 +565,47 @@ class FTPDownloader:
         logging.info(f"Dzēsti {len(files_to_remove)} veci faili (vecāki par {days_to_keep} dienām)")
         return len(files_to_remove)
         
+    def pack_old_folders(self):
+        """Pārpako dienu mapes, kas izgājušas no meklēšanas loga (should_pack), arhīvos
+        
+        Mapes ieraksti tiek dzēsti no indeksa, momentuzņēmumiem, manifesta un
+        parsēšanas kešatmiņas - arhīva dienas meklētājs nolasa pa failiem.
+        Atgriež pārpakoto mapju skaitu.
+        """
+        if not self.pack_archives:
+            return 0
+        folders = [folder for folder in sorted(self.xml_dir.iterdir())
+                   if folder.is_dir() and self.should_pack(folder.name) and any(folder.glob('*.xml'))]
+        if not folders:
+            return 0
+            
+        cache_file = self.xml_dir / CACHE_FILE_NAME
+        parse_cache = ParseCache(cache_file) if cache_file.exists() else None
+        index_file = self.xml_dir / INDEX_FILE_NAME
+        notice_index = NoticeIndex(index_file) if index_file.exists() else None
+        manifest = DateManifest(self.xml_dir)
+        
+        packed = 0
+        for folder in folders:
+            try:
+                pack_folder(folder)
+            except Exception as e:
+                logging.error(f"Kļūda pārpakojot mapi {folder}: {e}")
+                continue
+            if parse_cache is not None:
+                parse_cache.prune_folder(str(folder))
+            if notice_index is not None:
+                notice_index.prune_folder(str(folder))
+            remove_snapshot(self.xml_dir, str(folder))
+            manifest.remove_folder(str(folder))
+            shutil.rmtree(folder)
+            packed += 1
+            
+        if packed:
+            self.data_changed = True
+            logging.info(f"Pārpakotas {packed} dienu mapes (vecākas par {self.pack_after_days} dienām)")
+        return packed
+        
     def run_download(self):
         """Galvenā lejupielādes funkcija"""
         logging.info("=== Sāku automātisko lejupielādi ===")
@@ -269,19 +617,32 @@ class FTPDownloader:
         if not self.connect_ftp():
             return
             
-        total_downloaded = 0
-        dates = self.get_dates_to_download()
-        
-        for date in dates:
+        # Failu saraksti caur vienu savienojumu (katra mēneša mape - vienreiz),
+        # lejupielāde - caur savienojumu kopumu
+        self.listings = MonthListingCache(self.ftp)
+        jobs = []
+        for date in self.get_dates_to_download():
             logging.info(f"Pārbaudu {date['full']}...")
-            downloaded = self.download_date_files(date, metadata)
-            total_downloaded += downloaded
+            jobs.extend(self.list_date_files(date, metadata))
             
+        logging.info(f"Nolasīti {len(self.listings.listings)} mēnešu mapju saraksti")
+        self.listings = None
         self.disconnect_ftp()
         
+        total_downloaded = self.download_parallel(jobs, metadata)
+        
         # Tīra vecos failus
         deleted_count = self.cleanup_old_files(metadata)
         
+        # No meklēšanas loga izgājušās dienas - arhīvos
+        self.pack_old_folders()
+        
+        # Jauni vai dzēsti dati - kešotie meklēšanas rezultāti vairs nav derīgi
+        if self.data_changed or deleted_count:
+            generation = self.data_generation.bump()
+            self.data_changed = False
+            logging.info(f"Datu paaudze: {generation}")
+            
         # Atjaunina pēdējās lejupielādes laiku
         metadata['last_update'] = datetime.now().isoformat()
         metadata['total_files'] = len(metadata['downloads'])
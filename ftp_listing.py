@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Mēneša mapju saraksti FTP serverī - katra mape tiek nolasīta vienreiz
+
+Ar MLSD katram failam ir zināms izmērs un izmaiņu laiks, tāpēc no jauna
+publicēti arhīvi (mainīts izmērs vai laiks) tiek atpazīti un lejupielādēti
+atkārtoti. Ja serveris MLSD neatbalsta, tiek izmantots NLST bez izmēriem.
+"""
+
+import ftplib
+import logging
+import posixpath
+
+
+def list_directory(ftp, remote_dir):
+    """Mapes faili {nosaukums: {'size': int vai None, 'modify': str vai None}}"""
+    try:
+        entries = ftp.mlsd(remote_dir, facts=['type', 'size', 'modify'])
+        files = {}
+        for name, facts in entries:
+            if facts.get('type', 'file') != 'file':
+                continue
+            size = facts.get('size')
+            files[name] = {'size': int(size) if size and size.isdigit() else None,
+                           'modify': facts.get('modify')}
+        return files
+    except ftplib.error_perm as e:
+        # 500/502 - komanda nav atbalstīta
+        if not str(e).startswith('50'):
+            raise
+        logging.info(f"Serveris neatbalsta MLSD ({e}) - izmantoju NLST")
+    return {posixpath.basename(name): {'size': None, 'modify': None} for name in ftp.nlst(remote_dir)}
+
+
+def archive_changed(entry, facts):
+    """Vai serverī arhīvs mainīts kopš lejupielādes (izmērs vai laiks atšķiras)
+
+    entry - lejupielādes metadati (remote_size, remote_modify), facts - saraksta
+    ieraksts. Nezināmas vērtības (NLST vai veci metadati) netiek salīdzinātas.
+    """
+    if not entry:
+        return False
+    for key, fact in (('remote_size', 'size'), ('remote_modify', 'modify')):
+        old, new = entry.get(key), facts.get(fact)
+        if old is not None and new is not None and old != new:
+            return True
+    return False
+
+
+class MonthListingCache:
+    """Viena lejupielādes gājiena mapju saraksti (katra mape tiek nolasīta vienreiz)"""
+
+    def __init__(self, ftp):
+        self.ftp = ftp
+        self.listings = {}
+
+    def files(self, remote_dir):
+        """Mapes faili (no keša, ja mape jau nolasīta)
+
+        Neesoša mape (550) tiek kešota kā tukša - mēneša dienām tā netiek
+        pieprasīta atkārtoti. Pārējās kļūdas netiek kešotas.
+        """
+        listing = self.listings.get(remote_dir)
+        if listing is None:
+            try:
+                listing = list_directory(self.ftp, remote_dir)
+                logging.info(f"Mape {remote_dir}: {len(listing)} faili")
+            except ftplib.error_perm as e:
+                if not str(e).startswith('550'):
+                    raise
+                listing = {}
+                logging.warning(f"Mape {remote_dir} nav atrasta: {e}")
+            self.listings[remote_dir] = listing
+        return listing
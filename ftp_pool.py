@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Ierobežots FTP savienojumu kopums paralēlai arhīvu lejupielādei
+
+Katrs savienojums ir atsevišķi autentificēts. Pārejošas 4xx kļūdas tiek
+atkārtotas tajā pašā savienojumā; pārtraukts savienojums (421, EOF, tīkla
+kļūda) vai ilgi neizmantots savienojums, kas vairs neatbild uz NOOP, tiek
+aizstāts ar jaunu. Ar resume lejupielāde tiek turpināta no jau saņemtā
+baita (REST), un nepabeigtais fails pēc kļūdas netiek dzēsts.
+"""
+
+import ftplib
+import gzip
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+
+# Kļūdas, pēc kurām savienojums vairs nav lietojams
+CONNECTION_ERRORS = (EOFError, OSError, ftplib.error_reply, ftplib.error_proto)
+
+# Nepabeigtas lejupielādes faila sufikss (fails tiek pārvietots vietā tikai pēc pārbaudes)
+PART_SUFFIX = '.part'
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def verify_archive(path, expected_size=None):
+    """Pārbauda lejupielādēto tar.gz (izmērs un gzip CRC), atgriež SHA-256
+
+    Bojātam vai nepilnīgam failam izmet ValueError.
+    """
+    size = os.path.getsize(path)
+    if expected_size is not None and size != expected_size:
+        raise ValueError(f"{path}: {size} baiti, serverī {expected_size}")
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    try:
+        # Nolasot līdz beigām, gzip pārbauda katra posma CRC32 un garumu
+        with gzip.open(path, 'rb') as f:
+            while f.read(CHUNK_SIZE):
+                pass
+    except (OSError, EOFError, zlib.error) as e:
+        raise ValueError(f"{path}: bojāts gzip arhīvs ({e})")
+    return digest.hexdigest()
+
+
+class FTPConnectionPool:
+    """Līdz size FTP savienojumiem; brīvie savienojumi tiek izmantoti atkārtoti"""
+
+    def __init__(self, host, user='anonymous', password='', size=4, retries=3, backoff=1.0,
+                 idle_timeout=60, timeout=60, factory=ftplib.FTP):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.size = size
+        self.retries = retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Jauns autentificēts savienojums"""
+        ftp = self.factory(self.host, timeout=self.timeout)
+        ftp.login(self.user, self.password)
+        ftp.encoding = 'utf-8'
+        with self._lock:
+            self.connections_opened += 1
+        return ftp
+
+    def _discard(self, ftp):
+        """Aizver savienojumu, kļūdas ignorējot"""
+        try:
+            ftp.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Brīvs savienojums (vai jauns, ja brīvo nav) - gaida, ja visi aizņemti"""
+        self._slots.acquire()
+        try:
+            try:
+                ftp, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            # Ilgi neizmantotu savienojumu serveris var būt aizvēris
+            if time.monotonic() - last_used > self.idle_timeout:
+                try:
+                    ftp.voidcmd('NOOP')
+                except (ftplib.error_temp,) + CONNECTION_ERRORS:
+                    logging.info(f"FTP savienojums ar {self.host} bija pārtraukts - savienojos no jauna")
+                    self._discard(ftp)
+                    return self._connect()
+            return ftp
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, ftp, broken=False):
+        """Atdod savienojumu kopumam (bojātu - aizver)"""
+        if broken:
+            self._discard(ftp)
+        else:
+            self._idle.put((ftp, time.monotonic()))
+        self._slots.release()
+
+    def retrieve(self, remote_path, local_path, resume=False, expected_size=None, on_chunk=None):
+        """Lejupielādē failu; pārejošas kļūdas tiek atkārtotas, atgriež baitu skaitu
+
+        resume - turpina esošu local_path no tā beigām (REST) un pēc kļūdas to
+        nedzēš; expected_size - servera izmērs (nesakritība ir pārejoša kļūda);
+        on_chunk(position, chunk) - izsaukts pēc katra ierakstītā gabala.
+        Pastāvīgas kļūdas (5xx) un kļūdas pēc visiem mēģinājumiem tiek
+        izmestas tālāk; bez resume nepabeigts fails tiek izdzēsts.
+        """
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            offset = os.path.getsize(local_path) if resume and os.path.exists(local_path) else 0
+            if expected_size is not None and offset > expected_size:
+                self._remove_partial(local_path)
+                offset = 0
+            if expected_size is not None and offset == expected_size:
+                return offset
+
+            try:
+                ftp = self.acquire()
+            except (ftplib.error_temp,) + CONNECTION_ERRORS as e:
+                last_error = e
+                logging.warning(f"Neizdevās savienoties ar {self.host} ({attempt + 1}. mēģinājums): {e}")
+                continue
+
+            broken = False
+            try:
+                with open(local_path, 'ab' if offset else 'wb') as f:
+                    ftp.retrbinary(f'RETR {remote_path}', self._writer(f, offset, on_chunk), rest=offset or None)
+                size = os.path.getsize(local_path)
+                if expected_size is None or size == expected_size:
+                    return size
+                last_error = EOFError(f"saņemti {size} baiti, serverī {expected_size}")
+            except ftplib.error_perm as e:
+                if not offset:
+                    self._remove_partial(local_path)
+                    raise
+                # Serveris nepieņēma REST - nākamais mēģinājums sāk no sākuma
+                self._remove_partial(local_path)
+                last_error = e
+            except ftplib.error_temp as e:
+                # 421 - serveris aizver savienojumu; citas 4xx - atkārto tajā pašā
+                broken = str(e).startswith('421')
+                last_error = e
+            except CONNECTION_ERRORS as e:
+                broken = True
+                last_error = e
+            finally:
+                self.release(ftp, broken)
+
+            if not resume:
+                self._remove_partial(local_path)
+            logging.warning(f"Kļūda lejupielādējot {remote_path} ({attempt + 1}. mēģinājums): {last_error}")
+
+        raise last_error
+
+    def _writer(self, f, offset, on_chunk):
+        """retrbinary atzvanīšanas funkcija - raksta failā un nodod gabalu on_chunk"""
+        if on_chunk is None:
+            return f.write
+        position = [offset]
+
+        def write(chunk):
+            f.write(chunk)
+            on_chunk(position[0], chunk)
+            position[0] += len(chunk)
+        return write
+
+    def _remove_partial(self, local_path):
+        """Dzēš nepabeigtu failu"""
+        try:
+            os.remove(local_path)
+        except OSError:
+            pass
+
+    def close(self):
+        """Aizver visus brīvos savienojumus"""
+        while True:
+            try:
+                ftp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                ftp.quit()
+            except Exception:
+                self._discard(ftp)
@@ -19,6 +19,8 @@ import schedule
 import time
 import re
 
+from text_normalizer import NormalizedText, as_normalized, normalize_latvian_text
+
 # Logging konfigurācija
 logging.basicConfig(
     level=logging.INFO,
@@ -163,24 +165,8 @@ class IepirkumuMekletajs:
         return results
         
     def normalize_latvian_text(self, text):
-        """Normalizē latviešu tekstu meklēšanai (noņem locījumus, diakritiskās zīmes)"""
-        if not text:
-            return ""
-            
-        # Aizstāj latviešu diakritiskās zīmes ar pamatvarianti
-        replacements = {
-            'ā': 'a', 'č': 'c', 'ē': 'e', 'ģ': 'g', 
-            'ī': 'i', 'ķ': 'k', 'ļ': 'l', 'ņ': 'n', 
-            'š': 's', 'ū': 'u', 'ž': 'z',
-            'Ā': 'A', 'Č': 'C', 'Ē': 'E', 'Ģ': 'G',
-            'Ī': 'I', 'Ķ': 'K', 'Ļ': 'L', 'Ņ': 'N',
-            'Š': 'S', 'Ū': 'U', 'Ž': 'Z'
-        }
-        
-        for latvian, ascii in replacements.items():
-            text = text.replace(latvian, ascii)
-            
-        return text.lower()
+        """Normalizē latviešu tekstu meklēšanai (noņem diakritiskās zīmes, mazie burti)"""
+        return normalize_latvian_text(text)
         
     def create_word_variations(self, word):
         """Izveido vārda variācijas ar dažādiem locījumiem"""
@@ -214,9 +200,13 @@ class IepirkumuMekletajs:
         return variations
         
     def text_contains_keyword(self, text, keyword):
-        """Pārbauda vai tekstā ir atslēgvārds ar locījumu atbalstu"""
-        text_lower = text.lower()
-        text_normalized = self.normalize_latvian_text(text)
+        """Pārbauda vai tekstā ir atslēgvārds ar locījumu atbalstu
+        
+        text var būt NormalizedText - tad mazo burtu un normalizētā forma netiek rēķināta atkārtoti.
+        """
+        doc = as_normalized(text)
+        text_lower = doc.lower
+        text_normalized = doc.normalized
         
         # Izveido atslēgvārda variācijas
         keyword_variations = self.create_word_variations(keyword)
@@ -224,7 +214,6 @@ class IepirkumuMekletajs:
         # Pārbauda katru variāciju
         for variation in keyword_variations:
             # Meklē kā atsevišķu vārdu (ar robežām)
-            import re
             pattern = r'\b' + re.escape(variation) + r'\b'
             if re.search(pattern, text_lower, re.IGNORECASE):
                 return True
@@ -271,7 +260,8 @@ class IepirkumuMekletajs:
                 if elem.tail and elem.tail.strip():
                     text_parts.append(elem.tail.strip())
                     
-            text_content = ' '.join(text_parts)
+            # Mazo burtu un normalizētā forma - vienreiz visiem atslēgvārdiem un fragmentiem
+            text_content = NormalizedText(' '.join(text_parts))
             
             # Pārbauda atslēgvārdus ar locījumu atbalstu
             matched_keywords = []
@@ -320,14 +310,15 @@ class IepirkumuMekletajs:
     def extract_context_snippets(self, text, keywords, context_length=100):
         """Izvelk teksta fragmentus ap atrastajiem atslēgvārdiem"""
         snippets = []
-        text_lower = text.lower()
+        doc = as_normalized(text)
+        text = doc.text
+        text_lower = doc.lower
         
         for kw in keywords:
             # Meklē visas atslēgvārda pozīcijas tekstā
             kw_variations = self.create_word_variations(kw)
             
             for variation in kw_variations:
-                import re
                 pattern = r'\b' + re.escape(variation) + r'\b'
                 for match in re.finditer(pattern, text_lower, re.IGNORECASE):
                     start = max(0, match.start() - context_length)
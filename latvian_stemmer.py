@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Latviešu valodas galotņu noņemšanas stemmeris atslēgvārdu meklēšanai
+Vārdi tiek normalizēti (bez garumzīmēm, mazie burti), tad tiek noņemta garākā
+atbilstošā galotne, ja celms nepaliek pārāk īss
+"""
+
+import re
+from functools import lru_cache
+
+# Lokāmo vārdu galotnes pēc garumzīmju noņemšanas (garākās pirmās)
+SUFFIXES = (
+    'ajiem', 'ajai', 'ajam', 'ajos', 'ajas', 'iem', 'aja', 'ais',
+    'ai', 'ei', 'am', 'em', 'im', 'um', 'us', 'as', 'es', 'os', 'ij', 'is', 'ie',
+    'u', 'a', 'i', 'e', 'o', 's',
+)
+
+# Celmā jāpaliek vismaz tik burtiem un vismaz vienam patskanim
+MIN_STEM_LENGTH = 3
+
+VOWELS = set('aeiou')
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def count_vowels(text):
+    """Patskaņu skaits"""
+    return sum(1 for char in text if char in VOWELS)
+
+
+@lru_cache(maxsize=100000)
+def stem(token):
+    """Normalizēta vārda celms (token jau bez garumzīmēm un ar mazajiem burtiem)"""
+    for suffix in SUFFIXES:
+        if token.endswith(suffix):
+            base = token[:-len(suffix)]
+            if len(base) >= MIN_STEM_LENGTH and count_vowels(base) > 0:
+                return base
+    return token
+
+
+def stems(text, normalize_text):
+    """Teksta vārdu celmi secībā"""
+    return [stem(token) for token in TOKEN_PATTERN.findall(normalize_text(text))]
+
+
+class StemmedText:
+    """Dokumenta celmu kopa un pozīcijas - tiek izveidota vienreiz katram tekstam"""
+
+    def __init__(self, normalized_text):
+        self.positions = {}
+        tokens = TOKEN_PATTERN.findall(normalized_text)
+        for position, word_stem in enumerate(stem(token) for token in tokens):
+            self.positions.setdefault(word_stem, []).append(position)
+
+    def contains(self, word_stem):
+        """Vai celms ir tekstā"""
+        return word_stem in self.positions
+
+    def contains_sequence(self, phrase_stems):
+        """Vai celmi ir tekstā norādītajā secībā (ne obligāti blakus)"""
+        position = -1
+        for word_stem in phrase_stems:
+            later = [p for p in self.positions.get(word_stem, ()) if p > position]
+            if not later:
+                return False
+            position = later[0]
+        return True
+
+
+class StemPattern:
+    """Viena atslēgvārda (vai frāzes) celmi"""
+
+    def __init__(self, keyword, normalize_text):
+        self.keyword = keyword
+        self.stems = tuple(stems(keyword, normalize_text))
+
+    def matches(self, stemmed):
+        """Vai atslēgvārds ir celmotajā tekstā"""
+        if len(self.stems) == 1:
+            return stemmed.contains(self.stems[0])
+        return stemmed.contains_sequence(self.stems)
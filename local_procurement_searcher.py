@@ -4,6 +4,7 @@ Lokālo iepirkumu failu meklētājs ar uzlabotu veiktspēju un XML parsēšanu
 FAILS: local_procurement_searcher.py - Atjaunināta versija
 """
 
+import io
 import os
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
@@ -11,6 +12,7 @@ import tempfile
 import shutil
 import logging
 import json
+import heapq
 from pathlib import Path
 import re
 import hashlib
@@ -19,6 +21,22 @@ import multiprocessing
 from typing import Dict, List, Tuple, Optional
 import traceback
 
+from parse_cache import ParseCache, CACHE_FILE_NAME
+from prefilter import RawPrefilter
+from compiled_criteria import CompiledCriteria, KeywordPattern
+from latvian_stemmer import StemmedText, StemPattern
+from text_normalizer import NormalizedText, as_normalized, normalize_latvian_text
+from notice_index import NoticeIndex, INDEX_FILE_NAME, build_fts_query
+from notice_lineage import chain_keys, version_order
+from relevance import (CorpusStats, bm25_score, check_limit, decode_cursor, field_stems, query_stems,
+                       rank_key, rank_page)
+from notice_snapshot import SnapshotSet, load_snapshot
+from deadline_index import deadline_epoch_day, format_date, is_active_day, today_epoch_day
+from contract_value import notice_value_cents, normalize_currency
+from date_manifest import DateManifest
+from result_cache import DataGeneration, ResultCache, search_cache_key
+from archive_pack import ArchivePack, PackMember, pack_index_path, pack_path_for
+
 # Mēģina importēt lxml, ja nav - izmanto standarta ET
 try:
     from lxml import etree as lxml_ET
@@ -62,346 +80,590 @@ PROCEDURE_TYPE_MAPPING = {
     'unknown': 'Nav norādīts'
 }
 
-class XMLNamespaceHandler:
-    """Apstrādā XML namespace problēmas"""
-    def __init__(self):
-        self.namespaces = {}
+# Lauku izvilkšanas plāni katram XML izkārtojumam (skat. xml_strukturu_apraksts_v3.0.pdf)
+#
+# Katram laukam - ElementPath ceļi relatīvi pret saknes elementu prioritātes
+# secībā: teksta laukam der pirmā netukšā vērtība, adreses daļas tiek
+# savienotas. Tagi tiek salīdzināti bez namespace, '*' atbilst jebkuram tagam,
+# '//' meklē apakškokā, '/@ATRIBŪTS' ņem atribūta vērtību. Vārdnīca ir lauku
+# grupa, bet 'section' + 'fields' - atkārtots bloks ar ceļiem relatīvi pret to.
+TED_FORM = 'FORM_SECTION/*'
+TED_OBJECT = f'{TED_FORM}/OBJECT_CONTRACT'
+TED_AUTHORITY = f'{TED_FORM}/CONTRACTING_BODY/ADDRESS_CONTRACTING_BODY'
+TED_AWARD = f'{TED_FORM}/AWARD_CONTRACT/AWARDED_CONTRACT'
+EIS_CONTACT = 'contactplaces/contactplace'
+EIS_AWARD = 'part_5_list/part_5'
+
+FIELD_PLANS = {
+    # Plakanais EIS <document> izkārtojums (piem. 768142.xml)
+    'eis': {
+        'title': ('general/name', 'contract_name'),
+        'description': ('description',),
+        'id': ('general/procurement_code', 'procurement_code'),
+        'procurement_id': ('general/procurement_id', 'procurement_id'),
+        'notice_number': ('id',),  # Paziņojuma numurs (versija)
+        'source_notice': ('source_notice',),  # Iepriekšējais tā paša iepirkuma paziņojums
+        'type': ('type',),  # Paziņojuma veids, nevis main_cpv/type
+        'proc_type': ('procedure/proc_type', 'proc_type'),
+        'authority_name': ('authority_name',),
+        'authority_address': ('address', 'city', 'zip_code'),
+        'contact': {
+            'contact_point': (f'{EIS_CONTACT}/person',),
+            'phone': (f'{EIS_CONTACT}/phone',),
+            'email': (f'{EIS_CONTACT}/email',),
+            'fax': (f'{EIS_CONTACT}/fax',),
+            'url': (f'{EIS_CONTACT}/url',),
+            'buyer_profile': (f'{EIS_CONTACT}/url_client',)
+        },
+        'cpv': {
+            'section': ('general/main_cpv', 'general/cpv_list/*', 'parts/part/main_cpv', 'parts/part/cpv_list/*'),
+            'fields': {
+                'code': ('code', 'code_num', '.'),
+                'description': ('lv',)
+            }
+        },
+        'value': ('price', 'contract_price_exact', 'price_exact'),
+        'currency': ('currency', 'contract_currency'),
+        'value_min': ('contract_price_from', 'general/price_from'),
+        'value_max': ('contract_price_to', 'general/price_to'),
+        'publication_date': ('publication_date', 'administrative_info/publication_list/publication/pub_date'),
+        'deadline': ('submit_date', 'procedure/submit_date'),
+        'deadline_hour': ('submit_hour', 'procedure/submit_hour'),
+        'deadline_minute': ('submit_minute', 'procedure/submit_minute'),
+        'appeal_date': ('appeal_date',),
+        'duration': {
+            'months': ('months',),
+            'days': ('days',),
+            'start_date': ('start_date',),
+            'end_date': ('end_date',)
+        },
+        'criteria': ('criteria_list', 'procedure/criteria_list'),
+        'lots': {
+            'section': ('parts/part',),
+            'fields': {
+                'number': ('part_nr', 'nr'),
+                'title': ('name',),
+                'cpv_codes': ('main_cpv/code', 'cpv_list//code'),
+                'value': ('price_exact',)
+            }
+        },
+        'award': {
+            'contractor': ('winner_list/winner/winner_name', f'{EIS_AWARD}/winner_list/winner/winner_name',
+                           'winners/winner/firm'),
+            'contractor_reg': ('winner_list/winner/winner_reg_num', f'{EIS_AWARD}/winner_list/winner/winner_reg_num',
+                               'winners/winner/reg_num'),
+            'contractor_address': ('winner_list/winner/winner_address', f'{EIS_AWARD}/winner_list/winner/winner_address',
+                                   'winners/winner/address'),
+            'award_date': ('decision_date', f'{EIS_AWARD}/decision_date', 'contract_date'),
+            'contract_value': (f'{EIS_AWARD}/contract_price_exact', 'winner_list/winner/price_exact')
+        }
+    },
+    # TED stila izkārtojums ar lielajiem burtiem (TED_EXPORT / F02_2014 u.c.)
+    'ted': {
+        'title': (f'{TED_OBJECT}/TITLE/P', f'{TED_OBJECT}/TITLE'),
+        'description': (f'{TED_OBJECT}/SHORT_DESCR/P', f'{TED_OBJECT}/SHORT_DESCR'),
+        'id': ('CODED_DATA_SECTION/NOTICE_DATA/NO_DOC_OJS',),
+        'procurement_id': (f'{TED_OBJECT}/REFERENCE_NUMBER',),
+        'notice_number': ('CODED_DATA_SECTION/NOTICE_DATA/NO_DOC_OJS',),
+        'source_notice': ('CODED_DATA_SECTION/NOTICE_DATA/REF_NOTICE/NO_DOC_OJS',),
+        'notice_type': ('CODED_DATA_SECTION/CODIF_DATA/TD_DOCUMENT_TYPE',),
+        'procedure_marker': tuple(f'{TED_FORM}/PROCEDURE/{tag}' for tag in (
+            'PT_OPEN', 'PT_RESTRICTED', 'PT_COMPETITIVE_NEGOTIATION', 'PT_COMPETITIVE_DIALOGUE',
+            'PT_INNOVATION_PARTNERSHIP', 'PT_NEGOTIATED_WITH_PRIOR_CALL', 'PT_AWARD_CONTRACT_WITHOUT_CALL'
+        )),
+        'authority_name': (f'{TED_AUTHORITY}/OFFICIALNAME',),
+        'authority_address': (f'{TED_AUTHORITY}/ADDRESS', f'{TED_AUTHORITY}/TOWN', f'{TED_AUTHORITY}/POSTAL_CODE'),
+        'contact': {
+            'contact_point': (f'{TED_AUTHORITY}/CONTACT_POINT',),
+            'phone': (f'{TED_AUTHORITY}/PHONE',),
+            'email': (f'{TED_AUTHORITY}/E_MAIL',),
+            'fax': (f'{TED_AUTHORITY}/FAX',),
+            'url': (f'{TED_AUTHORITY}/URL_GENERAL',),
+            'buyer_profile': (f'{TED_AUTHORITY}/URL_BUYER',)
+        },
+        'cpv': {
+            'section': (f'{TED_OBJECT}/CPV_MAIN/CPV_CODE', f'{TED_OBJECT}/OBJECT_DESCR/CPV_ADDITIONAL/CPV_CODE',
+                        'CODED_DATA_SECTION/NOTICE_DATA/ORIGINAL_CPV'),
+            'fields': {
+                'code': ('@CODE',),
+                'description': ('.',)
+            }
+        },
+        'value': (f'{TED_OBJECT}/VAL_TOTAL', f'{TED_OBJECT}/VAL_ESTIMATED_TOTAL'),
+        'currency': (f'{TED_OBJECT}/VAL_TOTAL/@CURRENCY', f'{TED_OBJECT}/VAL_ESTIMATED_TOTAL/@CURRENCY',
+                     f'{TED_OBJECT}/VAL_RANGE_TOTAL/@CURRENCY'),
+        'value_min': (f'{TED_OBJECT}/VAL_RANGE_TOTAL/LOW',),
+        'value_max': (f'{TED_OBJECT}/VAL_RANGE_TOTAL/HIGH',),
+        'publication_date': ('CODED_DATA_SECTION/REF_OJS/DATE_PUB', f'{TED_FORM}/COMPLEMENTARY_INFO/DATE_DISPATCH_NOTICE'),
+        'deadline': (f'{TED_FORM}/PROCEDURE/DATE_RECEIPT_TENDERS',),
+        'deadline_time': (f'{TED_FORM}/PROCEDURE/TIME_RECEIPT_TENDERS',),
+        'duration': {
+            'DURATION': (f'{TED_OBJECT}/OBJECT_DESCR/DURATION',),
+            'DATE_START': (f'{TED_OBJECT}/OBJECT_DESCR/DATE_START',),
+            'DATE_END': (f'{TED_OBJECT}/OBJECT_DESCR/DATE_END',)
+        },
+        'criteria': (f'{TED_OBJECT}/OBJECT_DESCR/AC',),
+        'lots': {
+            'section': (f'{TED_OBJECT}/OBJECT_DESCR',),
+            'fields': {
+                'number': ('LOT_NO',),
+                'title': ('TITLE/P', 'TITLE'),
+                'cpv_codes': ('CPV_ADDITIONAL/CPV_CODE/@CODE',),
+                'value': ('VAL_OBJECT',)
+            }
+        },
+        'award': {
+            'contractor': (f'{TED_AWARD}/CONTRACTORS/CONTRACTOR/ADDRESS_CONTRACTOR/OFFICIALNAME',
+                           f'{TED_AWARD}/CONTRACTOR/ADDRESS_CONTRACTOR/OFFICIALNAME'),
+            'award_date': (f'{TED_AWARD}/DATE_CONCLUSION_CONTRACT',),
+            'contract_value': (f'{TED_AWARD}/VALUES/VAL_TOTAL',)
+        }
+    }
+}
+
+# Lauki, kuru apstrādei vajag visu apakškoku, nevis tikai elementa tekstu
+SUBTREE_FIELDS = {'criteria'}
+
+# Paziņojuma lauki ar noklusējuma (tukšajām) vērtībām
+NOTICE_DEFAULTS = {
+    'title': '',
+    'contracting_authority': '',
+    'authority_address': '',
+    'authority_contact': {},
+    'cpv_codes': [],
+    'cpv_descriptions': {},
+    'value': '',
+    'value_min': '',
+    'value_max': '',
+    'currency': '',
+    'value_cents': None,  # Summa veselos centos (value, value_max vai value_min)
+    'currency_code': '',  # ISO valūtas kods
+    'deadline': '',  # Iesniegšanas termiņš
+    'appeal_date': '',  # Pārsūdzības termiņš
+    'submission_deadline': '',
+    'deadline_day': None,  # Termiņš - dienas kopš 1970-01-01
+    'notice_type': '',
+    'procedure_type': '',
+    'procedure_category': '',  # Virs/zem ES sliekšņiem
+    'id': '',
+    'ted_id': '',
+    'publication_date': '',
+    'submission_date': '',
+    'identification_number': '',
+    'procurement_id': '',
+    'notice_number': '',  # Paziņojuma numurs
+    'source_notice': '',  # Iepriekšējās versijas paziņojuma numurs
+    'status': '',
+    'description': '',
+    'place_of_performance': '',
+    'nuts_codes': [],
+    'duration': '',
+    'criteria': [],
+    'lots': [],
+    'documents': [],
+    'modifications': [],
+    'award_info': {},
+    'type': '',  # Paziņojuma tips no XML
+    'proc_type': ''  # Procedūras tips no XML
+}
+
+
+def new_notice_info():
+    """Jauna info vārdnīca ar tukšiem laukiem"""
+    return {key: value.copy() if isinstance(value, (list, dict)) else value
+            for key, value in NOTICE_DEFAULTS.items()}
+
+
+def local_tag(tag):
+    """Tags bez namespace daļas"""
+    return tag[tag.rfind('}') + 1:]
+
+
+def detect_layout(root):
+    """Nosaka dokumenta izkārtojumu pēc saknes taga"""
+    tag = local_tag(root.tag)
+    return 'eis' if tag == 'document' or tag.islower() else 'ted'
+
+
+def _compile_path(path):
+    """'a/*/b//c/@ATTR' -> (((meklēt_apakškokā, tags), ...), atribūts)"""
+    attr = None
+    if path.startswith('@'):
+        path, attr = '.', path[1:]
+    elif '/@' in path:
+        path, attr = path.rsplit('/@', 1)
         
-    def extract_namespaces(self, root):
-        """Izvelk visus namespace no XML"""
-        if USE_LXML:
-            self.namespaces = {k: v for k, v in root.nsmap.items() if k}
+    steps = []
+    descendant = False
+    for part in path.split('/'):
+        if part == '.':
+            continue
+        if part == '':
+            descendant = True
+            continue
+        steps.append((descendant, part))
+        descendant = False
+        
+    return tuple(steps), attr
+
+
+def compile_field_plan(plan):
+    """Pārvērš deklaratīvo plānu kompilētos ceļos - tiek izsaukts vienreiz, importējot moduli"""
+    compiled = {}
+    for field, spec in plan.items():
+        if isinstance(spec, dict):
+            compiled[field] = compile_field_plan(spec)
         else:
-            # Standarta ET - meklē namespace manuāli
-            for elem in root.iter():
-                if '}' in elem.tag:
-                    ns = elem.tag.split('}')[0][1:]
-                    prefix = elem.tag.split('}')[0].split('/')[-1]
-                    if ns and ns not in self.namespaces.values():
-                        self.namespaces[prefix] = ns
-        return self.namespaces
-        
-    def find_element(self, root, tag_names, with_namespace=True):
-        """Meklē elementu ar vai bez namespace"""
-        for tag in tag_names:
-            # Mēģina ar namespace
-            if with_namespace:
-                for prefix, ns in self.namespaces.items():
-                    ns_tag = f"{{{ns}}}{tag}"
-                    elem = root.find(f".//{ns_tag}")
-                    if elem is not None:
-                        return elem
-            
-            # Mēģina bez namespace
-            elem = root.find(f".//{tag}")
-            if elem is not None:
-                return elem
-                
-            # Mēģina ar daļēju atbilstību
-            for elem in root.iter():
-                if tag.lower() in elem.tag.lower():
-                    return elem
+            compiled[field] = tuple(_compile_path(path) for path in spec)
+    return compiled
+
+
+def _stream_paths(plan, prefix=(), subtree=False):
+    """Visi ceļi no saknes, kurus plāns var nolasīt: (soļi, vajag_apakškoku)"""
+    for field, spec in plan.items():
+        if 'section' in spec:
+            for section_steps, _ in spec['section']:
+                yield from _stream_paths(spec['fields'], prefix + section_steps)
+        elif isinstance(spec, dict):
+            yield from _stream_paths(spec, prefix)
+        else:
+            for steps, _ in spec:
+                yield prefix + steps, subtree or field in SUBTREE_FIELDS
+
+
+# No cik bērniem elementam tiek veidota bērnu vārdnīca (plakanajai EIS saknei ~90)
+CHILD_MAP_MIN_CHILDREN = 16
+
+COMPILED_FIELD_PLANS = {layout: compile_field_plan(plan) for layout, plan in FIELD_PLANS.items()}
+
+# Parsētāja versija kešatmiņai - mainās līdz ar plāniem; skaitli palielina, mainot _parse_* loģiku
+PARSER_VERSION = '3-' + hashlib.sha1(repr(FIELD_PLANS).encode('utf-8')).hexdigest()[:12]
+
+# Plūsmas režīma ceļi katram izkārtojumam un jau aprēķinātās stāvokļu pārejas
+STREAM_PATHS = {layout: tuple(_stream_paths(plan)) for layout, plan in COMPILED_FIELD_PLANS.items()}
+_STREAM_TRANSITIONS = {}
+
+# Mazākais fails plūsmas režīmam (streaming_parser_min_bytes) - mazākiem koka režīms ir ātrāks
+STREAMING_MIN_BYTES = 1024 * 1024
+
+
+class FieldPlanResolver:
+    """Izpilda kompilētu lauku plānu vienam dokumentam"""
+    
+    def __init__(self, root, plan):
+        self.root = root
+        self.plan = plan
+        self._child_maps = {}
         
-        return None
+    def _children(self, elem, tag):
+        """Tiešie bērni ar doto tagu (bez namespace) dokumenta secībā"""
+        if len(elem) <= CHILD_MAP_MIN_CHILDREN:
+            # Mazām sekcijām (lotes, CPV bloki) vārdnīca maksātu vairāk par pārskatīšanu
+            return [child for child in elem
+                    if isinstance(child.tag, str) and (tag == '*' or local_tag(child.tag) == tag)]
+                    
+        children = self._child_maps.get(elem)
+        if children is None:
+            children = self._child_maps[elem] = {'*': []}
+            for child in elem:
+                if not isinstance(child.tag, str):
+                    continue  # lxml komentāri un apstrādes instrukcijas
+                children['*'].append(child)
+                children.setdefault(local_tag(child.tag), []).append(child)
+        return children.get(tag, ())
+        
+    def _select(self, base, steps):
+        """Elementi dokumenta secībā, kas atbilst kompilētajiem soļiem"""
+        elems = [base]
+        for descendant, tag in steps:
+            matched = []
+            for elem in elems:
+                if descendant:
+                    matched.extend(
+                        child for child in elem.iter()
+                        if child is not elem and isinstance(child.tag, str)
+                        and (tag == '*' or local_tag(child.tag) == tag)
+                    )
+                else:
+                    matched.extend(self._children(elem, tag))
+            elems = matched
+        return elems
+        
+    def elements(self, field, base=None, plan=None):
+        """Visi lauka elementi - ceļu prioritātes secībā"""
+        paths = (self.plan if plan is None else plan).get(field, ())
+        base = self.root if base is None else base
+        return [elem for steps, _ in paths for elem in self._select(base, steps)]
+        
+    def first(self, field, base=None, plan=None):
+        """Pirmais lauka elements vai None"""
+        elems = self.elements(field, base, plan)
+        return elems[0] if elems else None
+        
+    def values(self, field, base=None, plan=None):
+        """Visas netukšās teksta vai atribūta vērtības ceļu prioritātes secībā"""
+        paths = (self.plan if plan is None else plan).get(field, ())
+        base = self.root if base is None else base
+        for steps, attr in paths:
+            for elem in self._select(base, steps):
+                value = elem.get(attr) if attr else elem.text
+                if value and value.strip():
+                    yield value.strip()
+                    
+    def text(self, field, base=None, plan=None):
+        """Pirmā netukšā lauka vērtība vai tukša virkne"""
+        return next(self.values(field, base, plan), '')
+
 
 class ImprovedXMLParser:
     """Uzlabots XML parsētājs ar pilnīgāku lauku atpazīšanu"""
     
-    def __init__(self):
-        self.ns_handler = XMLNamespaceHandler()
+    def load_root(self, xml_path):
+        """Ielādē XML koku ar pieejamo parseri"""
+        if USE_LXML:
+            parser = lxml_ET.XMLParser(recover=True, encoding='utf-8')
+            tree = lxml_ET.parse(xml_path, parser=parser)
+        else:
+            tree = ET.parse(xml_path)
+        return tree.getroot()
         
     def parse_xml_comprehensive(self, xml_path):
         """Visaptveroša XML parsēšana"""
         try:
-            if USE_LXML:
-                parser = lxml_ET.XMLParser(recover=True, encoding='utf-8')
-                tree = lxml_ET.parse(xml_path, parser=parser)
-                root = tree.getroot()
-            else:
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
-                
-            # Izvelk namespaces
-            self.ns_handler.extract_namespaces(root)
-            
-            info = {
-                'title': '',
-                'contracting_authority': '',
-                'authority_address': '',
-                'authority_contact': {},
-                'cpv_codes': [],
-                'cpv_descriptions': {},
-                'value': '',
-                'value_min': '',
-                'value_max': '',
-                'currency': '',
-                'deadline': '',  # Iesniegšanas termiņš
-                'appeal_date': '',  # Pārsūdzības termiņš
-                'submission_deadline': '',
-                'notice_type': '',
-                'procedure_type': '',
-                'procedure_category': '',  # Virs/zem ES sliekšņiem
-                'id': '',
-                'ted_id': '',
-                'publication_date': '',
-                'submission_date': '',
-                'identification_number': '',
-                'procurement_id': '',
-                'status': '',
-                'description': '',
-                'place_of_performance': '',
-                'nuts_codes': [],
-                'duration': '',
-                'criteria': [],
-                'lots': [],
-                'documents': [],
-                'modifications': [],
-                'award_info': {},
-                'type': '',  # Paziņojuma tips no XML
-                'proc_type': ''  # Procedūras tips no XML
-            }
-            
-            # Parsē pamatinformāciju
-            self._parse_basic_info(root, info)
-            
-            # Parsē pasūtītāja informāciju
-            self._parse_authority_info(root, info)
-            
-            # Parsē CPV kodus
-            self._parse_cpv_codes(root, info)
-            
-            # Parsē finansiālo informāciju
-            self._parse_financial_info(root, info)
-            
-            # Parsē datumus
-            self._parse_dates(root, info)
-            
-            # Parsē procedūras informāciju
-            self._parse_procedure_info(root, info)
-            
-            # Parsē lotes (ja ir)
-            self._parse_lots(root, info)
-            
-            # Parsē piešķiršanas informāciju
-            self._parse_award_info(root, info)
+            root = self.load_root(xml_path)
+            return self.parse_root(root)
             
-            # Nosaka procedūras kategoriju
-            self._determine_procedure_category(info)
+        except Exception as e:
+            logging.error(f"Kļūda parsējot {xml_path}: {e}")
+            return None
             
-            return info
+    def parse_root(self, root):
+        """Izvelk visus laukus no jau parsēta XML koka pēc tā izkārtojuma plāna"""
+        plan = COMPILED_FIELD_PLANS[detect_layout(root)]
+        return self._extract_fields(FieldPlanResolver(root, plan))
+        
+    def parse_xml_streaming(self, xml_path):
+        """Iterparse režīms - pilns koks netiek turēts atmiņā
+        
+        Elementi, kurus neviens izkārtojuma plāna ceļš nevar nolasīt, tiek
+        notīrīti uzreiz pēc aizvēršanas. Atlikušajam kokam tiek izpildīts tas
+        pats plāns, tāpēc rezultāts sakrīt ar parse_xml_comprehensive. Notikumu
+        apstrāde Python līmenī ir ~2x lēnāka par koka režīmu, tāpēc to vērts
+        izmantot tikai lieliem failiem (streaming_parser_min_bytes).
+        """
+        try:
+            root, layout = self._stream_root(xml_path)
+            return self._extract_fields(FieldPlanResolver(root, COMPILED_FIELD_PLANS[layout]))
             
         except Exception as e:
             logging.error(f"Kļūda parsējot {xml_path}: {e}")
             return None
             
-    def _parse_basic_info(self, root, info):
-        """Parsē pamatinformāciju"""
-        # Nosaukums - pievienots 'name' tags
-        title_tags = ['name', 'TITLE', 'CONTRACT_NAME', 'OBJECT_DESCR', 'SHORT_DESCR', 'title', 'contract_name']
-        title_elem = self.ns_handler.find_element(root, title_tags)
-        if title_elem is not None and title_elem.text:
-            info['title'] = title_elem.text.strip()
-            
-        # Apraksts
-        desc_tags = ['DESCRIPTION', 'OBJECT_DESCRIPTION', 'SHORT_DESC', 'AC_PROCUREMENT_DOC', 'description']
-        desc_elem = self.ns_handler.find_element(root, desc_tags)
-        if desc_elem is not None and desc_elem.text:
-            info['description'] = desc_elem.text.strip()
-            
-        # ID / Identifikācijas numurs - meklē procurement_code
-        id_tags = ['procurement_code', 'procurement_id', 'NOTICE_NUMBER', 'TED_NOTICE_NUMBER', 'ID', 'NO_DOC_OJS']
-        id_elem = self.ns_handler.find_element(root, id_tags)
-        if id_elem is not None and id_elem.text:
-            info['id'] = id_elem.text.strip()
-            info['identification_number'] = id_elem.text.strip()
-            
-        # Procurement ID - vairs nav vajadzīgs, jo procurement_code jau ir ID
-        if not info['procurement_id']:
-            proc_id_tags = ['FILE_REFERENCE_NUMBER', 'REFERENCE_NUMBER', 'REF_NOTICE']
-            proc_elem = self.ns_handler.find_element(root, proc_id_tags)
-            if proc_elem is not None and proc_elem.text:
-                info['procurement_id'] = proc_elem.text.strip()
-                
-        # Type un proc_type
-        type_elem = self.ns_handler.find_element(root, ['type'])
-        if type_elem is not None and type_elem.text:
-            info['type'] = type_elem.text.strip()
+    def _stream_root(self, xml_path):
+        """Ar iterparse saglabā tikai plāna ceļos esošos elementus un to senčus"""
+        if USE_LXML:
+            events = lxml_ET.iterparse(xml_path, events=('start', 'end'), recover=True)
+        else:
+            events = ET.iterparse(xml_path, events=('start', 'end'))
             
-        proc_type_elem = self.ns_handler.find_element(root, ['proc_type'])
-        if proc_type_elem is not None and proc_type_elem.text:
-            info['proc_type'] = proc_type_elem.text.strip()
+        root = None
+        layout = None
+        stack = []  # Atvērtie elementi: (elements, plāna stāvokļi, saglabājams)
+        subtree_depth = 0  # >0, ja atrodamies pilnībā saglabājamā apakškokā
+        
+        for event, elem in events:
+            if event == 'start':
+                if root is None:
+                    root = elem
+                    layout = detect_layout(elem)
+                    states = frozenset((i, 0) for i, (steps, _) in enumerate(STREAM_PATHS[layout]) if steps)
+                    stack.append((elem, states, True))
+                elif subtree_depth:
+                    subtree_depth += 1
+                    stack.append((elem, None, True))
+                else:
+                    states, keep, subtree = self._stream_transition(layout, stack[-1][1], local_tag(elem.tag))
+                    if subtree:
+                        subtree_depth = 1
+                    stack.append((elem, states, keep))
+                continue
                 
-    def _parse_authority_info(self, root, info):
-        """Parsē pasūtītāja informāciju"""
-        # Meklē pasūtītāja nosaukumu
-        auth_name_tags = ['authority_name', 'OFFICIALNAME', 'NAME']
-        for tag in auth_name_tags:
-            elem = self.ns_handler.find_element(root, [tag])
-            if elem is not None and elem.text:
-                info['contracting_authority'] = elem.text.strip()
+            elem, _, keep = stack.pop()
+            if elem is root:
                 break
                 
-        # Meklē adresi
-        addr_elem = self.ns_handler.find_element(root, ['address', 'ADDRESS'])
-        if addr_elem is not None and addr_elem.text:
-            info['authority_address'] = addr_elem.text.strip()
-            
-        # Meklē pasūtītāja sekciju
-        auth_sections = ['CONTRACTING_AUTHORITY', 'CONTRACTING_BODY', 'CA_CE', 'ADDR_CONTRACTING_BODY']
-        
-        for section_name in auth_sections:
-            auth_elem = self.ns_handler.find_element(root, [section_name])
-            if auth_elem is not None:
-                # Nosaukums
-                if not info['contracting_authority']:
-                    name_elem = auth_elem.find('.//OFFICIALNAME') or auth_elem.find('.//NAME')
-                    if name_elem is not None and name_elem.text:
-                        info['contracting_authority'] = name_elem.text.strip()
-                    
-                # Adrese
-                if not info['authority_address']:
-                    addr_parts = []
-                    for addr_tag in ['ADDRESS', 'STREET', 'TOWN', 'POSTAL_CODE', 'COUNTRY']:
-                        addr_elem = auth_elem.find(f'.//{addr_tag}')
-                        if addr_elem is not None and addr_elem.text:
-                            addr_parts.append(addr_elem.text.strip())
-                    if addr_parts:
-                        info['authority_address'] = ', '.join(addr_parts)
-                    
-                # Kontaktinformācija
-                contact_info = {}
-                contact_tags = {
-                    'CONTACT_POINT': 'contact_point',
-                    'PHONE': 'phone',
-                    'E_MAIL': 'email',
-                    'FAX': 'fax',
-                    'URL': 'url',
-                    'URL_BUYER': 'buyer_profile'
-                }
+            if subtree_depth:
+                subtree_depth -= 1
+            elif not keep and len(elem) == 0:
+                # Nevienam laukam nevajadzīgs un bez saglabātiem bērniem
+                elem.clear()
+                stack[-1][0].remove(elem)
                 
-                for tag, key in contact_tags.items():
-                    elem = auth_elem.find(f'.//{tag}')
-                    if elem is not None and elem.text:
-                        contact_info[key] = elem.text.strip()
-                        
-                if contact_info:
-                    info['authority_contact'] = contact_info
+        return root, layout
+        
+    def _stream_transition(self, layout, states, tag):
+        """Plāna stāvokļi bērnam ar doto tagu: (stāvokļi, saglabājams, viss_apakškoks)"""
+        key = (layout, states, tag)
+        transition = _STREAM_TRANSITIONS.get(key)
+        if transition is not None:
+            return transition
+            
+        paths = STREAM_PATHS[layout]
+        next_states = set()
+        keep = subtree = False
+        for path_index, step_index in states:
+            steps, path_subtree = paths[path_index]
+            descendant, step_tag = steps[step_index]
+            if descendant:
+                next_states.add((path_index, step_index))
+            if step_tag == '*' or step_tag == tag:
+                if step_index + 1 == len(steps):
+                    keep = True
+                    subtree = subtree or path_subtree
+                else:
+                    next_states.add((path_index, step_index + 1))
                     
-                break
+        transition = _STREAM_TRANSITIONS[key] = (frozenset(next_states), keep, subtree)
+        return transition
+
+    def _extract_fields(self, doc):
+        """Aizpilda info vārdnīcu pēc dokumenta lauku plāna"""
+        info = new_notice_info()
+        
+        # Parsē pamatinformāciju
+        self._parse_basic_info(doc, info)
+        
+        # Parsē pasūtītāja informāciju
+        self._parse_authority_info(doc, info)
+        
+        # Parsē CPV kodus
+        self._parse_cpv_codes(doc, info)
+        
+        # Parsē finansiālo informāciju
+        self._parse_financial_info(doc, info)
+        
+        # Parsē datumus
+        self._parse_dates(doc, info)
+        
+        # Parsē procedūras informāciju
+        self._parse_procedure_info(doc, info)
+        
+        # Parsē lotes (ja ir)
+        self._parse_lots(doc, info)
+        
+        # Parsē piešķiršanas informāciju
+        self._parse_award_info(doc, info)
+        
+        # Nosaka procedūras kategoriju
+        self._determine_procedure_category(info)
+        
+        return info
+        
+    def _parse_basic_info(self, doc, info):
+        """Parsē pamatinformāciju"""
+        info['title'] = doc.text('title')
+        info['description'] = doc.text('description')
+        
+        # ID / Identifikācijas numurs - procurement_code
+        info['id'] = doc.text('id')
+        info['identification_number'] = info['id']
+        info['procurement_id'] = doc.text('procurement_id')
+        
+        # Versiju ķēde - paziņojuma numurs un iepriekšējais paziņojums
+        info['notice_number'] = doc.text('notice_number')
+        info['source_notice'] = doc.text('source_notice')
+        
+        # Type un proc_type
+        info['type'] = doc.text('type')
+        info['proc_type'] = doc.text('proc_type')
+        
+    def _parse_authority_info(self, doc, info):
+        """Parsē pasūtītāja informāciju"""
+        info['contracting_authority'] = doc.text('authority_name')
+        info['authority_address'] = ', '.join(doc.values('authority_address'))
+        
+        # Kontaktinformācija
+        contact_plan = doc.plan.get('contact', {})
+        contact_info = {}
+        for key in contact_plan:
+            value = doc.text(key, plan=contact_plan)
+            if value:
+                contact_info[key] = value
                 
-    def _parse_cpv_codes(self, root, info):
+        if contact_info:
+            info['authority_contact'] = contact_info
+            
+    def _parse_cpv_codes(self, doc, info):
         """Parsē CPV kodus ar aprakstiem"""
-        # Meklē vienkāršos <code> tagus
-        for elem in root.iter():
-            if elem.tag.lower() == 'code' and elem.text:
-                code_text = elem.text.strip()
-                # Pārbauda vai ir CPV formāts (8 cipari ar vai bez defises)
-                if re.match(r'^\d{8}(-\d)?$', code_text):
-                    # Noņem defisi un ciparu aiz tās, ja ir
-                    clean_code = code_text.split('-')[0]
-                    if clean_code not in info['cpv_codes']:
-                        info['cpv_codes'].append(clean_code)
-                        
-                        # Meklē aprakstu blakus
-                        parent = elem.getparent() if hasattr(elem, 'getparent') else None
-                        if parent is not None:
-                            desc_elem = parent.find('.//description') or parent.find('.//DESCRIPTION')
-                            if desc_elem is not None and desc_elem.text:
-                                info['cpv_descriptions'][clean_code] = desc_elem.text.strip()
-        
-        # Meklē arī CPV sekcijās
-        cpv_sections = ['CPV_MAIN', 'CPV_ADDITIONAL', 'CPV_CODE', 'ORIGINAL_CPV', 'main_cpv']
-        for section in cpv_sections:
-            for cpv_elem in root.iter():
-                if section.lower() in cpv_elem.tag.lower():
-                    # Meklē CPV kodu
-                    code_elem = cpv_elem.find('.//CODE') or cpv_elem.find('.//code')
-                    if code_elem is not None and code_elem.text:
-                        code = code_elem.text.strip().split('-')[0]  # Noņem -X daļu
-                        if re.match(r'^\d{8}$', code) and code not in info['cpv_codes']:
-                            info['cpv_codes'].append(code)
-                            
-                            # Meklē aprakstu
-                            desc_elem = cpv_elem.find('.//DESCRIPTION') or cpv_elem.find('.//description')
-                            if desc_elem is not None and desc_elem.text:
-                                info['cpv_descriptions'][code] = desc_elem.text.strip()
-                                
-    def _parse_financial_info(self, root, info):
+        cpv_plan = doc.plan.get('cpv')
+        if not cpv_plan:
+            return
+            
+        for cpv_elem in doc.elements('section', plan=cpv_plan):
+            code_text = doc.text('code', cpv_elem, cpv_plan['fields'])
+            # Pārbauda vai ir CPV formāts (8 cipari ar vai bez defises)
+            if not re.match(r'^\d{8}(-\d)?$', code_text):
+                continue
+                
+            # Noņem defisi un ciparu aiz tās, ja ir
+            clean_code = code_text.split('-')[0]
+            if clean_code not in info['cpv_codes']:
+                info['cpv_codes'].append(clean_code)
+                
+            description = doc.text('description', cpv_elem, cpv_plan['fields'])
+            if description and clean_code not in info['cpv_descriptions']:
+                info['cpv_descriptions'][clean_code] = description
+                
+    def _parse_financial_info(self, doc, info):
         """Parsē finansiālo informāciju"""
-        # Vērtība - pievienots 'price' tags
-        value_tags = ['price', 'VAL_TOTAL', 'VALUE', 'VAL_ESTIMATED_TOTAL', 'COSTS_RANGE_AND_CURRENCY']
-        
-        for val_tag in value_tags:
-            val_elem = self.ns_handler.find_element(root, [val_tag])
-            if val_elem is not None:
-                # Meklē valūtu
-                curr_attr = val_elem.get('CURRENCY') or val_elem.get('currency')
-                if curr_attr:
-                    info['currency'] = curr_attr
-                else:
-                    # Meklē currency elementu
-                    curr_elem = self.ns_handler.find_element(root, ['currency', 'CURRENCY'])
-                    if curr_elem is not None and curr_elem.text:
-                        info['currency'] = curr_elem.text.strip()
-                    
-                # Meklē summu
-                if val_elem.text:
-                    info['value'] = val_elem.text.strip()
-                else:
-                    # Meklē bērnos
-                    for child in val_elem:
-                        if child.text and re.search(r'\d', child.text):
-                            info['value'] = child.text.strip()
-                            break
-                            
+        info['value'] = doc.text('value')
+        info['currency'] = doc.text('currency')
+        
         # Diapazons
-        min_elem = self.ns_handler.find_element(root, ['VAL_RANGE_TOTAL_MIN', 'LOWEST_OFFER'])
-        max_elem = self.ns_handler.find_element(root, ['VAL_RANGE_TOTAL_MAX', 'HIGHEST_OFFER'])
+        info['value_min'] = doc.text('value_min')
+        info['value_max'] = doc.text('value_max')
         
-        if min_elem is not None and min_elem.text:
-            info['value_min'] = min_elem.text.strip()
-        if max_elem is not None and max_elem.text:
-            info['value_max'] = max_elem.text.strip()
-            
-    def _parse_dates(self, root, info):
+        # Normalizēta summa filtriem
+        info['value_cents'] = notice_value_cents(info)
+        info['currency_code'] = normalize_currency(info['currency'])
+        
+    def _parse_dates(self, doc, info):
         """Parsē datumus"""
-        # Publicēšanas datums - pievienots pub_date un publication_date
-        pub_tags = ['pub_date', 'publication_date', 'DATE_DISPATCH_NOTICE', 'DATEPUB', 'DATE_PUB']
-        pub_elem = self.ns_handler.find_element(root, pub_tags)
-        if pub_elem is not None and pub_elem.text:
-            info['publication_date'] = self._format_date(pub_elem.text.strip())
-            
-        # Iesniegšanas termiņš - PIEVIENOTS appeal_date
-        deadline_tags = ['appeal_date', 'DEADLINE_RECEIPT_TENDERS', 'DATE_TENDER_VALID', 'TIME_LIMIT', 'deadline', 'submit_date']
-        deadline_elem = self.ns_handler.find_element(root, deadline_tags)
-        if deadline_elem is not None:
-            date_text = deadline_elem.text or ''
-            # Meklē laiku
-            time_elem = deadline_elem.find('.//TIME')
-            if time_elem is not None and time_elem.text:
-                date_text += ' ' + time_elem.text.strip()
-            if date_text.strip():
-                info['deadline'] = self._format_date(date_text.strip())
-                
-        # Atsevišķi meklē appeal_date
-        appeal_elem = self.ns_handler.find_element(root, ['appeal_date'])
-        if appeal_elem is not None and appeal_elem.text:
-            info['appeal_date'] = self._format_date(appeal_elem.text.strip())
+        info['publication_date'] = self._format_date(doc.text('publication_date'))
+        
+        # Iesniegšanas termiņš - datums atsevišķi, lai _is_active to var nolasīt
+        deadline = doc.text('deadline')
+        if deadline:
+            info['deadline'] = self._format_date(deadline)
+            
+            time_text = doc.text('deadline_time')
+            hour = doc.text('deadline_hour')
+            if not time_text and hour:
+                time_text = f"{hour.zfill(2)}:{doc.text('deadline_minute').zfill(2)}"
+            info['submission_deadline'] = f"{info['deadline']} {time_text}".strip()
+            
+        # Pārsūdzības termiņš
+        appeal_date = doc.text('appeal_date')
+        if appeal_date:
+            info['appeal_date'] = self._format_date(appeal_date)
             # Ja nav deadline, izmanto appeal_date
             if not info['deadline']:
                 info['deadline'] = info['appeal_date']
                 
+        # Termiņš kā dienas numurs - deadline_status filtrs bez datumu parsēšanas
+        info['deadline_day'] = deadline_epoch_day(info['deadline'])
+        
         # Līguma ilgums
-        duration_tags = ['DURATION', 'DATE_START', 'DATE_END']
+        duration_plan = doc.plan.get('duration', {})
         duration_info = []
-        for tag in duration_tags:
-            elem = self.ns_handler.find_element(root, [tag])
-            if elem is not None and elem.text:
-                duration_info.append(f"{tag}: {elem.text.strip()}")
+        for label in duration_plan:
+            value = doc.text(label, plan=duration_plan)
+            if value:
+                duration_info.append(f"{label}: {value}")
         if duration_info:
             info['duration'] = '; '.join(duration_info)
             
-    def _parse_procedure_info(self, root, info):
+    def _parse_procedure_info(self, doc, info):
         """Parsē procedūras informāciju"""
         # Procedūras tips no proc_type
         if info['proc_type']:
@@ -428,18 +690,15 @@ class ImprovedXMLParser:
             mapped_type = proc_type_mapping.get(proc_type_num, 'unknown')
             info['procedure_type'] = PROCEDURE_TYPE_MAPPING.get(mapped_type, 'Nav norādīts')
         else:
-            # Meklē citos veidos
-            proc_tags = ['TYPE_PROCEDURE', 'PT_OPEN', 'PT_RESTRICTED', 'PT_NEGOTIATED']
-            for tag in proc_tags:
-                proc_elem = self.ns_handler.find_element(root, [tag])
-                if proc_elem is not None:
-                    if proc_elem.text:
-                        info['procedure_type'] = proc_elem.text.strip()
-                    else:
-                        # Ja tas ir marķiera elements
-                        info['procedure_type'] = tag.replace('PT_', '').replace('_', ' ').title()
-                    break
-                
+            # TED marķiera elements (PT_OPEN u.c.)
+            proc_elem = doc.first('procedure_marker')
+            if proc_elem is not None:
+                if proc_elem.text and proc_elem.text.strip():
+                    info['procedure_type'] = proc_elem.text.strip()
+                else:
+                    tag = local_tag(proc_elem.tag)
+                    info['procedure_type'] = tag.replace('PT_', '').replace('_', ' ').title()
+                    
         # Paziņojuma tips no type
         if info['type']:
             notice_type_mapping = {
@@ -460,14 +719,10 @@ class ImprovedXMLParser:
             
             info['notice_type'] = notice_type_mapping.get(info['type'], info['type'])
         else:
-            # Meklē citos elementos
-            notice_tags = ['NOTICE_TYPE', 'TD_DOCUMENT_TYPE', 'FORM_SECTION']
-            notice_elem = self.ns_handler.find_element(root, notice_tags)
-            if notice_elem is not None and notice_elem.text:
-                info['notice_type'] = notice_elem.text.strip()
+            info['notice_type'] = doc.text('notice_type')
             
         # Kritēriji
-        criteria_elem = self.ns_handler.find_element(root, ['AWARD_CRITERIA', 'AC_CRITERIA'])
+        criteria_elem = doc.first('criteria')
         if criteria_elem is not None:
             criteria_list = []
             for crit in criteria_elem.iter():
@@ -475,7 +730,7 @@ class ImprovedXMLParser:
                     criteria_list.append(crit.text.strip())
             if criteria_list:
                 info['criteria'] = criteria_list
-                
+
     def _determine_procedure_category(self, info):
         """Nosaka vai procedūra ir virs vai zem ES sliekšņiem"""
         proc_type = info.get('procedure_type', '')
@@ -489,125 +744,67 @@ class ImprovedXMLParser:
         else:
             info['procedure_category'] = 'cits'
                 
-    def _parse_lots(self, root, info):
+    def _parse_lots(self, doc, info):
         """Parsē lotes/daļas"""
+        lots_plan = doc.plan.get('lots')
+        if not lots_plan:
+            return
+            
+        fields = lots_plan['fields']
         lots = []
-        lot_sections = root.findall('.//LOT') or root.findall('.//OBJECT_DESCR')
-        
-        for i, lot_elem in enumerate(lot_sections):
+        for i, lot_elem in enumerate(doc.elements('section', plan=lots_plan)):
             lot_info = {
-                'number': str(i + 1),
-                'title': '',
-                'description': '',
-                'cpv_codes': [],
-                'value': ''
+                'number': doc.text('number', lot_elem, fields) or str(i + 1),
+                'title': doc.text('title', lot_elem, fields),
+                'description': doc.text('description', lot_elem, fields),
+                'cpv_codes': [code.split('-')[0] for code in doc.values('cpv_codes', lot_elem, fields)],
+                'value': doc.text('value', lot_elem, fields)
             }
             
-            # Lotes numurs
-            num_elem = lot_elem.find('.//LOT_NUMBER') or lot_elem.find('.//LOT_NO')
-            if num_elem is not None and num_elem.text:
-                lot_info['number'] = num_elem.text.strip()
-                
-            # Nosaukums
-            title_elem = lot_elem.find('.//TITLE') or lot_elem.find('.//LOT_TITLE')
-            if title_elem is not None and title_elem.text:
-                lot_info['title'] = title_elem.text.strip()
-                
-            # CPV kodi
-            for cpv_elem in lot_elem.findall('.//CPV_CODE'):
-                code_elem = cpv_elem.find('.//CODE')
-                if code_elem is not None and code_elem.text:
-                    lot_info['cpv_codes'].append(code_elem.text.strip())
-                    
             if lot_info['title'] or lot_info['cpv_codes']:
                 lots.append(lot_info)
                 
         if lots:
             info['lots'] = lots
             
-    def _parse_award_info(self, root, info):
+    def _parse_award_info(self, doc, info):
         """Parsē līguma piešķiršanas informāciju"""
-        # Meklē uzvarētāju winner_list struktūrā
-        winner_list = self.ns_handler.find_element(root, ['winner_list'])
-        if winner_list is not None:
-            winner = winner_list.find('.//winner')
-            if winner is not None:
-                award_data = {}
-                
-                # Uzvarētāja nosaukums
-                winner_name = winner.find('.//winner_name')
-                if winner_name is not None and winner_name.text:
-                    award_data['contractor'] = winner_name.text.strip()
-                    
-                # Uzvarētāja reģ. numurs
-                winner_reg = winner.find('.//winner_reg_num')
-                if winner_reg is not None and winner_reg.text:
-                    award_data['contractor_reg'] = winner_reg.text.strip()
-                    
-                # Uzvarētāja adrese
-                winner_addr = winner.find('.//winner_address')
-                if winner_addr is not None and winner_addr.text:
-                    award_data['contractor_address'] = winner_addr.text.strip()
-                    
-                if award_data:
-                    info['award_info'] = award_data
-        
-        # Meklē arī citos variantos
-        award_sections = ['AWARD_CONTRACT', 'AWARDED_CONTRACT', 'AWARD']
-        
-        for section in award_sections:
-            award_elem = self.ns_handler.find_element(root, [section])
-            if award_elem is not None:
-                if not info['award_info']:
-                    info['award_info'] = {}
-                    
-                # Uzvarētājs
-                if 'contractor' not in info['award_info']:
-                    contractor_elem = award_elem.find('.//CONTRACTOR') or award_elem.find('.//AWARDED_TO')
-                    if contractor_elem is not None:
-                        name_elem = contractor_elem.find('.//OFFICIALNAME') or contractor_elem.find('.//NAME')
-                        if name_elem is not None and name_elem.text:
-                            info['award_info']['contractor'] = name_elem.text.strip()
-                        
-                # Piešķiršanas datums
-                date_elem = award_elem.find('.//DATE_CONCLUSION_CONTRACT') or award_elem.find('.//DATE_AWARD')
-                if date_elem is not None and date_elem.text:
-                    info['award_info']['award_date'] = self._format_date(date_elem.text.strip())
-                    
-                # Līguma vērtība
-                val_elem = award_elem.find('.//VAL_TOTAL') or award_elem.find('.//VALUE')
-                if val_elem is not None and val_elem.text:
-                    info['award_info']['contract_value'] = val_elem.text.strip()
-                    
-                break
+        award_plan = doc.plan.get('award', {})
+        award_data = {}
+        for key in award_plan:
+            value = doc.text(key, plan=award_plan)
+            if value:
+                award_data[key] = value
                 
+        # Bez uzvarētāja lēmuma datums vai līgumcena nav piešķiršanas informācija
+        if not award_data.get('contractor'):
+            return
+            
+        if 'award_date' in award_data:
+            award_data['award_date'] = self._format_date(award_data['award_date'])
+        info['award_info'] = award_data
+
     def _format_date(self, date_str):
         """Formatē datumu vienotā formātā"""
         if not date_str:
             return ''
             
-        # Mēģina dažādus datuma formātus
-        formats = ['%Y%m%d', '%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y']
-        
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_str, fmt)
-                return date_obj.strftime('%Y-%m-%d')
-            except:
-                continue
-                
-        return date_str  # Atgriež oriģinālo, ja nevar parsēt
+        # Formāts tiek atpazīts pēc regulārās izteiksmes, nevis mēģinot strptime ar katru
+        return format_date(date_str)  # Atgriež oriģinālo, ja nevar parsēt
 
 class OptimizedLocalSearcher:
     """Optimizēts lokālais meklētājs ar paralēlo apstrādi"""
     
-    def __init__(self, config_file='config.json'):
-        self.xml_dir = Path('EIS-XML-Files')
+    def __init__(self, config_file='config.json', config=None, xml_dir='EIS-XML-Files'):
+        self.xml_dir = Path(xml_dir)
         self.results_dir = Path('rezultati')
         self.results_dir.mkdir(exist_ok=True)
         self.processed_ids = set()
         self.procurement_ids = {}
         
+        # Šodienas dienas numurs meklēšanas laikā (None - tiek noteikts katrai pārbaudei)
+        self.today = None
+        
         # Paralēlās apstrādes parametri
         self.num_workers = multiprocessing.cpu_count()
         self.batch_size = 50  # XML failu skaits vienā paketē
@@ -615,8 +812,14 @@ class OptimizedLocalSearcher:
         # XML parsētājs
         self.parser = ImprovedXMLParser()
         
-        # Ielādē konfigurāciju
-        self.load_config(config_file)
+        # Dienas arhīvi (DD_MM_YYYY.xmlpack) {mape: (indeksa mtime, ArchivePack)}
+        self._packs = {}
+        
+        # Ielādē konfigurāciju (vai izmanto jau ielādētu, piem. procesu darbiniekos)
+        if config is not None:
+            self.apply_config(config)
+        else:
+            self.load_config(config_file)
         
     def load_config(self, config_file):
         """Ielādē meklēšanas kritērijus"""
@@ -626,21 +829,160 @@ class OptimizedLocalSearcher:
                 self.search_criteria = self.config.get('search_criteria', {})
         except FileNotFoundError:
             logging.warning(f"Konfigurācijas fails {config_file} nav atrasts")
+            self.config = {}
             self.search_criteria = {}
             
+        self.apply_config(self.config, self.search_criteria)
+        
+    def apply_config(self, config, search_criteria=None):
+        """Iestata parametrus no konfigurācijas vārdnīcas"""
+        self.config = config
+        if search_criteria is None:
+            search_criteria = config.get('search_criteria', {})
+        # Jauna vārdnīca ar saraksta kopijām (pasūtītāji, atslēgvārdi u.c.) - izsaucēja
+        # kritēriji (un config['search_criteria']) netiek mainīti
+        search_criteria = {key: list(value) if isinstance(value, list) else value
+                           for key, value in search_criteria.items()}
+        
+        # Summas robežas no konfigurācijas (0 - bez ierobežojuma), ja kritērijos tās nav norādītas
+        for key, config_key in (('min_value', 'min_contract_value'), ('max_value', 'max_contract_value')):
+            if config.get(config_key) and key not in search_criteria:
+                search_criteria[key] = config[config_key]
+        self.search_criteria = search_criteria
+        
+        # Atslēgvārdu salīdzināšana: 'variants' (locījumu variācijas) vai 'stem' (vārdu celmi)
+        self.keyword_matcher = config.get('keyword_matcher', 'variants')
+        
+        # Hierarhiska CPV meklēšana - 37400000 atrod arī 37411000 u.c. apakšlīmeņus
+        self.cpv_hierarchy = config.get('cpv_hierarchy', False)
+        
+        # Paralēlās apstrādes režīms: 'thread' vai 'process' (izmanto visus kodolus)
+        self.parallel_mode = config.get('parallel_mode', 'thread')
+        
+        # Plūsmas režīms lieliem paziņojumiem - atmiņā netiek turēts viss koks, bet
+        # parsēšana ir ~2x lēnāka, tāpēc tikai failiem no streaming_parser_min_bytes
+        self.streaming_parser = self.config.get('streaming_parser', False)
+        self.streaming_min_bytes = self.config.get('streaming_parser_min_bytes', STREAMING_MIN_BYTES)
+        
+        # Kompilēti kritēriji un neparsētu baitu priekšfiltrs - tiek veidoti
+        # vienreiz, kad mainās search_criteria
+        self.use_prefilter = self.config.get('prefilter', True)
+        self._compiled_criteria = None
+        self._prefilter = None
+        self._criteria_key = None
+        self._keyword_patterns = {}
+        
+        # Parsēto paziņojumu kešatmiņa - XML faili pēc atarhivēšanas nemainās
+        if self.config.get('parse_cache', True):
+            self.parse_cache = ParseCache(self.xml_dir / CACHE_FILE_NAME, PARSER_VERSION)
+        else:
+            self.parse_cache = None
+            
+        # Indeksa datne (atjauno lejupielādētājs) - arī BM25 statistika rezultātu kārtošanai
+        self.index_file = NoticeIndex(self.xml_dir / INDEX_FILE_NAME)
+        
+        # Pilna teksta indekss - atlasa kandidātu failus
+        self.notice_index = self.index_file if self.config.get('fulltext_index', True) else None
+        self._index_query = None
+        
+        # Paziņojumu versiju ķēdes (tās pašas indeksa datnes notice_lineage tabula)
+        self.lineage_index = self.index_file if self.config.get('notice_lineage', True) else None
+            
+        # Dienu kolonnu momentuzņēmumi (raksta lejupielādētājs)
+        self.use_snapshots = self.config.get('snapshots', True)
+        
+        # Dienu mapju manifests (raksta lejupielādētājs) - failu saraksti bez mapju pārlasīšanas
+        if self.config.get('date_manifest', True):
+            self.manifest = DateManifest(self.xml_dir)
+        else:
+            self.manifest = None
+            
+        # Rezultātu kešs (MB, 0 - izslēgts) - ieraksti nederīgi pēc lejupielādētāja datu paaudzes maiņas
+        cache_mb = self.config.get('result_cache_mb', 0)
+        if cache_mb:
+            self.result_cache = ResultCache(int(cache_mb * 1024 * 1024), DataGeneration(self.xml_dir))
+        else:
+            self.result_cache = None
+            
+    def parse_notice(self, xml_path, root=None):
+        """Parsē paziņojumu, vispirms meklējot kešatmiņā
+        
+        Ja koks jau ir ielādēts (root), lauki tiek izvilkti no tā, nevis no faila.
+        """
+        if root is not None:
+            parse = lambda path: self.parser.parse_root(root)
+        elif self.streaming_parser and self.use_streaming(os.path.getsize(xml_path)):
+            parse = self.parser.parse_xml_streaming
+        else:
+            parse = self.parser.parse_xml_comprehensive
+            
+        if self.parse_cache is None:
+            return parse(str(xml_path))
+        return self.parse_cache.get_or_parse(str(xml_path), parse)
+        
+    def parse_raw(self, raw):
+        """Parsē paziņojumu no baitiem (dienas arhīva fails - kešatmiņa netiek izmantota)"""
+        if self.use_streaming(len(raw)):
+            return self.parser.parse_xml_streaming(io.BytesIO(raw))
+        return self.parser.parse_xml_comprehensive(io.BytesIO(raw))
+        
+    def use_streaming(self, size):
+        """Vai parsēt plūsmas režīmā - ieslēgts un fails nav mazāks par streaming_min_bytes
+        
+        Plūsmas režīms ietaupa atmiņu lieliem paziņojumiem ar daudzām daļām, bet
+        parastam paziņojumam ir ~2x lēnāks par koka režīmu (benchmark_parser.py).
+        """
+        return self.streaming_parser and size >= self.streaming_min_bytes
+            
+    def get_compiled_criteria(self) -> CompiledCriteria:
+        """Kompilēti pašreizējie kritēriji (tiek pārveidoti, ja kritēriji mainās)"""
+        key = json.dumps(self.search_criteria, sort_keys=True, default=str)
+        if key != self._criteria_key:
+            self._compiled_criteria = CompiledCriteria(self.search_criteria, self.create_word_variations,
+                                                       self.normalize_latvian_text, self.keyword_matcher,
+                                                       self.cpv_hierarchy)
+            if self.use_prefilter:
+                self._prefilter = RawPrefilter(self.search_criteria, self.create_word_variations,
+                                               self.normalize_latvian_text, self.keyword_matcher,
+                                               self.cpv_hierarchy)
+            self._index_query = build_fts_query(self.search_criteria, self.create_word_variations,
+                                                self.normalize_latvian_text, self.keyword_matcher)
+            self._criteria_key = key
+        return self._compiled_criteria
+        
+    def get_prefilter(self) -> Optional[RawPrefilter]:
+        """Priekšfiltrs pašreizējiem kritērijiem"""
+        if not self.use_prefilter:
+            return None
+        self.get_compiled_criteria()
+        return self._prefilter
+        
     def process_xml_batch(self, xml_files: List[Path], date_str: str) -> List[Dict]:
         """Apstrādā XML failu paketi"""
         results = []
+        criteria = self.get_compiled_criteria()
+        prefilter = self.get_prefilter()
         
         for xml_file in xml_files:
             try:
-                # Parsē XML
-                parsed_info = self.parser.parse_xml_comprehensive(str(xml_file))
+                if isinstance(xml_file, PackMember):
+                    # Dienas arhīva fails - nolasīts pēc nobīdes vienreiz priekšfiltram un parsēšanai
+                    raw = xml_file.read_bytes()
+                    if prefilter is not None and not prefilter.may_match_bytes(raw):
+                        continue
+                    parsed_info = self.parse_raw(raw)
+                else:
+                    # Faili, kuros neviens atslēgvārds vai CPV kods nevar būt, netiek parsēti
+                    if prefilter is not None and not prefilter.may_match(xml_file):
+                        continue
+                        
+                    # Parsē XML (vai ņem no kešatmiņas)
+                    parsed_info = self.parse_notice(xml_file)
                 if not parsed_info:
                     continue
                     
                 # Pārbauda atbilstību kritērijiem
-                if self._matches_criteria(parsed_info, str(xml_file)):
+                if self._matches_criteria(parsed_info, str(xml_file), criteria):
                     parsed_info['date'] = date_str
                     parsed_info['xml_file'] = xml_file.name
                     results.append(parsed_info)
@@ -650,12 +992,15 @@ class OptimizedLocalSearcher:
                 
         return results
         
-    def _matches_criteria(self, info: Dict, xml_path: str) -> bool:
+    def _matches_criteria(self, info: Dict, xml_path: str, criteria: Optional[CompiledCriteria] = None) -> bool:
         """Pārbauda vai XML atbilst meklēšanas kritērijiem"""
+        if criteria is None:
+            criteria = self.get_compiled_criteria()
+            
         # Pārbauda aktualitāti
         if 'deadline_status' in self.search_criteria:
             deadline_status = self.search_criteria['deadline_status']
-            is_active = self._is_active(info.get('deadline', ''))
+            is_active = self._is_active(info.get('deadline_day'))
             
             if deadline_status == 'active' and not is_active:
                 return False
@@ -667,6 +1012,18 @@ class OptimizedLocalSearcher:
             allowed_types = self.search_criteria['procedure_types']
             if info.get('procedure_type') not in allowed_types:
                 return False
+                
+        # Pārbauda procedūras kategorijas un paziņojumu veidus
+        if self.search_criteria.get('procedure_categories'):
+            if info.get('procedure_category') not in self.search_criteria['procedure_categories']:
+                return False
+        if self.search_criteria.get('notice_types'):
+            if info.get('notice_type') not in self.search_criteria['notice_types']:
+                return False
+                
+        # Pārbauda summu (paziņojumi bez summas vai citā valūtā netiek izslēgti)
+        if not criteria.value_matches(info.get('value_cents'), info.get('currency_code', '')):
+            return False
         
         # Pārbauda statusu
         status = info.get('status', 'IZSLUDINĀTS')
@@ -674,30 +1031,23 @@ class OptimizedLocalSearcher:
         
         if status and status not in allowed_statuses:
             return False
+            
+        # Pārbauda pasūtītāju (contracting_authorities - nosaukuma daļas, trigrammu indekss)
+        if not criteria.authorities.matches(info.get('contracting_authority', '')):
+            return False
         
         # Ja nav kritēriju, parāda visu
         if self.search_criteria.get('show_all', False):
             return True
             
-        # Pārbauda atslēgvārdus
-        text_content = ' '.join([
+        # Pārbauda atslēgvārdus (mazo burtu un normalizētā forma tiek aprēķināta vienreiz)
+        text_content = NormalizedText(' '.join([
             info.get('title', ''),
             info.get('description', ''),
             info.get('contracting_authority', '')
-        ])
-        
-        keyword_found = False
-        matched_keywords = []
+        ]))
         
-        for kw in self.search_criteria.get('keywords', []):
-            if self._text_contains_keyword(text_content, kw):
-                keyword_found = True
-                matched_keywords.append(kw)
-                
         # Pārbauda CPV kodus
-        cpv_found = False
-        found_cpv_codes = []
-        
         # Attīra CPV kodus
         cleaned_cpv_codes = []
         for cpv in info.get('cpv_codes', []):
@@ -706,19 +1056,10 @@ class OptimizedLocalSearcher:
                 cleaned_cpv_codes.append(cleaned)
         info['cpv_codes'] = cleaned_cpv_codes
         
-        for cpv in self.search_criteria.get('cpv_codes', []):
-            cleaned_search_cpv = cpv.split('-')[0] if '-' in cpv else cpv
-            if cleaned_search_cpv in info.get('cpv_codes', []):
-                cpv_found = True
-                found_cpv_codes.append(cleaned_search_cpv)
-                
-        # Pārbauda izslēgtos vārdus
-        excluded = False
-        for ex in self.search_criteria.get('exclude_keywords', []):
-            if self._text_contains_keyword(text_content, ex):
-                excluded = True
-                break
-                
+        matched_keywords, found_cpv_codes, excluded = self._match_text(text_content, cleaned_cpv_codes, criteria)
+        keyword_found = len(matched_keywords) > 0
+        cpv_found = len(found_cpv_codes) > 0
+        
         # Saglabā atrastos atslēgvārdus
         if keyword_found or cpv_found:
             info['matched_keywords'] = matched_keywords
@@ -726,72 +1067,35 @@ class OptimizedLocalSearcher:
             
         return (keyword_found or cpv_found) and not excluded
         
-    def _is_active(self, deadline_str: str) -> bool:
+    def _match_text(self, text_content, cpv_codes, criteria):
+        """Atrastie atslēgvārdi, atrastie CPV kodi un vai teksts satur izslēgtu vārdu"""
+        return (criteria.matched_keywords(text_content), criteria.matched_cpv_codes(cpv_codes),
+                criteria.is_excluded(text_content))
+        
+    def _is_active(self, deadline_day: Optional[int]) -> bool:
         """Pārbauda vai iepirkums ir aktīvs (termiņš nav beidzies)"""
-        if not deadline_str:
-            return True  # Ja nav termiņa, pieņem ka aktīvs
-            
-        try:
-            deadline = datetime.strptime(deadline_str, '%Y-%m-%d')
-            return deadline >= datetime.now()
-        except:
-            return True  # Ja nevar parsēt, pieņem ka aktīvs
+        # Ja nav termiņa vai to nevar nolasīt, pieņem ka aktīvs
+        today = self.today if self.today is not None else today_epoch_day()
+        return is_active_day(deadline_day, today)
         
     def _text_contains_keyword(self, text: str, keyword: str) -> bool:
         """Pārbauda vai tekstā ir atslēgvārds ar locījumu atbalstu"""
-        text_lower = text.lower()
-        text_normalized = self.normalize_latvian_text(text)
-        
-        # Ja atslēgvārds ir vairāku vārdu frāze
-        if ' ' in keyword:
-            words = keyword.split()
-            # Pārbauda vai visi vārdi ir tekstā
-            all_found = True
-            for word in words:
-                word_variations = self.create_word_variations(word)
-                word_found = False
-                for variation in word_variations:
-                    pattern = r'\b' + re.escape(variation) + r'\b'
-                    if re.search(pattern, text_lower, re.IGNORECASE):
-                        word_found = True
-                        break
-                if not word_found:
-                    all_found = False
-                    break
-            return all_found
-        else:
-            # Viena vārda meklēšana
-            keyword_variations = self.create_word_variations(keyword)
+        pattern = self._keyword_patterns.get(keyword)
+        if pattern is None:
+            if self.keyword_matcher == 'stem':
+                pattern = StemPattern(keyword, self.normalize_latvian_text)
+            else:
+                pattern = KeywordPattern(keyword, self.create_word_variations, self.normalize_latvian_text)
+            self._keyword_patterns[keyword] = pattern
             
-            for variation in keyword_variations:
-                pattern = r'\b' + re.escape(variation) + r'\b'
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    return True
-                    
-                pattern_norm = r'\b' + re.escape(self.normalize_latvian_text(variation)) + r'\b'
-                if re.search(pattern_norm, text_normalized, re.IGNORECASE):
-                    return True
-                    
-        return False
+        doc = as_normalized(text)
+        if self.keyword_matcher == 'stem':
+            return pattern.matches(StemmedText(doc.normalized))
+        return pattern.matches(doc)
         
     def normalize_latvian_text(self, text):
         """Normalizē latviešu tekstu meklēšanai"""
-        if not text:
-            return ""
-            
-        replacements = {
-            'ā': 'a', 'č': 'c', 'ē': 'e', 'ģ': 'g', 
-            'ī': 'i', 'ķ': 'k', 'ļ': 'l', 'ņ': 'n', 
-            'š': 's', 'ū': 'u', 'ž': 'z',
-            'Ā': 'A', 'Č': 'C', 'Ē': 'E', 'Ģ': 'G',
-            'Ī': 'I', 'Ķ': 'K', 'Ļ': 'L', 'Ņ': 'N',
-            'Š': 'S', 'Ū': 'U', 'Ž': 'Z'
-        }
-        
-        for latvian, ascii in replacements.items():
-            text = text.replace(latvian, ascii)
-            
-        return text.lower()
+        return normalize_latvian_text(text)
         
     def create_word_variations(self, word):
         """Izveido vārda variācijas ar locījumiem"""
@@ -821,14 +1125,46 @@ class OptimizedLocalSearcher:
         
     def search_date_range_parallel(self, start_date: str, end_date: str) -> List[Dict]:
         """Meklē datumu diapazonā ar paralēlo apstrādi"""
+        self.today = today_epoch_day()
+        try:
+            return self._search_date_range(start_date, end_date)
+        finally:
+            self.today = None
+            
+    def _search_date_range(self, start_date: str, end_date: str) -> List[Dict]:
+        """search_date_range_parallel ar fiksētu šodienas datumu (self.today)"""
         all_results = []
         self.processed_ids.clear()
         self.procurement_ids.clear()
         
+        # Savāc visus XML failus pa datumiem
+        files_by_date = self.collect_date_files(start_date, end_date)
+            
+        # Dienas ar aktuālu momentuzņēmumu tiek filtrētas pa kolonnām, XML netiek parsēts
+        snapshots = self.load_snapshots(files_by_date)
+        files_by_date = self.filter_with_index(files_by_date, start_date, end_date)
+        snapshot_days = [(date_str, xml_files) for date_str, xml_files in files_by_date if date_str in snapshots]
+        files_by_date = [(date_str, xml_files) for date_str, xml_files in files_by_date if date_str not in snapshots]
+        
+        all_results = self._search_snapshots(snapshot_days, snapshots)
+        if self.parallel_mode == 'process':
+            all_results.extend(self._search_with_processes(files_by_date))
+        else:
+            all_results.extend(self._search_with_threads(files_by_date))
+            
+        # Rezultāti datumu secībā (kā pirms momentuzņēmumiem)
+        all_results.sort(key=lambda result: result['date'])
+            
+        # Noņem dublikātus
+        unique_results = self._remove_duplicates(all_results)
+        
+        logging.info(f"Kopā atrasti {len(unique_results)} unikāli rezultāti")
+        return unique_results
+        
+    def collect_date_files(self, start_date: str, end_date: str) -> List:
+        """Datumu diapazona XML faili [(date_str, xml_files)] dienām, kurās tādi ir"""
         current_date = datetime.strptime(start_date, '%Y-%m-%d')
         end = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        # Savāc visus XML failus pa datumiem
         files_by_date = []
         
         while current_date <= end:
@@ -836,15 +1172,160 @@ class OptimizedLocalSearcher:
             date_folder = current_date.strftime('%d_%m_%Y')
             xml_date_dir = self.xml_dir / date_folder
             
-            if xml_date_dir.exists():
-                xml_files = list(xml_date_dir.glob('*.xml'))
-                if xml_files:
-                    files_by_date.append((date_str, xml_files))
-                    logging.info(f"Datumam {date_str} atrasti {len(xml_files)} XML faili")
+            xml_files = self.list_xml_files(xml_date_dir)
+            if xml_files:
+                files_by_date.append((date_str, xml_files))
+                logging.info(f"Datumam {date_str} atrasti {len(xml_files)} XML faili")
                     
             current_date += timedelta(days=1)
             
-        # Apstrādā ar ThreadPoolExecutor
+        return files_by_date
+        
+    def list_xml_files(self, xml_date_dir):
+        """Dienas mapes XML faili - no manifesta vai, ja tas nav aktuāls, no mapes satura
+        
+        Ja mapes nav, bet ir dienas arhīvs (DD_MM_YYYY.xmlpack), tiek atgriezti
+        arhīva faili (PackMember), kas tiek nolasīti pēc nobīdes bez atarhivēšanas.
+        """
+        if self.manifest is not None:
+            xml_files = self.manifest.xml_files(xml_date_dir)
+            if xml_files is not None:
+                return xml_files
+                
+        if not xml_date_dir.exists():
+            pack = self.archive_pack(xml_date_dir)
+            return pack.xml_files() if pack is not None else []
+        return sorted(xml_date_dir.glob('*.xml'))
+        
+    def archive_pack(self, xml_date_dir):
+        """Dienas arhīvs vai None (kešots, kamēr tā indekss nemainās)"""
+        try:
+            mtime_ns = os.stat(pack_index_path(pack_path_for(xml_date_dir))).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._packs.get(str(xml_date_dir))
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        pack = ArchivePack.for_folder(xml_date_dir)
+        if cached is not None:
+            cached[1].close()
+        self._packs[str(xml_date_dir)] = (mtime_ns, pack)
+        return pack
+        
+    def load_snapshots(self, files_by_date):
+        """Aktuālie dienu momentuzņēmumi {date_str: NoticeSnapshot}"""
+        if not self.use_snapshots:
+            return {}
+            
+        snapshots = {}
+        for date_str, xml_files in files_by_date:
+            snapshot = load_snapshot(self.xml_dir, xml_files[0].parent, len(xml_files), PARSER_VERSION)
+            if snapshot is not None:
+                snapshots[date_str] = snapshot
+        if snapshots:
+            logging.info(f"Momentuzņēmumi: {len(snapshots)} no {len(files_by_date)} dienām")
+        return snapshots
+        
+    def _search_snapshots(self, snapshot_days, snapshots):
+        """Meklē dienās ar momentuzņēmumiem
+        
+        Lauku filtri visām dienām ir vienas maskas; atlikušajām rindām atslēgvārdi
+        un CPV kodi tiek pārbaudīti pēc search_text un cpv kolonnām, un vārdnīcas
+        tiek atjaunotas un pārbaudītas ar _matches_criteria tikai atbilstošajām.
+        """
+        if not snapshot_days:
+            return []
+            
+        snapshot_set = SnapshotSet(snapshots[date_str] for date_str, _ in snapshot_days)
+        criteria = self.get_compiled_criteria()
+        rows_per_day = snapshot_set.surviving(snapshot_set.mask(self.search_criteria, today=self.today,
+                                                                authorities=criteria.authorities))
+        
+        results = []
+        show_all = self.search_criteria.get('show_all', False)
+        for (date_str, xml_files), rows in zip(snapshot_days, rows_per_day):
+            snapshot = snapshots[date_str]
+            rows_by_file = {snapshot.text('file', row): row for row in rows}
+            for xml_file in xml_files:
+                row = rows_by_file.get(xml_file.name)
+                if row is None:
+                    continue
+                if not show_all:
+                    keywords, cpv_codes, excluded = self._match_text(
+                        NormalizedText(snapshot.text('search_text', row)), snapshot.text('cpv', row).split(),
+                        criteria)
+                    if excluded or not (keywords or cpv_codes):
+                        continue
+                        
+                info = snapshot.notice(row)
+                if self._matches_criteria(info, str(xml_file), criteria):
+                    info['date'] = date_str
+                    info['xml_file'] = xml_file.name
+                    results.append(info)
+                    
+        return results
+        
+    def filter_with_index(self, files_by_date, start_date, end_date):
+        """Atstāj tikai pilna teksta indeksa kandidātus
+        
+        Mapes, kuru indekss neatbilst failu skaitam vai mapes mtime, tiek
+        pārbaudītas pilnībā. Kandidāti vienmēr tiek pārbaudīti ar parasto meklēšanu.
+        """
+        if self.notice_index is None or not self.notice_index.exists() or not files_by_date:
+            return files_by_date
+            
+        criteria = self.get_compiled_criteria()
+        value_limits = criteria.min_cents is not None or criteria.max_cents is not None
+        deadline_status = self.search_criteria.get('deadline_status')
+        if deadline_status not in ('active', 'expired'):
+            deadline_status = None
+        if self._index_query is None and not value_limits and deadline_status is None:
+            return files_by_date
+            
+        try:
+            candidates = None
+            if self._index_query is not None:
+                candidates = self.notice_index.candidates(self._index_query, start_date, end_date,
+                                                          criteria.cpv_codes, self.cpv_hierarchy)
+            # Summas ārpus min/max robežām - divi bisect summu indeksā
+            excluded = set()
+            if value_limits:
+                excluded = self.notice_index.value_excluded(criteria.min_cents, criteria.max_cents,
+                                                            start_date, end_date)
+            # Termiņi - viens bisect pret šodienu; paziņojumi bez termiņa ir aktīvi
+            if deadline_status is not None:
+                today = self.today if self.today is not None else today_epoch_day()
+                expired = self.notice_index.expired_paths(today, start_date, end_date)
+                if deadline_status == 'active':
+                    excluded = excluded | expired
+                else:
+                    candidates = expired if candidates is None else candidates & expired
+            filtered = []
+            total = kept = 0
+            for date_str, xml_files in files_by_date:
+                total += len(xml_files)
+                if not self.notice_index.is_current(xml_files[0].parent, len(xml_files)):
+                    logging.info(f"Indekss datumam {date_str} nav aktuāls - tiek pārbaudīti visi faili")
+                    filtered.append((date_str, xml_files))
+                    kept += len(xml_files)
+                    continue
+                    
+                matching = [f for f in xml_files
+                            if (candidates is None or os.path.abspath(f) in candidates)
+                            and os.path.abspath(f) not in excluded]
+                if matching:
+                    filtered.append((date_str, matching))
+                    kept += len(matching)
+        except Exception as e:
+            logging.error(f"Kļūda izmantojot pilna teksta indeksu: {e}")
+            return files_by_date
+            
+        logging.info(f"Pilna teksta indekss: pārbaudāmi {kept} no {total} XML failiem")
+        return filtered
+        
+    def _search_with_threads(self, files_by_date):
+        """Apstrādā paketes ar ThreadPoolExecutor"""
+        all_results = []
         with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
             futures = []
             
@@ -863,34 +1344,332 @@ class OptimizedLocalSearcher:
                 except Exception as e:
                     logging.error(f"Kļūda apstrādājot paketi: {e}")
                     
-        # Noņem dublikātus
-        unique_results = self._remove_duplicates(all_results)
+        return all_results
         
-        logging.info(f"Kopā atrasti {len(unique_results)} unikāli rezultāti")
-        return unique_results
+    def _search_with_processes(self, files_by_date):
+        """Apstrādā paketes ar ProcessPoolExecutor - XML parsēšana nav ierobežota ar GIL
         
+        Kritēriji un konfigurācija katram procesam tiek nosūtīti vienreiz
+        (initializer), paketē - tikai mape un failu nosaukumi.
+        """
+        all_results = []
+        with ProcessPoolExecutor(max_workers=self.num_workers,
+                                 initializer=_init_search_worker,
+                                 initargs=(self.config, self.search_criteria, str(self.xml_dir),
+                                           self.today)) as executor:
+            futures = []
+            
+            for date_str, xml_files in files_by_date:
+                folder = str(xml_files[0].parent)
+                names = [xml_file.name for xml_file in xml_files]
+                for i in range(0, len(names), self.batch_size):
+                    future = executor.submit(_search_worker_batch, folder, names[i:i + self.batch_size], date_str)
+                    futures.append(future)
+                    
+            # Savāc rezultātus un atjauno pilnās info vārdnīcas
+            for future in futures:
+                try:
+                    all_results.extend(expand_notice(compact) for compact in future.result())
+                except Exception as e:
+                    logging.error(f"Kļūda apstrādājot paketi: {e}")
+                    
+        return all_results
+        
+    def _result_path(self, result):
+        """Rezultāta XML faila ceļš (dienas mape DD_MM_GGGG)"""
+        folder = datetime.strptime(result['date'], '%Y-%m-%d').strftime('%d_%m_%Y')
+        return os.path.abspath(self.xml_dir / folder / result['xml_file'])
+        
+    def _lineage_keys(self, results):
+        """Rezultātu iepirkumu atslēgas no versiju indeksa {ceļš: atslēga}"""
+        if self.lineage_index is None or not self.lineage_index.exists() or not results:
+            return {}
+        try:
+            return self.lineage_index.lineage_keys(
+                self._result_path(result) for result in results if result.get('date') and result.get('xml_file'))
+        except Exception as e:
+            logging.error(f"Kļūda nolasot paziņojumu versijas: {e}")
+            return {}
+            
     def _remove_duplicates(self, results: List[Dict]) -> List[Dict]:
-        """Noņem dublikātus pēc procurement_id vai citas unikālas vērtības"""
-        seen = set()
-        unique = []
+        """Viena rinda katram iepirkumam - jaunākā atrastā paziņojuma versija
+        
+        Iepirkuma atslēga tiek ņemta no versiju indeksa (notice_lineage), citādi
+        no paša paziņojuma (procurement_id / procurement_code / source_notice ķēdes
+        starp atrastajiem paziņojumiem).
+        """
+        lineage = self._lineage_keys(results)
+        plain_keys = chain_keys(results)
+        latest = {}
+        matched = {}
         
-        for result in results:
-            # Izveido unikālu atslēgu
+        for result, plain_key in zip(results, plain_keys):
             key = None
-            if result.get('procurement_id'):
-                key = f"proc_{result['procurement_id']}"
-            elif result.get('identification_number'):
-                key = f"id_{result['identification_number']}"
-            elif result.get('id'):
-                key = f"id_{result['id']}"
-            elif result.get('title'):
-                key = f"title_{hash(result['title'])}"
+            if result.get('date') and result.get('xml_file'):
+                key = lineage.get(self._result_path(result))
+            key = key or plain_key
+            if not key:
+                continue
                 
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(result)
+            matched[key] = matched.get(key, 0) + 1
+            current = latest.get(key)
+            if current is None or version_order(result, result.get('date', '')) >= version_order(
+                    current, current.get('date', '')):
+                latest[key] = result
                 
+        # Zināmās versijas no indeksa - arī tās, kas neatbilst meklēšanai
+        versions = {}
+        if lineage:
+            try:
+                versions = self.lineage_index.latest_versions(set(lineage.values()))
+            except Exception as e:
+                logging.error(f"Kļūda nolasot paziņojumu versijas: {e}")
+                
+        unique = []
+        for key, result in latest.items():
+            result['procurement_key'] = key
+            result['matched_versions'] = matched[key]
+            self._add_version_info(result, versions)
+            unique.append(result)
+            
+        unique.sort(key=lambda result: result.get('date', ''))
         return unique
+        
+    def _add_version_info(self, result, versions):
+        """Iepirkuma versiju skaits un jaunākā versija no latest_versions"""
+        key = result['procurement_key']
+        if key in versions:
+            count, newest = versions[key]
+            result['versions'] = count
+            result['latest_version'] = {
+                'date': newest['date'],
+                'xml_file': os.path.basename(newest['path']),
+                'notice_number': newest['notice_number'],
+                'notice_type': newest['notice_type'],
+            }
+        
+    def score_results(self, results: List[Dict]) -> List[Dict]:
+        """Aprēķina katra rezultāta BM25 vērtējumu ('score') pēc atslēgvārdu celmiem"""
+        terms = query_stems(self.search_criteria.get('keywords', []))
+        docs = [field_stems(result) for result in results]
+        
+        stats = self._index_rank_stats(terms)
+        if stats is None:
+            stats = CorpusStats.from_documents(docs, terms)
+            
+        for result, doc in zip(results, docs):
+            result['score'] = bm25_score(doc, terms, stats)
+        return results
+        
+    def _index_rank_stats(self, terms):
+        """BM25 korpusa statistika no pilna teksta indeksa vai None"""
+        if not terms or not self.index_file.exists():
+            return None
+        try:
+            return self.index_file.rank_stats(terms)
+        except Exception as e:
+            logging.error(f"Kļūda nolasot BM25 statistiku: {e}")
+            return None
+            
+    def rank_scorer(self, results):
+        """Funkcija score(result) lapas atlasei vai None, ja rezultāti jau novērtēti
+        
+        Ar indeksa statistiku katrs rezultāts tiek novērtēts tikai atlases laikā;
+        bez indeksa statistikai vajag visus dokumentus, tāpēc tiek izmantots
+        score_results.
+        """
+        terms = query_stems(self.search_criteria.get('keywords', []))
+        stats = self._index_rank_stats(terms)
+        if stats is None:
+            self.score_results(results)
+            return None
+        return lambda result: bm25_score(field_stems(result), terms, stats)
+        
+    def search_cached(self, start_date: str, end_date: str) -> List[Dict]:
+        """search_date_range_parallel caur rezultātu kešu (ja tas ieslēgts)"""
+        if self.result_cache is None:
+            return self.search_date_range_parallel(start_date, end_date)
+            
+        # Šodienas datums ietekmē deadline_status - ieraksti der tikai šodien
+        key = search_cache_key(self.search_criteria, start_date, end_date, {
+            'xml_dir': os.path.abspath(self.xml_dir),
+            'keyword_matcher': self.keyword_matcher,
+            'cpv_hierarchy': self.cpv_hierarchy,
+            'today': today_epoch_day(),
+        })
+        generation = self.result_cache.generation.current()
+        results = self.result_cache.get(key)
+        if results is None:
+            results = self.search_date_range_parallel(start_date, end_date)
+            self.result_cache.put(key, results, generation)
+        return results
+        
+    def search_ranked(self, start_date: str, end_date: str, limit: int = 50, cursor: Optional[str] = None) -> Dict:
+        """Meklē un atgriež vienu lapu labāko rezultātu
+        
+        Ar aktuālu pilna teksta un versiju indeksu lapa tiek atlasīta no indeksa
+        (_rank_from_index) un parsēti tikai iepirkumi, kas var tajā nonākt; citādi
+        tiek novērtēti visi rezultāti. Atgriež {'results': lapa, 'next_cursor':
+        nākamās lapas kursors vai None, 'total': rezultātu skaits vai None, ja lapa
+        atlasīta no indeksa}. Bojāts kursors vai limit < 1 - ValueError.
+        """
+        check_limit(limit)
+        after = decode_cursor(cursor) if cursor else None
+        top = self._rank_from_index(start_date, end_date, limit, after)
+        if top is not None:
+            page, next_cursor = rank_page(top, limit)
+            return {'results': page, 'next_cursor': next_cursor, 'total': None}
+            
+        results = self.search_cached(start_date, end_date)
+        page, next_cursor = rank_page(results, limit, cursor, score=self.rank_scorer(results))
+        return {'results': page, 'next_cursor': next_cursor, 'total': len(results)}
+        
+    def _rank_from_index(self, start_date, end_date, limit, after):
+        """limit + 1 labākie rezultāti pēc kursora vai None, ja indekss nav izmantojams
+        
+        Indeksa kandidāti (filter_with_index) tiek sagrupēti pa iepirkumiem
+        (notice_lineage) un novērtēti no indeksa celmu biežumiem. Iepirkuma
+        augšējā robeža ir tā labākā kandidāta vērtējums - kaudzē tiek parsēti tikai
+        iepirkumi, kuru robeža nav zemāka par jau atrastajiem lapas rezultātiem.
+        Iepirkuma rinda ir jaunākā atbilstošā versija (kā _remove_duplicates).
+        """
+        terms = query_stems(self.search_criteria.get('keywords', []))
+        if not terms or self.notice_index is None or self.lineage_index is None or not self.notice_index.exists():
+            return None
+        self.get_compiled_criteria()
+        if self._index_query is None:
+            return None
+            
+        self.today = today_epoch_day()
+        try:
+            files_by_date = self.collect_date_files(start_date, end_date)
+            # Arhīvu un neindeksētu dienu vērtējumam vajag visus rezultātus
+            for date_str, xml_files in files_by_date:
+                if isinstance(xml_files[0], PackMember) or not self.notice_index.is_current(
+                        xml_files[0].parent, len(xml_files)):
+                    return None
+            stats = self._index_rank_stats(terms)
+            if stats is None:
+                return None
+                
+            candidates = {}
+            for date_str, xml_files in self.filter_with_index(files_by_date, start_date, end_date):
+                for xml_file in xml_files:
+                    candidates[os.path.abspath(xml_file)] = (date_str, xml_file)
+            scores = self.notice_index.rank_scores(candidates, terms, stats)
+            order = self.lineage_index.lineage_order(candidates)
+            
+            # Iepirkuma versijas secībā (kā version_order); bez atslēgas - atsevišķa rinda
+            groups = {}
+            for path in candidates:
+                key = order[path][0] if path in order else None
+                groups.setdefault(key or path, []).append(path)
+            for paths in groups.values():
+                paths.sort(key=lambda path: (order.get(path, ('', '', 0))[1:], candidates[path][0], path))
+                
+            heap = [((-max(scores.get(path, 0.0) for path in paths), '', ''), n, key, None)
+                    for n, (key, paths) in enumerate(groups.items())]
+            heapq.heapify(heap)
+            top = []
+            parsed = 0
+            while heap and len(top) <= limit:
+                _, n, key, result = heapq.heappop(heap)
+                if result is not None:
+                    top.append(result)
+                    continue
+                parsed += len(groups[key])
+                result = self._ranked_procurement(key, groups[key], candidates, scores, order)
+                if result is not None and (after is None or rank_key(result) > after):
+                    heapq.heappush(heap, (rank_key(result), n, key, result))
+                    
+            versions = self.lineage_index.latest_versions({result['procurement_key'] for result in top})
+            for result in top:
+                self._add_version_info(result, versions)
+        except Exception as e:
+            logging.error(f"Kļūda kārtojot pēc indeksa: {e}")
+            return None
+        finally:
+            self.today = None
+            
+        logging.info(f"Kārtošana pēc indeksa: parsēti {parsed} no {len(candidates)} kandidātiem")
+        return top
+        
+    def _ranked_procurement(self, key, paths, candidates, scores, order):
+        """Iepirkuma jaunākā atbilstošā versija ar vērtējumu vai None, ja neviena neatbilst"""
+        matched = []
+        for path in paths:
+            date_str, xml_file = candidates[path]
+            matched.extend((path, result) for result in self.process_xml_batch([xml_file], date_str))
+        if not matched:
+            return None
+        path, result = matched[-1]
+        if path not in order:
+            # Paziņojums bez versiju indeksa atslēgas - atslēga no paša paziņojuma
+            key = chain_keys([result])[0]
+            if not key:
+                return None
+        result['score'] = scores.get(path, 0.0)
+        result['procurement_key'] = key
+        result['matched_versions'] = len(matched)
+        return result
+        
+    def procurement_history(self, key):
+        """Iepirkuma paziņojumu versijas (no versiju indeksa) hronoloģiskā secībā"""
+        if self.lineage_index is None or not self.lineage_index.exists():
+            return []
+        return [dict(version, xml_file=os.path.basename(version['path']))
+                for version in self.lineage_index.history(key)]
+
+def compact_notice(info):
+    """Rezultāts bez tukšajiem noklusējuma laukiem - mazāk datu starp procesiem"""
+    return {key: value for key, value in info.items()
+            if key not in NOTICE_DEFAULTS or value != NOTICE_DEFAULTS[key]}
+
+
+def expand_notice(compact):
+    """Atjauno pilnu info vārdnīcu no compact_notice rezultāta"""
+    info = new_notice_info()
+    info.update(compact)
+    return info
+
+
+# Procesa darbinieka meklētājs - izveidots vienreiz katrā procesā
+_worker_searcher = None
+
+
+def _init_search_worker(config, search_criteria, xml_dir, today=None):
+    """ProcessPoolExecutor initializer - sagatavo meklētāju ar kritērijiem"""
+    global _worker_searcher
+    _worker_searcher = OptimizedLocalSearcher(config=config, xml_dir=xml_dir)
+    _worker_searcher.search_criteria = search_criteria
+    _worker_searcher.today = today
+    _worker_searcher.get_compiled_criteria()
+
+
+def _search_worker_batch(folder, names, date_str):
+    """Apstrādā paketi procesā un atgriež kompaktus rezultātus"""
+    folder = Path(folder)
+    pack = None if folder.is_dir() else _worker_searcher.archive_pack(folder)
+    if pack is not None:
+        xml_files = [pack.member(name) for name in names]
+    else:
+        xml_files = [folder / name for name in names]
+    results = _worker_searcher.process_xml_batch(xml_files, date_str)
+    return [compact_notice(info) for info in results]
+
+
+# Iespējamie ID elementu tagi (apakšvirknes) un statusu varianti priekšskenēšanai
+XML_ID_TAGS = ['id', 'notice_id', 'ted_id', 'document_id', 'reference', 'identifier']
+
+STATUS_MAPPING = {
+    'IZSLUDINĀTS': ['IZSLUDINĀTS', 'PUBLISHED', 'ACTIVE'],
+    'PIEDĀVĀJUMI ATVĒRTI': ['PIEDĀVĀJUMI ATVĒRTI', 'OFFERS_OPENED'],
+    'LĪGUMS NOSLĒGTS': ['LĪGUMS NOSLĒGTS', 'CONTRACT_AWARDED', 'AWARDED'],
+    'IZBEIGTS-PĀRTRAUKTS': ['IZBEIGTS', 'PĀRTRAUKTS', 'CANCELLED', 'TERMINATED']
+}
+
+CPV_PATTERN = re.compile(r'^\d{8}(-\d)?$')
+
 
 # Integrācija ar esošo sistēmu
 class LokalaisMekletajs(OptimizedLocalSearcher):
@@ -899,15 +1678,13 @@ class LokalaisMekletajs(OptimizedLocalSearcher):
     def extract_xml_id(self, root):
         """Izvelk unikālo XML identifikatoru"""
         # Meklē dažādos iespējamos ID elementos
-        id_tags = ['id', 'notice_id', 'ted_id', 'document_id', 'reference', 'identifier']
-        
         for elem in root.iter():
             elem_tag = elem.tag.lower()
             # Izslēdz authority_id
             if elem_tag == 'authority_id':
                 continue
                 
-            for id_tag in id_tags:
+            for id_tag in XML_ID_TAGS:
                 if id_tag in elem_tag and elem.text and elem.text.strip():
                     return elem.text.strip()
                     
@@ -923,76 +1700,127 @@ class LokalaisMekletajs(OptimizedLocalSearcher):
             
         return None
         
+    def _match_status(self, text_upper):
+        """Statusa atslēga, kuras variants ir tekstā, vai None"""
+        for status_key, variations in STATUS_MAPPING.items():
+            if any(var in text_upper for var in variations):
+                return status_key
+        return None
+        
     def extract_status(self, root):
         """Izvelk iepirkuma statusu no XML"""
-        status_mapping = {
-            'IZSLUDINĀTS': ['IZSLUDINĀTS', 'PUBLISHED', 'ACTIVE'],
-            'PIEDĀVĀJUMI ATVĒRTI': ['PIEDĀVĀJUMI ATVĒRTI', 'OFFERS_OPENED'],
-            'LĪGUMS NOSLĒGTS': ['LĪGUMS NOSLĒGTS', 'CONTRACT_AWARDED', 'AWARDED'],
-            'IZBEIGTS-PĀRTRAUKTS': ['IZBEIGTS', 'PĀRTRAUKTS', 'CANCELLED', 'TERMINATED']
-        }
-        
         for elem in root.iter():
             if 'status' in elem.tag.lower() and elem.text:
-                text_upper = elem.text.strip().upper()
-                for status_key, variations in status_mapping.items():
-                    if any(var in text_upper for var in variations):
-                        return status_key
+                status = self._match_status(elem.text.strip().upper())
+                if status:
+                    return status
                         
         # Mēģina atrast citos elementos
         text_content = ' '.join([elem.text for elem in root.iter() if elem.text])
-        for status_key, variations in status_mapping.items():
-            if any(var in text_content.upper() for var in variations):
-                return status_key
-                
-        return 'IZSLUDINĀTS'  # Noklusējuma statuss
+        return self._match_status(text_content.upper()) or 'IZSLUDINĀTS'  # Noklusējuma statuss
     
+    def scan_root(self, root):
+        """Priekšskenēšana meklēšanai vienā koka gājienā - ID, statuss, viss teksts un CPV kodi
+        
+        Rezultāts sakrīt ar extract_xml_id, extract_status un atsevišķiem teksta
+        un CPV gājieniem, bet koks tiek apstaigāts tikai vienreiz.
+        """
+        xml_id = None
+        attr_id = None
+        status = None
+        raw_texts = []
+        text_parts = []
+        cpv_codes = []
+        
+        for elem in root.iter():
+            tag = elem.tag.lower() if isinstance(elem.tag, str) else ''
+            text = elem.text
+            stripped = text.strip() if text else ''
+            
+            if text:
+                raw_texts.append(text)
+            if stripped:
+                text_parts.append(stripped)
+                # Pārbauda vai ir CPV formātā (8 cipari ar vai bez defises)
+                if CPV_PATTERN.match(stripped):
+                    clean_cpv = stripped.split('-')[0]
+                    if clean_cpv not in cpv_codes:
+                        cpv_codes.append(clean_cpv)
+            if elem.tail and elem.tail.strip():
+                text_parts.append(elem.tail.strip())
+                
+            # ID un statuss - pirmais atbilstošais elements dokumenta secībā
+            if tag == 'authority_id':
+                continue
+            if xml_id is None and stripped and any(id_tag in tag for id_tag in XML_ID_TAGS):
+                xml_id = stripped
+            if attr_id is None and 'id' in elem.attrib:
+                attr_id = elem.attrib['id']
+            if status is None and text and 'status' in tag:
+                status = self._match_status(stripped.upper())
+                
+        if xml_id is None:
+            xml_id = attr_id
+        if xml_id is None and raw_texts:
+            # Ja nav ID, ģenerē no satura hash
+            xml_id = hashlib.md5(''.join(raw_texts).encode()).hexdigest()[:16]
+            
+        if status is None:
+            # Mēģina atrast citos elementos
+            status = self._match_status(' '.join(raw_texts).upper()) or 'IZSLUDINĀTS'
+            
+        return {
+            'xml_id': xml_id,
+            'status': status,
+            'text': ' '.join(text_parts),
+            'cpv_codes': cpv_codes
+        }
+        
     def search_xml(self, xml_path):
         """Meklē XML failā pēc kritērijiem (vecā metode saderībai)"""
         matches = []
         
         try:
-            # Izmanto atbilstošo parseri
-            if USE_LXML:
-                tree = lxml_ET.parse(xml_path)
-                root = tree.getroot()
-            else:
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
-            
+            # Faili, kuros neviens atslēgvārds vai CPV kods nevar būt, netiek parsēti
+            prefilter = self.get_prefilter()
+            if prefilter is not None and not prefilter.may_match(xml_path):
+                return matches
+                
+            # Priekšskenēšanas rezultāts no kešatmiņas vai no faila; koks paliek
+            # pilnai lauku izvilkšanai, lai failu nav jālasa vēlreiz
+            root = None
+            scan = self.parse_cache.get(xml_path, kind='scan') if self.parse_cache is not None else None
+            if scan is None:
+                root = self.parser.load_root(xml_path)
+                scan = self.scan_root(root)
+                if self.parse_cache is not None:
+                    self.parse_cache.put(xml_path, scan, kind='scan')
+                
             # Izvelk unikālo ID
-            xml_id = self.extract_xml_id(root)
+            xml_id = scan['xml_id']
             if xml_id and xml_id in self.processed_ids:
                 # Jau apstrādāts šis paziņojums
                 return matches
                 
             # Vispirms pārbauda iepirkuma statusu
-            status = self.extract_status(root)
+            status = scan['status']
             allowed_statuses = self.search_criteria.get('statuses', ['IZSLUDINĀTS'])
             
             if status and status not in allowed_statuses:
                 return matches  # Neatbilst statusa filtram
             
+            # Mazo burtu un normalizētā forma - vienreiz visām pārbaudēm un fragmentiem
+            text_content = NormalizedText(scan['text'])
+            criteria = self.get_compiled_criteria()
+            
             # Ja nav meklēšanas kritēriju, parāda visus
             show_all = self.search_criteria.get('show_all', False)
             
             if show_all:
                 # Parāda visus iepirkumus (tikai pārbauda izslēgtos vārdus)
-                excluded = False
-                for ex in self.search_criteria.get('exclude_keywords', []):
-                    text_parts = []
-                    for elem in root.iter():
-                        if elem.text and elem.text.strip():
-                            text_parts.append(elem.text.strip())
-                    text_content = ' '.join(text_parts)
-                    
-                    if self._text_contains_keyword(text_content, ex):
-                        excluded = True
-                        break
-                        
-                if not excluded:
-                    notice_info = self.parser.parse_xml_comprehensive(xml_path)
-                    if notice_info:
+                if not criteria.is_excluded(text_content):
+                    notice_info = self.parse_notice(xml_path, root)
+                    if notice_info and criteria.authorities.matches(notice_info.get('contracting_authority', '')):
                         notice_info['file'] = os.path.basename(xml_path)
                         notice_info['matched_keywords'] = []
                         notice_info['found_cpv_codes'] = []
@@ -1008,49 +1836,17 @@ class LokalaisMekletajs(OptimizedLocalSearcher):
                     
             else:
                 # Standarta meklēšana ar kritērijiem
-                text_parts = []
-                for elem in root.iter():
-                    if elem.text and elem.text.strip():
-                        text_parts.append(elem.text.strip())
-                    if elem.tail and elem.tail.strip():
-                        text_parts.append(elem.tail.strip())
-                        
-                text_content = ' '.join(text_parts)
-                
-                matched_keywords = []
-                for kw in self.search_criteria.get('keywords', []):
-                    if self._text_contains_keyword(text_content, kw):
-                        matched_keywords.append(kw)
-                        
+                matched_keywords = criteria.matched_keywords(text_content)
                 keyword_found = len(matched_keywords) > 0
+                excluded = criteria.is_excluded(text_content)
                 
-                excluded = False
-                for ex in self.search_criteria.get('exclude_keywords', []):
-                    if self._text_contains_keyword(text_content, ex):
-                        excluded = True
-                        break
-                
-                cpv_found = False
-                found_cpv_codes = []
-                
-                # Meklē CPV kodus XML
-                for elem in root.iter():
-                    if elem.text:
-                        # Pārbauda vai ir CPV formātā (8 cipari ar vai bez defises)
-                        if re.match(r'^\d{8}(-\d)?, elem.text.strip()):
-                            clean_cpv = elem.text.strip().split('-')[0]
-                            
-                            # Pārbauda pret meklēšanas kritērijiem
-                            for search_cpv in self.search_criteria.get('cpv_codes', []):
-                                clean_search_cpv = search_cpv.split('-')[0]
-                                if clean_cpv == clean_search_cpv:
-                                    cpv_found = True
-                                    if clean_cpv not in found_cpv_codes:
-                                        found_cpv_codes.append(clean_cpv)
+                # Salīdzina XML CPV kodus ar meklēšanas kritērijiem
+                found_cpv_codes = criteria.matching_notice_cpv_codes(scan['cpv_codes'])
+                cpv_found = len(found_cpv_codes) > 0
                                 
                 if (keyword_found or cpv_found) and not excluded:
-                    notice_info = self.parser.parse_xml_comprehensive(xml_path)
-                    if notice_info:
+                    notice_info = self.parse_notice(xml_path, root)
+                    if notice_info and criteria.authorities.matches(notice_info.get('contracting_authority', '')):
                         notice_info['file'] = os.path.basename(xml_path)
                         notice_info['matched_keywords'] = matched_keywords
                         notice_info['found_cpv_codes'] = found_cpv_codes
@@ -1072,7 +1868,9 @@ class LokalaisMekletajs(OptimizedLocalSearcher):
     def extract_context_snippets(self, text, keywords, context_length=100):
         """Izvelk konteksta fragmentus"""
         snippets = []
-        text_lower = text.lower()
+        doc = as_normalized(text)
+        text = doc.text
+        text_lower = doc.lower
         
         for kw in keywords[:3]:  # Tikai pirmie 3 atslēgvārdi
             kw_variations = self.create_word_variations(kw)
@@ -1100,8 +1898,8 @@ class LokalaisMekletajs(OptimizedLocalSearcher):
         return snippets
     
     def search_date_range(self, start_date: str, end_date: str) -> List[Dict]:
-        """Saderības metode"""
-        return self.search_date_range_parallel(start_date, end_date)
+        """Saderības metode (caur rezultātu kešu, ja tas ieslēgts)"""
+        return self.search_cached(start_date, end_date)
         
     def check_local_files_status(self):
         """Pārbauda lokālo failu statusu"""
@@ -1116,19 +1914,32 @@ class LokalaisMekletajs(OptimizedLocalSearcher):
         with open(metadata_file, 'r') as f:
             metadata = json.load(f)
             
-        # Skaita XML failus
+        # Skaita XML failus (no manifesta; mapes bez aktuāla ieraksta - pārlasot saturu)
         total_xml = 0
+        total_bytes = 0
+        total_notices = 0
         if self.xml_dir.exists():
             for date_dir in self.xml_dir.iterdir():
                 if date_dir.is_dir():
-                    xml_count = len(list(date_dir.glob('*.xml')))
-                    total_xml += xml_count
+                    entry = self.manifest.current_entry(date_dir) if self.manifest is not None else None
+                    if entry is not None:
+                        total_xml += entry['xml_count']
+                        total_bytes += entry['total_bytes']
+                        total_notices += entry['notice_count']
+                        continue
+                        
+                    xml_files = list(date_dir.glob('*.xml'))
+                    total_xml += len(xml_files)
+                    total_bytes += sum(xml_file.stat().st_size for xml_file in xml_files)
+                    total_notices += len(xml_files)
             
         return {
             'status': 'ok',
             'last_update': metadata.get('last_update'),
             'total_files': metadata.get('total_files', 0),
             'total_xml_files': total_xml,
+            'total_xml_bytes': total_bytes,
+            'total_notices': total_notices,
             'message': f"Pieejami {metadata.get('total_files', 0)} arhīvi ar {total_xml} XML failiem"
         }
 
@@ -1152,3 +1963,7 @@ class IepirkumuMekletajs:
         logging.info(f"Pēdējā atjaunošana: {status['last_update']}")
         
         return self.local_searcher.search_date_range(start_date, end_date)
+        
+    def search_ranked(self, start_date, end_date, limit=50, cursor=None):
+        """Viena lapa labāko rezultātu (sk. LokalaisMekletajs.search_ranked)"""
+        return self.local_searcher.search_ranked(start_date, end_date, limit, cursor)
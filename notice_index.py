@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Paziņojumu pilna teksta indekss (SQLite FTS5) pār EIS-XML-Files mapēm
+Tiek papildināts pēc katras atarhivēšanas un tīrīts kopā ar vecajām mapēm
+Meklēšanā indekss dod kandidātu failus - pilnā pārbaude notiek tikai tiem
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from text_normalizer import normalize_latvian_text
+from prefilter import CASE_FOLD_EXTRA
+from latvian_stemmer import stems
+from cpv_index import CpvIndex, clean_cpv
+from contract_value import FILTER_CURRENCIES, ValueIndex
+from deadline_index import DeadlineIndex
+from notice_lineage import fallback_key, procurement_key, version_order
+from relevance import RANK_FIELDS, CorpusStats, bm25_counts, field_counts, field_stems
+
+# Indeksa datnes nosaukums XML failu (EIS-XML-Files) mapē
+INDEX_FILE_NAME = 'notice_index.db'
+
+# Indeksa shēmas versija - mainoties, indekss tiek veidots no jauna
+INDEX_VERSION = 9
+
+# Vārdu daļas, ko indekss droši atrod (pēc normalizācijas)
+SAFE_TERM = re.compile(r'^[a-z0-9]+$')
+
+NON_WORD = re.compile(r'\W+')
+
+CPV_PATTERN = re.compile(r'^\d{8}(-\d)?$')
+
+
+def fts_text(text):
+    """Teksts indeksam - normalizēts, vārdu robežas kā re \\b"""
+    return NON_WORD.sub(' ', normalize_latvian_text(text).translate(CASE_FOLD_EXTRA)).strip()
+
+
+def folder_date(folder):
+    """Datums (GGGG-MM-DD) no DD_MM_GGGG mapes nosaukuma vai '' """
+    try:
+        return datetime.strptime(Path(folder).name, '%d_%m_%Y').strftime('%Y-%m-%d')
+    except ValueError:
+        return ''
+
+
+def minimal_prefixes(terms):
+    """Atstāj tikai tos prefiksus, kas nesākas ar citu kopas prefiksu"""
+    kept = []
+    for term in sorted(set(terms), key=len):
+        if not any(term.startswith(shorter) for shorter in kept):
+            kept.append(term)
+    return kept
+
+
+def build_fts_query(search_criteria, create_word_variations, normalize_text, matcher='variants'):
+    """FTS5 vaicājums, kas atrod visus paziņojumus, kuros pilnā pārbaude varētu atrast atslēgvārdus
+
+    Atgriež None, ja kritērijus ar indeksu nevar droši izteikt (rādīt visu,
+    neparasti atslēgvārdi) - tad jāpārbauda visi faili. Tukša virkne nozīmē,
+    ka atslēgvārdu nav (CPV kodi tiek meklēti CPV indeksā).
+    """
+    if search_criteria.get('show_all', False):
+        return None
+
+    clauses = []
+    for keyword in search_criteria.get('keywords', []):
+        if matcher == 'stem':
+            words = [{word_stem} for word_stem in stems(keyword, normalize_text)]
+        else:
+            words = [{normalize_text(v).translate(CASE_FOLD_EXTRA) for v in create_word_variations(word)}
+                     for word in (keyword.split() if ' ' in keyword else [keyword])]
+
+        if not words or not all(SAFE_TERM.match(term) for terms in words for term in terms):
+            return None
+
+        # Katram vārdam - jebkura variācija kā vārda sākums; frāzei - visi vārdi
+        word_clauses = ['(' + ' OR '.join(f'"{term}"*' for term in minimal_prefixes(terms)) + ')'
+                        for terms in words]
+        clauses.append('(' + ' AND '.join(word_clauses) + ')')
+
+    return ' OR '.join(clauses)
+
+
+class NoticeIndex:
+    """SQLite FTS5 indekss - nosaukums, apraksts, pasūtītājs, viss teksts un CPV kodi
+
+    CPV kodi (main_cpv, papildu kodi un daļu kodi) tiek glabāti arī tabulā
+    notice_cpv, sakārtotā pēc koda, un meklēšanai ielādēti CpvIndex masīvos.
+    Salīdzināmās līgumu summas (centos) ir tabulā notice_value un ValueIndex,
+    termiņi (dienas kopš 1970-01-01) - tabulā notice_deadline un DeadlineIndex.
+    notice_lineage katram paziņojumam glabā tā iepirkuma atslēgu (notice_lineage.py),
+    notice_terms (celmu biežums katrā laukā) un notice_lengths - BM25 statistiku un
+    vērtējumus celmotiem laukiem bez parsēšanas (relevance.py).
+
+    parser - ImprovedXMLParser (vajadzīgs tikai indeksēšanai).
+    """
+
+    def __init__(self, db_path, parser=None):
+        self.db_path = Path(db_path)
+        self.parser = parser
+        self._local = threading.local()
+
+    def _connect(self):
+        """SQLite savienojums katram pavedienam atsevišķi (datne tiek izveidota pirmajā reizē)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                conn.executescript("""
+                    DROP TABLE IF EXISTS notices;
+                    DROP TABLE IF EXISTS folders;
+                    DROP TABLE IF EXISTS notice_cpv;
+                    DROP TABLE IF EXISTS notice_value;
+                    DROP TABLE IF EXISTS notice_deadline;
+                    DROP TABLE IF EXISTS notice_lineage;
+                    DROP TABLE IF EXISTS notice_terms;
+                    DROP TABLE IF EXISTS notice_lengths;
+                    DROP TABLE IF EXISTS notice_fts;
+                """)
+                conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS notices (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    folder TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS notices_folder ON notices (folder);
+                CREATE INDEX IF NOT EXISTS notices_date ON notices (date);
+                CREATE TABLE IF NOT EXISTS folders (
+                    folder TEXT PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    xml_count INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS notice_cpv (
+                    code TEXT NOT NULL,
+                    notice_id INTEGER NOT NULL,
+                    PRIMARY KEY (code, notice_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS notice_cpv_notice ON notice_cpv (notice_id);
+                CREATE TABLE IF NOT EXISTS notice_value (
+                    value_cents INTEGER NOT NULL,
+                    notice_id INTEGER NOT NULL,
+                    PRIMARY KEY (value_cents, notice_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS notice_value_notice ON notice_value (notice_id);
+                CREATE TABLE IF NOT EXISTS notice_deadline (
+                    deadline_day INTEGER NOT NULL,
+                    notice_id INTEGER NOT NULL,
+                    PRIMARY KEY (deadline_day, notice_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS notice_deadline_notice ON notice_deadline (notice_id);
+                CREATE TABLE IF NOT EXISTS notice_lineage (
+                    notice_id INTEGER PRIMARY KEY,
+                    procurement_key TEXT NOT NULL,
+                    notice_number TEXT NOT NULL,
+                    source_notice TEXT NOT NULL,
+                    published TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    notice_type TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS notice_lineage_key ON notice_lineage (procurement_key);
+                CREATE INDEX IF NOT EXISTS notice_lineage_number ON notice_lineage (notice_number);
+                CREATE TABLE IF NOT EXISTS notice_terms (
+                    term TEXT NOT NULL,
+                    notice_id INTEGER NOT NULL,
+                    title INTEGER NOT NULL,
+                    description INTEGER NOT NULL,
+                    contracting_authority INTEGER NOT NULL,
+                    PRIMARY KEY (term, notice_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS notice_terms_notice ON notice_terms (notice_id);
+                CREATE TABLE IF NOT EXISTS notice_lengths (
+                    notice_id INTEGER PRIMARY KEY,
+                    title INTEGER NOT NULL,
+                    description INTEGER NOT NULL,
+                    contracting_authority INTEGER NOT NULL
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS notice_fts USING fts5(
+                    title, description, authority, body, cpv,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                );
+            """)
+            self._local.conn = conn
+        return conn
+
+    def exists(self):
+        """Vai indeksa datne jau ir izveidota"""
+        return self.db_path.exists()
+
+    def _notice_row(self, xml_path):
+        """FTS lauki, CPV kodi un parsētā info vārdnīca vienam XML failam"""
+        root = self.parser.load_root(str(xml_path))
+        info = self.parser.parse_root(root)
+
+        text_parts = []
+        cpv_codes = [clean_cpv(code) for code in info.get('cpv_codes', [])]
+        for elem in root.iter():
+            text = elem.text.strip() if elem.text else ''
+            if text:
+                text_parts.append(text)
+                if CPV_PATTERN.match(text):
+                    cpv_codes.append(text.split('-')[0])
+            if elem.tail and elem.tail.strip():
+                text_parts.append(elem.tail.strip())
+
+        cpv_codes = list(dict.fromkeys(cpv_codes))
+        return (fts_text(info.get('title', '')), fts_text(info.get('description', '')),
+                fts_text(info.get('contracting_authority', '')), fts_text(' '.join(text_parts)),
+                ' '.join(cpv_codes)), cpv_codes, info
+
+    def index_folder(self, folder):
+        """Indeksē jaunos un mainītos mapes XML failus, izņem dzēstos"""
+        folder = Path(folder)
+        folder_key = os.path.abspath(folder)
+        date = folder_date(folder)
+        conn = self._connect()
+
+        known = {path: (notice_id, size, mtime_ns) for notice_id, path, size, mtime_ns in conn.execute(
+            "SELECT id, path, size, mtime_ns FROM notices WHERE folder = ?", (folder_key,))}
+
+        xml_files = sorted(folder.glob('*.xml'))
+        added = 0
+        with conn:
+            for xml_path in xml_files:
+                path = os.path.abspath(xml_path)
+                stat = xml_path.stat()
+                old = known.pop(path, None)
+                if old is not None and old[1:] == (stat.st_size, stat.st_mtime_ns):
+                    continue
+
+                try:
+                    row, cpv_codes, info = self._notice_row(xml_path)
+                except Exception as e:
+                    logging.error(f"Kļūda indeksējot {xml_path}: {e}")
+                    row, cpv_codes, info = ('', '', '', '', ''), [], {}
+
+                if old is not None:
+                    self._delete_notice(conn, old[0])
+                cursor = conn.execute(
+                    "INSERT INTO notices (path, folder, date, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                    (path, folder_key, date, stat.st_size, stat.st_mtime_ns))
+                conn.execute(
+                    "INSERT INTO notice_fts (rowid, title, description, authority, body, cpv) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", (cursor.lastrowid,) + row)
+                conn.executemany("INSERT INTO notice_cpv (code, notice_id) VALUES (?, ?)",
+                                 [(code, cursor.lastrowid) for code in cpv_codes])
+                value_cents = info.get('value_cents')
+                if value_cents is not None and info.get('currency_code', '') in FILTER_CURRENCIES:
+                    conn.execute("INSERT INTO notice_value (value_cents, notice_id) VALUES (?, ?)",
+                                 (value_cents, cursor.lastrowid))
+                if info.get('deadline_day') is not None:
+                    conn.execute("INSERT INTO notice_deadline (deadline_day, notice_id) VALUES (?, ?)",
+                                 (info['deadline_day'], cursor.lastrowid))
+                self._add_lineage(conn, cursor.lastrowid, info, date)
+                self._add_rank_stats(conn, cursor.lastrowid, info)
+                added += 1
+
+            # Faili, kuru mapē vairs nav
+            for notice_id, _, _ in known.values():
+                self._delete_notice(conn, notice_id)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO folders (folder, date, xml_count, mtime_ns) VALUES (?, ?, ?, ?)",
+                (folder_key, date, len(xml_files), folder.stat().st_mtime_ns))
+
+        if added or known:
+            logging.info(f"Indeksā {folder.name}: pievienoti {added}, dzēsti {len(known)} paziņojumi")
+        return added
+
+    def _add_lineage(self, conn, notice_id, info, date):
+        """Ieraksta paziņojuma iepirkuma atslēgu (bez koda - pēc source_notice ķēdes)"""
+        source_notice = info.get('source_notice', '')
+        key = procurement_key(info)
+        if key and source_notice:
+            # Agrāk ieraksti ķēdes paziņojumi bez koda (visa ķēde, ne tikai tiešais
+            # priekštecis) tiek piesaistīti iepirkumam
+            row = conn.execute("SELECT procurement_key FROM notice_lineage WHERE notice_number = ? LIMIT 1",
+                               (source_notice,)).fetchone()
+            old_keys = {f"notice:{source_notice}"}
+            if row and row[0].startswith('notice:'):
+                old_keys.add(row[0])
+            conn.executemany("UPDATE notice_lineage SET procurement_key = ? WHERE procurement_key = ?",
+                             [(key, old_key) for old_key in old_keys])
+        if not key and source_notice:
+            row = conn.execute("SELECT procurement_key FROM notice_lineage WHERE notice_number = ? LIMIT 1",
+                               (source_notice,)).fetchone()
+            key = row[0] if row else ''
+        notice_number = info.get('notice_number', '')
+        if not key and notice_number:
+            # Vēlāks paziņojums ar kodu indeksēts pirms šī (mapes ne hronoloģiskā secībā)
+            row = conn.execute("SELECT procurement_key FROM notice_lineage WHERE source_notice = ? "
+                               "AND procurement_key NOT LIKE 'notice:%' LIMIT 1", (notice_number,)).fetchone()
+            key = row[0] if row else ''
+        key = key or fallback_key(info)
+        if not key:
+            return
+        if notice_number and key != f"notice:{notice_number}":
+            # Agrāk indeksēti pēcteči, kas gaidīja šo paziņojumu
+            conn.execute("UPDATE notice_lineage SET procurement_key = ? WHERE procurement_key = ?",
+                         (key, f"notice:{notice_number}"))
+        published, seq = version_order(info, date)
+        conn.execute(
+            "INSERT INTO notice_lineage (notice_id, procurement_key, notice_number, source_notice, published, "
+            "seq, notice_type) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (notice_id, key, info.get('notice_number', ''), source_notice, published, seq,
+             info.get('notice_type', '')))
+
+    def _add_rank_stats(self, conn, notice_id, info):
+        """Ieraksta BM25 statistiku - lauku garumus un celmu biežumu katrā laukā"""
+        if not info:
+            return
+        term_counts, lengths = field_counts(field_stems(info))
+        conn.execute("INSERT INTO notice_lengths (notice_id, title, description, contracting_authority) "
+                     "VALUES (?, ?, ?, ?)", (notice_id,) + tuple(lengths[field] for field in RANK_FIELDS))
+        conn.executemany(
+            "INSERT INTO notice_terms (term, notice_id, title, description, contracting_authority) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(term, notice_id) + tuple(counts.get(field, 0) for field in RANK_FIELDS)
+             for term, counts in term_counts.items()])
+
+    def _delete_notice(self, conn, notice_id):
+        """Izņem vienu paziņojumu no visām tabulām"""
+        conn.execute("DELETE FROM notice_fts WHERE rowid = ?", (notice_id,))
+        conn.execute("DELETE FROM notice_cpv WHERE notice_id = ?", (notice_id,))
+        conn.execute("DELETE FROM notice_value WHERE notice_id = ?", (notice_id,))
+        conn.execute("DELETE FROM notice_deadline WHERE notice_id = ?", (notice_id,))
+        conn.execute("DELETE FROM notice_lineage WHERE notice_id = ?", (notice_id,))
+        conn.execute("DELETE FROM notice_terms WHERE notice_id = ?", (notice_id,))
+        conn.execute("DELETE FROM notice_lengths WHERE notice_id = ?", (notice_id,))
+        conn.execute("DELETE FROM notices WHERE id = ?", (notice_id,))
+
+    def prune_folder(self, folder):
+        """Izņem mapes paziņojumus no indeksa (izsauc, kad mape tiek dzēsta)"""
+        folder_key = os.path.abspath(folder)
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM notice_fts WHERE rowid IN (SELECT id FROM notices WHERE folder = ?)",
+                         (folder_key,))
+            conn.execute("DELETE FROM notice_cpv WHERE notice_id IN (SELECT id FROM notices WHERE folder = ?)",
+                         (folder_key,))
+            conn.execute("DELETE FROM notice_value WHERE notice_id IN (SELECT id FROM notices WHERE folder = ?)",
+                         (folder_key,))
+            conn.execute("DELETE FROM notice_deadline WHERE notice_id IN (SELECT id FROM notices WHERE folder = ?)",
+                         (folder_key,))
+            for table in ('notice_lineage', 'notice_terms', 'notice_lengths'):
+                conn.execute(f"DELETE FROM {table} WHERE notice_id IN (SELECT id FROM notices WHERE folder = ?)",
+                             (folder_key,))
+            cursor = conn.execute("DELETE FROM notices WHERE folder = ?", (folder_key,))
+            conn.execute("DELETE FROM folders WHERE folder = ?", (folder_key,))
+        if cursor.rowcount:
+            logging.info(f"Indeksā dzēsti {cursor.rowcount} paziņojumi no {folder}")
+        return cursor.rowcount
+
+    def is_current(self, folder, xml_count):
+        """Vai mapes indekss atbilst pašreizējam failu skaitam un mapes mtime"""
+        folder = Path(folder)
+        row = self._connect().execute(
+            "SELECT xml_count, mtime_ns FROM folders WHERE folder = ?", (os.path.abspath(folder),)).fetchone()
+        return row is not None and row == (xml_count, folder.stat().st_mtime_ns)
+
+    def _cached(self, name, build):
+        """Pavediena kešs ielādētajam indeksam (tiek ielādēts no jauna, ja datne mainīta)"""
+        conn = self._connect()
+        version = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        cached = getattr(self._local, name, None)
+        if cached is None or cached[0] != version:
+            cached = (version, build(conn))
+            setattr(self._local, name, cached)
+        return cached[1]
+
+    def cpv_index(self):
+        """CPV indekss sakārtotos masīvos"""
+        return self._cached('cpv_index', lambda conn: CpvIndex(
+            conn.execute("SELECT code, notice_id FROM notice_cpv")))
+
+    def value_index(self):
+        """Līgumu summu indekss sakārtotos masīvos"""
+        return self._cached('value_index', lambda conn: ValueIndex(
+            conn.execute("SELECT value_cents, notice_id FROM notice_value")))
+
+    def deadline_index(self):
+        """Termiņu indekss sakārtotos masīvos"""
+        return self._cached('deadline_index', lambda conn: DeadlineIndex(
+            conn.execute("SELECT deadline_day, notice_id FROM notice_deadline")))
+
+    def _date_filter(self, start_date, end_date):
+        """SQL nosacījums un parametri datumu diapazonam"""
+        date_sql = ''
+        date_params = []
+        if start_date:
+            date_sql += " AND n.date >= ?"
+            date_params.append(start_date)
+        if end_date:
+            date_sql += " AND n.date <= ?"
+            date_params.append(end_date)
+        return date_sql, date_params
+
+    def _paths(self, conn, notice_ids, date_sql, date_params):
+        """Paziņojumu ID ceļi datumu diapazonā"""
+        paths = set()
+        notice_ids = sorted(notice_ids)
+        # SQLite parametru skaits ir ierobežots - ID tiek nodoti daļās
+        for i in range(0, len(notice_ids), 500):
+            chunk = notice_ids[i:i + 500]
+            sql = (f"SELECT n.path FROM notices n WHERE n.id IN ({','.join('?' * len(chunk))})" + date_sql)
+            paths.update(path for (path,) in conn.execute(sql, chunk + date_params))
+        return paths
+
+    def candidates(self, query, start_date=None, end_date=None, cpv_codes=(), cpv_hierarchy=False):
+        """Kandidātu failu ceļi (absolūti) datumu diapazonā
+
+        query - FTS vaicājums atslēgvārdiem (build_fts_query), cpv_codes -
+        meklētie CPV kodi (hierarhijā ar visiem apakšlīmeņiem).
+        """
+        date_sql, date_params = self._date_filter(start_date, end_date)
+        conn = self._connect()
+        paths = set()
+        if query:
+            sql = ("SELECT n.path FROM notice_fts JOIN notices n ON n.id = notice_fts.rowid "
+                   "WHERE notice_fts MATCH ?" + date_sql)
+            paths.update(path for (path,) in conn.execute(sql, [query] + date_params))
+
+        if cpv_codes:
+            cpv_index = self.cpv_index()
+            notice_ids = set()
+            for code in cpv_codes:
+                notice_ids |= cpv_index.lookup(code, cpv_hierarchy)
+            paths |= self._paths(conn, notice_ids, date_sql, date_params)
+        return paths
+
+    def value_excluded(self, min_cents=None, max_cents=None, start_date=None, end_date=None):
+        """Failu ceļi, kuru summa ir ārpus min/max robežām (divi bisect summu indeksā)"""
+        date_sql, date_params = self._date_filter(start_date, end_date)
+        outside = self.value_index().outside(min_cents, max_cents)
+        return self._paths(self._connect(), outside, date_sql, date_params)
+
+    def expired_paths(self, today, start_date=None, end_date=None):
+        """Failu ceļi, kuru termiņš ir pirms today (dienas numurs) - viens bisect"""
+        date_sql, date_params = self._date_filter(start_date, end_date)
+        expired = self.deadline_index().expired(today)
+        return self._paths(self._connect(), expired, date_sql, date_params)
+
+    def _chunked(self, conn, sql, values):
+        """Vaicājums ar IN (...) sarakstu daļās (SQLite parametru skaits ir ierobežots)"""
+        values = list(values)
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            yield from conn.execute(sql.format(','.join('?' * len(chunk))), chunk)
+
+    def lineage_keys(self, paths):
+        """{ceļš: iepirkuma atslēga} indeksētajiem failiem"""
+        return dict(self._chunked(
+            self._connect(),
+            "SELECT n.path, l.procurement_key FROM notices n JOIN notice_lineage l ON l.notice_id = n.id "
+            "WHERE n.path IN ({})", {os.path.abspath(path) for path in paths}))
+
+    def lineage_order(self, paths):
+        """{ceļš: (iepirkuma atslēga, publicēšanas datums, secība)} - versiju secība bez parsēšanas"""
+        return {path: (key, published, seq) for path, key, published, seq in self._chunked(
+            self._connect(),
+            "SELECT n.path, l.procurement_key, l.published, l.seq FROM notices n "
+            "JOIN notice_lineage l ON l.notice_id = n.id WHERE n.path IN ({})",
+            {os.path.abspath(path) for path in paths})}
+
+    def _versions(self, conn, keys):
+        """Visu doto iepirkumu versijas {atslēga: [versija, ...]} hronoloģiskā secībā"""
+        versions = {}
+        for key, path, date, notice_number, source_notice, published, seq, notice_type in self._chunked(
+                conn,
+                "SELECT l.procurement_key, n.path, n.date, l.notice_number, l.source_notice, l.published, "
+                "l.seq, l.notice_type FROM notice_lineage l JOIN notices n ON n.id = l.notice_id "
+                "WHERE l.procurement_key IN ({})", set(keys)):
+            versions.setdefault(key, []).append({
+                'path': path, 'date': date, 'notice_number': notice_number, 'source_notice': source_notice,
+                'publication_date': published, 'seq': seq, 'notice_type': notice_type,
+            })
+        for items in versions.values():
+            items.sort(key=lambda item: (item['publication_date'], item['seq'], item['path']))
+        return versions
+
+    def latest_versions(self, keys):
+        """{atslēga: (versiju skaits, jaunākā versija)}"""
+        return {key: (len(items), items[-1]) for key, items in self._versions(self._connect(), keys).items()}
+
+    def history(self, key):
+        """Iepirkuma paziņojumu versijas hronoloģiskā secībā"""
+        return self._versions(self._connect(), [key]).get(key, [])
+
+    def rank_stats(self, terms):
+        """BM25 korpusa statistika (CorpusStats) dotajiem celmiem"""
+        conn = self._connect()
+        row = conn.execute("SELECT COUNT(*), AVG(title), AVG(description), AVG(contracting_authority) "
+                           "FROM notice_lengths").fetchone()
+        if not row[0]:
+            return None
+        doc_freq = dict(self._chunked(
+            conn, "SELECT term, COUNT(*) FROM notice_terms WHERE term IN ({}) GROUP BY term", set(terms)))
+        return CorpusStats(row[0], dict(zip(RANK_FIELDS, row[1:])), doc_freq)
+
+    def rank_scores(self, paths, terms, stats):
+        """BM25F vērtējumi {ceļš: vērtējums} no indeksa celmu biežumiem (bez parsēšanas)"""
+        conn = self._connect()
+        ids = dict(self._chunked(conn, "SELECT id, path FROM notices WHERE path IN ({})",
+                                 {os.path.abspath(path) for path in paths}))
+        lengths = {notice_id: dict(zip(RANK_FIELDS, row)) for notice_id, *row in self._chunked(
+            conn, "SELECT notice_id, title, description, contracting_authority FROM notice_lengths "
+                  "WHERE notice_id IN ({})", ids)}
+        term_counts = {}
+        for term in terms:
+            for notice_id, *row in conn.execute(
+                    "SELECT notice_id, title, description, contracting_authority FROM notice_terms "
+                    "WHERE term = ?", (term,)):
+                if notice_id in lengths:
+                    term_counts.setdefault(notice_id, {})[term] = dict(zip(RANK_FIELDS, row))
+        return {path: bm25_counts(term_counts.get(notice_id, {}), lengths[notice_id], terms, stats)
+                if notice_id in lengths else 0.0
+                for notice_id, path in ids.items()}
+
+    def close(self):
+        """Aizver šī pavediena savienojumu"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
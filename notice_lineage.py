@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Paziņojumu versiju ķēdes - viens iepirkums daudzās dienu mapēs
+
+Viens iepirkums parādās kā izsludināšanas, grozījumu un rezultātu
+paziņojumi dažādās dienās. Tos saista procurement_code / procurement_id un
+source_notice (iepriekšējā paziņojuma numurs). Iepirkuma atslēga tiek
+noteikta indeksēšanas laikā un glabāta pilna teksta indeksā (notice_lineage),
+tāpēc meklēšanā ķēdes nav jāparsē no jauna.
+"""
+
+
+def procurement_key(info):
+    """Iepirkuma atslēga no paša paziņojuma (iepirkuma kods) vai '' """
+    for field in ('procurement_id', 'id'):
+        value = (info.get(field) or '').strip()
+        if value:
+            return value
+    return ''
+
+
+def fallback_key(info):
+    """Atslēga paziņojumam bez iepirkuma koda - pēc tiešā iepriekšējā paziņojuma
+
+    Garākas ķēdes apvieno versiju indekss vai chain_keys (meklēšanas rezultātos).
+    """
+    notice_number = info.get('source_notice') or info.get('notice_number')
+    if notice_number:
+        return f"notice:{notice_number}"
+    if info.get('title'):
+        return f"title:{info['title']}"
+    return ''
+
+
+def chain_keys(infos):
+    """Iepirkuma atslēgas paziņojumu sarakstam, apvienojot source_notice ķēdes
+
+    Ķēdes sākums ir pirmais paziņojums, kura priekšteča sarakstā nav; visai
+    ķēdei tiek izmantots iepirkuma kods, ja tas ir kādam no tās paziņojumiem
+    (tāpat kā versiju indeksā), citādi 'notice:<sākuma numurs>'.
+    """
+    sources = {}
+    for info in infos:
+        number = info.get('notice_number') or ''
+        if number:
+            sources[number] = info.get('source_notice') or ''
+
+    def root(info):
+        number = info.get('notice_number') or ''
+        source = info.get('source_notice') or ''
+        seen = {number}
+        while source in sources and source not in seen:
+            seen.add(source)
+            number, source = source, sources[source]
+        return source or number
+
+    roots = [root(info) for info in infos]
+    codes = {}
+    for info, chain in zip(infos, roots):
+        code = procurement_key(info)
+        if chain and code:
+            codes.setdefault(chain, code)
+
+    keys = []
+    for info, chain in zip(infos, roots):
+        key = procurement_key(info) or codes.get(chain)
+        if not key:
+            key = f"notice:{chain}" if chain else fallback_key(info)
+        keys.append(key)
+    return keys
+
+
+def version_order(info, date_str=''):
+    """Kārtošanas atslēga versijām - publicēšanas datums, tad paziņojuma numurs"""
+    notice_number = info.get('notice_number') or ''
+    return (info.get('publication_date') or date_str,
+            int(notice_number) if notice_number.isdigit() else 0)
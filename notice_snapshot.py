@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Kolonnu momentuzņēmumi (snapshot) katrai EIS-XML-Files dienas mapei
+
+Datumi un summas glabājas kā skaitļu masīvi, kategoriju lauki - kā kodi
+vārdnīcā, teksti - kā nobīdes vienā UTF-8 blokā. Meklēšanas filtri tiek
+aprēķināti kā maskas visām dienām kopā (ar NumPy, ja pieejams). Atslēgvārdi,
+izslēgtie vārdi un CPV kodi tiek pārbaudīti pēc teksta kolonnām (search_text,
+cpv), tāpēc paziņojuma vārdnīca (JSON) tiek atjaunota tikai atbilstošajām rindām.
+"""
+
+import json
+import logging
+import math
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from contract_value import FILTER_CURRENCIES, value_limit_cents
+from deadline_index import today_epoch_day
+
+# Mēģina importēt NumPy, ja nav - maskas tiek aprēķinātas ar Python sarakstiem
+try:
+    import numpy as np
+    USE_NUMPY = True
+except ImportError:
+    USE_NUMPY = False
+
+# Momentuzņēmumu mape XML failu (EIS-XML-Files) mapē - ārpus dienu mapēm,
+# lai to rakstīšana nemainītu dienu mapju mtime
+SNAPSHOT_DIR_NAME = 'snapshots'
+
+SNAPSHOT_MAGIC = b'EISSNAP1'
+SNAPSHOT_VERSION = 5
+
+NUMERIC_COLUMNS = ('deadline_day', 'value_cents')
+CATEGORY_COLUMNS = ('status', 'procedure_type', 'procedure_category', 'notice_type', 'contracting_authority',
+                    'currency_code')
+TEXT_COLUMNS = ('file', 'search_text', 'cpv', 'notice')
+
+
+def snapshot_path(xml_dir, folder):
+    """Dienas mapes momentuzņēmuma ceļš"""
+    return Path(xml_dir) / SNAPSHOT_DIR_NAME / f"{Path(folder).name}.snapshot"
+
+
+def write_snapshot(xml_dir, folder, parse, parser_version=''):
+    """Izveido dienas mapes momentuzņēmumu
+
+    parse(xml_path) atgriež paziņojuma vārdnīcu (tāpat kā meklētājā),
+    parser_version - parsētāja versija (mainoties, momentuzņēmums nav derīgs).
+    Atgriež momentuzņēmumā ierakstīto paziņojumu skaitu.
+    """
+    folder = Path(folder)
+    xml_files = sorted(folder.glob('*.xml'))
+    folder_mtime_ns = folder.stat().st_mtime_ns
+
+    numeric = {name: array('d') for name in NUMERIC_COLUMNS}
+    categories = {name: ({}, array('i')) for name in CATEGORY_COLUMNS}
+    texts = {name: [] for name in TEXT_COLUMNS}
+
+    for xml_path in xml_files:
+        try:
+            info = parse(str(xml_path))
+        except Exception as e:
+            logging.error(f"Kļūda veidojot momentuzņēmumu {xml_path}: {e}")
+            info = None
+        if not info:
+            continue
+
+        # Centi float64 masīvā ir precīzi līdz 2^53
+        values = {
+            'deadline_day': info.get('deadline_day'),
+            'value_cents': info.get('value_cents'),
+        }
+        for name in NUMERIC_COLUMNS:
+            numeric[name].append(math.nan if values[name] is None else values[name])
+
+        for name in CATEGORY_COLUMNS:
+            value = info.get(name, 'IZSLUDINĀTS') if name == 'status' else info.get(name)
+            dictionary, codes = categories[name]
+            codes.append(dictionary.setdefault('' if value is None else str(value), len(dictionary)))
+
+        texts['file'].append(xml_path.name)
+        # Atslēgvārdu teksts un attīrīti CPV kodi - kā _matches_criteria
+        texts['search_text'].append(' '.join([info.get('title', ''), info.get('description', ''),
+                                              info.get('contracting_authority', '')]))
+        texts['cpv'].append(' '.join(dict.fromkeys(code.split('-')[0] for code in info.get('cpv_codes', []))))
+        texts['notice'].append(json.dumps(info, ensure_ascii=False))
+
+    columns = {}
+    chunks = []
+    offset = 0
+
+    def add_chunk(data):
+        nonlocal offset
+        chunks.append(data)
+        start = offset
+        offset += len(data)
+        return [start, len(data)]
+
+    for name, values in numeric.items():
+        columns[name] = {'kind': 'float64', 'data': add_chunk(values.tobytes())}
+    for name, (dictionary, codes) in categories.items():
+        columns[name] = {'kind': 'category', 'data': add_chunk(codes.tobytes()),
+                         'dictionary': list(dictionary)}
+    for name, values in texts.items():
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = array('q', [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        columns[name] = {'kind': 'text', 'offsets': add_chunk(offsets.tobytes()),
+                         'data': add_chunk(b''.join(encoded))}
+
+    header = json.dumps({
+        'version': SNAPSHOT_VERSION,
+        'parser_version': parser_version,
+        'byteorder': sys.byteorder,
+        'rows': len(texts['file']),
+        'xml_count': len(xml_files),
+        'folder_mtime_ns': folder_mtime_ns,
+        'columns': columns,
+    }, ensure_ascii=False).encode('utf-8')
+
+    path = snapshot_path(xml_dir, folder)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+    logging.info(f"Momentuzņēmums {folder.name}: {len(texts['file'])} paziņojumi")
+    return len(texts['file'])
+
+
+def remove_snapshot(xml_dir, folder):
+    """Dzēš mapes momentuzņēmumu (izsauc, kad mape tiek dzēsta)"""
+    path = snapshot_path(xml_dir, folder)
+    if path.exists():
+        path.unlink()
+        return True
+    return False
+
+
+class NoticeSnapshot:
+    """Vienas dienas momentuzņēmums - kolonnas tiek nolasītas no faila bez parsēšanas"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        if raw[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"Nav momentuzņēmuma fails: {path}")
+
+        header_start = len(SNAPSHOT_MAGIC) + 4
+        header_len = struct.unpack('<I', raw[len(SNAPSHOT_MAGIC):header_start])[0]
+        self.header = json.loads(raw[header_start:header_start + header_len])
+        if self.header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Nesaderīga momentuzņēmuma versija: {path}")
+
+        self._data = memoryview(raw)[header_start + header_len:]
+        self.rows = self.header['rows']
+        self.columns = self.header['columns']
+        self._swap = self.header['byteorder'] != sys.byteorder
+        self._offsets = {}
+
+    def is_current(self, folder, xml_count, parser_version=''):
+        """Vai momentuzņēmums atbilst mapes failu skaitam, mtime un parsētāja versijai"""
+        return (self.header['xml_count'] == xml_count and
+                self.header.get('parser_version', '') == parser_version and
+                self.header['folder_mtime_ns'] == Path(folder).stat().st_mtime_ns)
+
+    def _chunk(self, span):
+        start, length = span
+        return self._data[start:start + length]
+
+    def _array(self, typecode, span):
+        """Kolonnas dati kā NumPy masīvs vai array.array"""
+        if USE_NUMPY:
+            dtype = {'d': np.float64, 'i': np.int32, 'q': np.int64}[typecode]
+            values = np.frombuffer(self._chunk(span), dtype=dtype)
+            return values.byteswap() if self._swap else values
+        values = array(typecode)
+        values.frombytes(self._chunk(span))
+        if self._swap:
+            values.byteswap()
+        return values
+
+    def numeric(self, name):
+        """Skaitļu kolonna (NaN - nav vērtības)"""
+        return self._array('d', self.columns[name]['data'])
+
+    def codes(self, name):
+        """Kategoriju kolonnas kodi un vārdnīca"""
+        column = self.columns[name]
+        return self._array('i', column['data']), column['dictionary']
+
+    def text(self, name, row):
+        """Teksta kolonnas vērtība vienai rindai"""
+        column = self.columns[name]
+        offsets = self._offsets.get(name)
+        if offsets is None:
+            offsets = self._offsets[name] = self._array('q', column['offsets']).tolist()
+        data = self._chunk(column['data'])
+        return bytes(data[offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+    def texts(self, name):
+        """Visas teksta kolonnas vērtības"""
+        return [self.text(name, row) for row in range(self.rows)]
+
+    def notice(self, row):
+        """Paziņojuma vārdnīca vienai rindai"""
+        return json.loads(self.text('notice', row))
+
+
+def load_snapshot(xml_dir, folder, xml_count, parser_version=''):
+    """Aktuāls dienas momentuzņēmums vai None"""
+    path = snapshot_path(xml_dir, folder)
+    if not path.exists():
+        return None
+    try:
+        snapshot = NoticeSnapshot(path)
+    except Exception as e:
+        logging.error(f"Kļūda lasot momentuzņēmumu {path}: {e}")
+        return None
+    return snapshot if snapshot.is_current(folder, xml_count, parser_version) else None
+
+
+class SnapshotSet:
+    """Vairāku dienu momentuzņēmumi ar kopīgām kolonnām filtriem
+
+    Kategoriju kodi katrai dienai tiek pārkodēti kopīgā vārdnīcā, tāpēc
+    katrs filtrs ir viena operācija pār visām rindām.
+    """
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.rows = sum(snapshot.rows for snapshot in self.snapshots)
+
+    def _numeric(self, name):
+        parts = [snapshot.numeric(name) for snapshot in self.snapshots]
+        if USE_NUMPY:
+            return np.concatenate(parts) if parts else np.zeros(0)
+        return [value for part in parts for value in part]
+
+    def _category_mask(self, name, allowed):
+        """Rindas, kuru kategorija ir atļautajā kopā"""
+        allowed = set(allowed)
+        return self._dictionary_mask(name, lambda dictionary: [value in allowed for value in dictionary])
+
+    def _dictionary_mask(self, name, accept):
+        """Rindas, kuru kategorijai accept(vārdnīca) dod True (vienreiz katrai vērtībai)"""
+        if USE_NUMPY:
+            parts = []
+            for snapshot in self.snapshots:
+                codes, dictionary = snapshot.codes(name)
+                lookup = np.array(accept(dictionary) or [False], dtype=bool)
+                parts.append(lookup[codes])
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
+
+        mask = []
+        for snapshot in self.snapshots:
+            codes, dictionary = snapshot.codes(name)
+            lookup = accept(dictionary)
+            mask.extend(lookup[code] for code in codes)
+        return mask
+
+    def mask(self, search_criteria, today=None, authorities=None):
+        """Rindas, kas atbilst kritēriju laukiem (tāpat kā _matches_criteria)
+
+        Atslēgvārdi un CPV kodi netiek pārbaudīti - tos pārbauda atjaunotajai
+        vārdnīcai. today - šodienas dienas numurs (deadline_index),
+        authorities - AuthorityFilter (contracting_authorities).
+        """
+        today = today_epoch_day() if today is None else today
+        masks = []
+
+        if 'deadline_status' in search_criteria:
+            deadline = self._numeric('deadline_day')
+            if USE_NUMPY:
+                active = np.isnan(deadline) | (deadline >= today)
+            else:
+                active = [math.isnan(value) or value >= today for value in deadline]
+            if search_criteria['deadline_status'] == 'active':
+                masks.append(active)
+            elif search_criteria['deadline_status'] == 'expired':
+                masks.append(~active if USE_NUMPY else [not value for value in active])
+
+        if 'procedure_types' in search_criteria:
+            masks.append(self._category_mask('procedure_type', search_criteria['procedure_types']))
+
+        for key, column in (('procedure_categories', 'procedure_category'), ('notice_types', 'notice_type')):
+            if search_criteria.get(key):
+                masks.append(self._category_mask(column, search_criteria[key]))
+
+        # Tukšs statuss tiek pieņemts kā atbilstošs
+        statuses = list(search_criteria.get('statuses', ['IZSLUDINĀTS'])) + ['']
+        masks.append(self._category_mask('status', statuses))
+
+        if authorities:
+            def accept(dictionary):
+                allowed = authorities.allowed(dictionary)
+                return [name in allowed for name in dictionary]
+            masks.append(self._dictionary_mask('contracting_authority', accept))
+
+        min_cents = value_limit_cents(search_criteria.get('min_value'))
+        max_cents = value_limit_cents(search_criteria.get('max_value'))
+        if min_cents is not None or max_cents is not None:
+            value = self._numeric('value_cents')
+            comparable = self._category_mask('currency_code', FILTER_CURRENCIES)
+            # Paziņojumi bez summas vai citā valūtā netiek izslēgti
+            if USE_NUMPY:
+                unknown = np.isnan(value) | ~comparable
+                if min_cents is not None:
+                    masks.append(unknown | (value >= min_cents))
+                if max_cents is not None:
+                    masks.append(unknown | (value <= max_cents))
+            else:
+                unknown = [math.isnan(v) or not c for v, c in zip(value, comparable)]
+                if min_cents is not None:
+                    masks.append([u or v >= min_cents for u, v in zip(unknown, value)])
+                if max_cents is not None:
+                    masks.append([u or v <= max_cents for u, v in zip(unknown, value)])
+
+        if USE_NUMPY:
+            result = np.ones(self.rows, dtype=bool)
+            for mask in masks:
+                result &= mask
+            return result
+
+        result = [True] * self.rows
+        for mask in masks:
+            result = [a and b for a, b in zip(result, mask)]
+        return result
+
+    def surviving(self, mask):
+        """Katrai dienai - atbilstošo rindu numuri"""
+        if USE_NUMPY:
+            indices = np.flatnonzero(mask)
+        else:
+            indices = [i for i, passed in enumerate(mask) if passed]
+
+        per_snapshot = [[] for _ in self.snapshots]
+        start = 0
+        bounds = []
+        for snapshot in self.snapshots:
+            bounds.append((start, start + snapshot.rows))
+            start += snapshot.rows
+
+        position = 0
+        for index in indices:
+            index = int(index)
+            while index >= bounds[position][1]:
+                position += 1
+            per_snapshot[position].append(index - bounds[position][0])
+        return per_snapshot
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Parsēto paziņojumu kešatmiņa - SQLite datne blakus XML failiem
+Ieraksts ir derīgs, kamēr nemainās faila izmērs un mtime vai satura hash
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+# Kešatmiņas datnes nosaukums XML failu (EIS-XML-Files) mapē
+CACHE_FILE_NAME = 'parse_cache.db'
+
+
+def file_digest(path):
+    """Faila satura hash (blake2b, 16 baiti)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Parsēšanas rezultātu kešatmiņa, atslēga - ceļš, izmērs, mtime un satura hash
+    
+    Vienam failam var glabāt vairākus ierakstu veidus (kind), piemēram
+    parsēto paziņojumu un meklēšanas priekšskenēšanas rezultātu. Version
+    jāmaina, ja mainās parsētājs - ieraksti ar citu versiju netiek atgriezti.
+    """
+    
+    def __init__(self, db_path, version=''):
+        self.db_path = Path(db_path)
+        self.version = version
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        
+    def _connect(self):
+        """SQLite savienojums katram pavedienam atsevišķi (datne tiek izveidota pirmajā reizē)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parsed (
+                    path TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (path, kind)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS parsed_folder ON parsed (folder)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+        
+    def get(self, xml_path, kind='notice'):
+        """Atgriež saglabāto vērtību vai None, ja ieraksta nav vai tas ir novecojis"""
+        path = os.path.abspath(xml_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+            
+        if not self.db_path.exists():
+            self.misses += 1
+            return None
+            
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT size, mtime_ns, digest, version, payload FROM parsed WHERE path = ? AND kind = ?",
+            (path, kind)
+        ).fetchone()
+        
+        if row is None or row[3] != self.version:
+            self.misses += 1
+            return None
+            
+        size, mtime_ns, digest, _, payload = row
+        if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            # Fails pārrakstīts (piem. atkārtoti atarhivēts) - derīgs tikai ar to pašu saturu
+            if size != stat.st_size or digest != file_digest(path):
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE parsed SET mtime_ns = ? WHERE path = ? AND kind = ?",
+                (stat.st_mtime_ns, path, kind)
+            )
+            conn.commit()
+            
+        self.hits += 1
+        return json.loads(payload)
+        
+    def put(self, xml_path, value, kind='notice'):
+        """Saglabā vērtību (JSON serializējamu) faila pašreizējai versijai"""
+        path = os.path.abspath(xml_path)
+        try:
+            stat = os.stat(path)
+            digest = file_digest(path)
+        except OSError:
+            return
+            
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO parsed (path, kind, folder, size, mtime_ns, digest, version, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, kind, os.path.dirname(path), stat.st_size, stat.st_mtime_ns,
+             digest, self.version, json.dumps(value, ensure_ascii=False))
+        )
+        conn.commit()
+        
+    def get_or_parse(self, xml_path, parse_func, kind='notice'):
+        """Atgriež kešoto rezultātu vai izsauc parse_func(xml_path) un saglabā to"""
+        value = self.get(xml_path, kind)
+        if value is not None:
+            return value
+            
+        value = parse_func(xml_path)
+        if value is not None:
+            self.put(xml_path, value, kind)
+        return value
+        
+    def prune_folder(self, folder):
+        """Dzēš visus ierakstus no mapes (izsauc, kad mape tiek dzēsta)"""
+        conn = self._connect()
+        cursor = conn.execute("DELETE FROM parsed WHERE folder = ?", (os.path.abspath(folder),))
+        conn.commit()
+        if cursor.rowcount:
+            logging.info(f"Kešatmiņā dzēsti {cursor.rowcount} ieraksti no {folder}")
+        return cursor.rowcount
+        
+    def prune_missing(self):
+        """Dzēš ierakstus, kuru faili vairs neeksistē"""
+        conn = self._connect()
+        missing = [(path,) for (path,) in conn.execute("SELECT DISTINCT path FROM parsed")
+                   if not os.path.exists(path)]
+        conn.executemany("DELETE FROM parsed WHERE path = ?", missing)
+        conn.commit()
+        return len(missing)
+        
+    def close(self):
+        """Aizver šī pavediena savienojumu"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+XML failu priekšfiltrs - atmet failus, kuros neviens atslēgvārds vai CPV kods
+nevar atrasties, vēl pirms XML parsēšanas
+
+Filtrs ir konservatīvs: ja fails tiek atmests, pilnā pārbaude to noteikti
+neatrastu. Šaubu gadījumā (rakstzīmju atsauces, cits kodējums, neparasti
+atslēgvārdi) fails tiek palaists tālāk.
+"""
+
+import re
+
+from cpv_index import clean_cpv, cpv_prefix
+from latvian_stemmer import stems
+
+# Rakstzīmes, kurām re.IGNORECASE atrod ASCII burtu arī pēc lower()
+CASE_FOLD_EXTRA = str.maketrans({'ı': 'i', 'ſ': 's'})
+
+# Atslēgvārdu daļas, ko filtrs prot droši meklēt neparsētā tekstā
+SAFE_NEEDLE = re.compile(r'^[a-z0-9_-]+$')
+
+ENCODING_DECLARATION = re.compile(rb'encoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')
+
+
+def minimal_needles(needles):
+    """Atstāj tikai tās virknes, kurās nav citas kopas virknes
+
+    Ja atrodas garākā virkne, atrodas arī tās apakšvirkne, tāpēc
+    "vai ir kāda no virknēm" pārbaudei pietiek ar īsākajām.
+    """
+    kept = []
+    for needle in sorted(set(needles), key=len):
+        if not any(shorter in needle for shorter in kept):
+            kept.append(needle)
+    return kept
+
+
+def needle_pattern(needles):
+    """Viena regulārā izteiksme (alternācija) vairākām virknēm"""
+    return re.compile('|'.join(re.escape(needle) for needle in sorted(needles, key=len, reverse=True)))
+
+
+class RawPrefilter:
+    """Meklēšanas kritēriju priekšfiltrs neparsētiem XML baitiem
+
+    Visas atslēgvārdu variācijas (create_word_variations) tiek normalizētas
+    tāpat kā meklētājā (normalize_latvian_text) un saīsinātas līdz minimālai
+    kopai. Vienvārda atslēgvārdi un CPV kodi tiek apvienoti vienā
+    izteiksmē, frāzēm jāatrodas katram vārdam. Celmu režīmā (matcher='stem')
+    virknes ir vārdu celmi - celms vienmēr ir normalizētā vārda sākums.
+    Hierarhiskā CPV meklēšanā (cpv_hierarchy) virkne ir koda nozīmīgā daļa.
+    """
+
+    def __init__(self, search_criteria, create_word_variations, normalize_text, matcher='variants',
+                 cpv_hierarchy=False):
+        self.normalize_text = normalize_text
+        self.matcher = matcher
+        self.checked = 0
+        self.rejected = 0
+
+        # Rādīt visu - filtrs nav piemērojams
+        self.always_pass = bool(search_criteria.get('show_all', False))
+
+        any_needles = []
+        self.phrases = []
+
+        for keyword in search_criteria.get('keywords', []):
+            if matcher == 'stem':
+                word_needles = [self._safe({word_stem}) for word_stem in stems(keyword, normalize_text)]
+            else:
+                words = keyword.split() if ' ' in keyword else [keyword]
+                word_needles = [self._word_needles(word, create_word_variations) for word in words]
+            if not word_needles or any(needles is None for needles in word_needles):
+                self.always_pass = True
+            elif len(word_needles) == 1:
+                any_needles.extend(word_needles[0])
+            else:
+                self.phrases.append([needle_pattern(minimal_needles(needles)) for needles in word_needles])
+
+        for cpv in search_criteria.get('cpv_codes', []):
+            code = cpv_prefix(cpv) if cpv_hierarchy else clean_cpv(cpv)
+            if SAFE_NEEDLE.match(code):
+                any_needles.append(code)
+            else:
+                self.always_pass = True
+
+        self.any_pattern = needle_pattern(minimal_needles(any_needles)) if any_needles else None
+
+    def _word_needles(self, word, create_word_variations):
+        """Normalizētas vārda variācijas vai None, ja tās nevar droši meklēt"""
+        return self._safe(self.normalize_text(variation) for variation in create_word_variations(word))
+
+    def _safe(self, needles):
+        """Virknes ar tādu pašu reģistra locīšanu kā tekstam vai None, ja kāda nav droša"""
+        needles = {needle.translate(CASE_FOLD_EXTRA) for needle in needles}
+        if not all(SAFE_NEEDLE.match(needle) for needle in needles):
+            return None
+        return needles
+
+    def haystack(self, raw):
+        """Normalizēts faila teksts vai None, ja baitus nevar droši salīdzināt"""
+        # Rakstzīmju atsauces (&#257;) un DTD entītijas var paslēpt burtus
+        if b'&#' in raw or b'<!ENTITY' in raw:
+            return None
+
+        declaration = ENCODING_DECLARATION.search(raw, 0, 200)
+        if declaration and declaration.group(1).lower().replace(b'_', b'-') not in (b'utf-8', b'utf8'):
+            return None
+
+        try:
+            text = raw.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            return None
+
+        return self.normalize_text(text).translate(CASE_FOLD_EXTRA)
+
+    def may_match_bytes(self, raw):
+        """False tikai tad, ja fails noteikti neatbilst kritērijiem"""
+        if self.always_pass:
+            return True
+
+        text = self.haystack(raw)
+        if text is None:
+            return True
+
+        if self.any_pattern is not None and self.any_pattern.search(text):
+            return True
+
+        for phrase in self.phrases:
+            if all(pattern.search(text) for pattern in phrase):
+                return True
+
+        return False
+
+    def may_match(self, xml_path):
+        """Pārbauda failu pēc tā baitiem; nelasāmi faili tiek palaisti tālāk"""
+        if self.always_pass:
+            return True
+
+        try:
+            with open(xml_path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return True
+
+        self.checked += 1
+        if self.may_match_bytes(raw):
+            return True
+
+        self.rejected += 1
+        return False
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+BM25 atbilstības vērtējums un rezultātu lapas ar kursoru
+
+Vērtējums ir BM25F pār celmotiem laukiem (nosaukums ar lielāku svaru,
+apraksts, pasūtītājs). Korpusa statistika (paziņojumu skaits, lauku vidējie
+garumi, celmu dokumentu biežums) tiek ņemta no pilna teksta indeksa, kur tā
+tiek ierakstīta indeksēšanas laikā; bez indeksa - no pašiem rezultātiem.
+Indeksā ir arī celmu biežums katrā laukā, tāpēc indeksētu paziņojumu
+vērtējums tiek aprēķināts bez parsēšanas (bm25_counts).
+Lapai tiek atlasīti tikai limit labākie rezultāti ar kaudzi (heapq), un
+kursors ir pēdējā atgrieztā rezultāta kārtošanas atslēga.
+"""
+
+import base64
+import heapq
+import json
+import math
+from collections import Counter
+
+from latvian_stemmer import stems
+from text_normalizer import normalize_latvian_text
+
+# Vērtētie lauki: info atslēga -> svars
+RANK_FIELDS = {
+    'title': 3.0,
+    'description': 1.0,
+    'contracting_authority': 0.5,
+}
+
+# BM25 parametri
+K1 = 1.2
+B = 0.75
+
+
+def field_stems(info):
+    """Vērtēto lauku celmi {lauks: [celms, ...]}"""
+    return {field: stems(info.get(field) or '', normalize_latvian_text) for field in RANK_FIELDS}
+
+
+def query_stems(keywords):
+    """Atslēgvārdu celmi (bez atkārtojumiem)"""
+    return list(dict.fromkeys(word_stem for keyword in keywords
+                              for word_stem in stems(keyword, normalize_latvian_text)))
+
+
+class CorpusStats:
+    """Korpusa statistika BM25 - dokumentu skaits, lauku vidējie garumi, celmu biežums"""
+
+    def __init__(self, docs=0, avg_lengths=None, doc_freq=None):
+        self.docs = docs
+        self.avg_lengths = avg_lengths or {}
+        self.doc_freq = doc_freq or {}
+
+    @classmethod
+    def from_documents(cls, documents, terms):
+        """Statistika no pašiem dokumentiem (lauku celmu vārdnīcām)"""
+        documents = list(documents)
+        if not documents:
+            return cls()
+        avg_lengths = {field: sum(len(doc[field]) for doc in documents) / len(documents) for field in RANK_FIELDS}
+        doc_freq = Counter()
+        for doc in documents:
+            present = set().union(*doc.values())
+            doc_freq.update(term for term in terms if term in present)
+        return cls(len(documents), avg_lengths, dict(doc_freq))
+
+    def idf(self, term):
+        """BM25 idf (vienmēr pozitīvs)"""
+        df = self.doc_freq.get(term, 0)
+        return math.log(1 + (self.docs - df + 0.5) / (df + 0.5))
+
+
+def field_counts(doc):
+    """Celmu biežums katrā laukā {celms: {lauks: tf}} un lauku garumi {lauks: garums}"""
+    term_counts = {}
+    for field in RANK_FIELDS:
+        for term, tf in Counter(doc[field]).items():
+            term_counts.setdefault(term, {})[field] = tf
+    return term_counts, {field: len(doc[field]) for field in RANK_FIELDS}
+
+
+def bm25_counts(term_counts, lengths, terms, stats):
+    """BM25F vērtējums no lauku biežumiem un garumiem (field_counts vai indeksa notice_terms)"""
+    score = 0.0
+    for term in terms:
+        counts = term_counts.get(term)
+        if not counts:
+            continue
+        weighted_tf = 0.0
+        for field, weight in RANK_FIELDS.items():
+            tf = counts.get(field, 0)
+            if tf:
+                avg_length = stats.avg_lengths.get(field) or 1.0
+                weighted_tf += weight * tf / (1 - B + B * lengths[field] / avg_length)
+        if weighted_tf:
+            score += stats.idf(term) * weighted_tf / (K1 + weighted_tf)
+    return score
+
+
+def bm25_score(doc, terms, stats):
+    """BM25F vērtējums vienam dokumentam (lauku celmu vārdnīcai)"""
+    return bm25_counts(*field_counts(doc), terms, stats)
+
+
+def rank_key(result):
+    """Kārtošanas atslēga - lielākais vērtējums pirmais, vienādiem - datums un fails"""
+    return (-result['score'], result.get('date', ''), result.get('xml_file', ''))
+
+
+def encode_cursor(key):
+    """Kārtošanas atslēga kā URL droša virkne"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Kursora virkne atpakaļ kārtošanas atslēgā (ValueError, ja tā ir bojāta)"""
+    try:
+        score, date, xml_file = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return (float(score), str(date), str(xml_file))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Nederīgs kursors: {cursor}") from e
+
+
+def check_limit(limit):
+    """Lapas izmērs - vismaz viens rezultāts (citādi ValueError)"""
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        raise ValueError(f"Nederīgs lapas izmērs: {limit!r} (jābūt vismaz 1)")
+
+
+def _scored(results, score):
+    """Vērtējums tiek aprēķināts, kad kaudze rezultātu nolasa"""
+    for result in results:
+        result['score'] = score(result)
+        yield result
+
+
+def rank_page(results, limit=50, cursor=None, score=None):
+    """Lapa ar limit labākajiem rezultātiem pēc kursora
+
+    results - rezultāti ar aprēķinātu 'score' vai, ja dota score(result),
+    vērtējums tiek aprēķināts vienā gājienā ar lapas atlasi (bez atsevišķa
+    novērtētu rezultātu saraksta). Labāko limit atlasei jānovērtē katrs
+    kandidāts, ierobežota ir kārtošana - kaudzē ir tikai limit + 1 elementi.
+    Atgriež (lapa, nākamās lapas kursors vai None); limit < 1 - ValueError.
+    """
+    check_limit(limit)
+    after = decode_cursor(cursor) if cursor else None
+    if score is not None:
+        results = _scored(results, score)
+    candidates = results if after is None else (result for result in results if rank_key(result) > after)
+    top = heapq.nsmallest(limit + 1, candidates, key=rank_key)
+    page = top[:limit]
+    next_cursor = encode_cursor(rank_key(page[-1])) if len(top) > limit else None
+    return page, next_cursor
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Meklēšanas rezultātu LRU kešs ar datu paaudzes invalidāciju
+
+Atslēga ir kanoniska kritēriju, datumu diapazona un meklētāja iestatījumu
+jaucējsumma. Rezultāti tiek glabāti kā JSON baiti, tāpēc keša izmērs ir
+ierobežots baitos un katrs trāpījums atgriež neatkarīgu kopiju. Datu
+paaudze ir skaitlis datnē XML failu mapē, ko lejupielādētājs palielina pēc
+atarhivēšanas vai veco failu dzēšanas - ieraksti no vecākas paaudzes netiek
+izmantoti.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Datu paaudzes datne XML failu (EIS-XML-Files) mapē
+GENERATION_FILE_NAME = 'data_generation'
+
+
+# Kritēriji, kuru secība neietekmē atbilstību (kopas); atslēgvārdu saraksti
+# netiek mainīti - atstarpe veido frāzi, secība ir matched_keywords secība
+SET_FIELDS = ('statuses', 'cpv_codes', 'procedure_categories', 'notice_types')
+
+
+def _canonical(search_criteria):
+    """Kritēriji salīdzināšanai - sakārtotas tikai kopu tipa vērtības"""
+    criteria = dict(search_criteria)
+    for field in SET_FIELDS:
+        if isinstance(criteria.get(field), (list, tuple, set)):
+            criteria[field] = sorted(criteria[field], key=str)
+    return criteria
+
+
+def search_cache_key(search_criteria, start_date, end_date, settings=None):
+    """Kanoniska kritēriju un datumu diapazona jaucējsumma (SHA-256)"""
+    payload = {
+        'criteria': _canonical(search_criteria),
+        'start_date': start_date,
+        'end_date': end_date,
+        'settings': settings or {},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class DataGeneration:
+    """Datu paaudzes skaitītājs datnē (kopīgs lejupielādētājam un lietotnei)"""
+
+    def __init__(self, xml_dir):
+        self.path = Path(xml_dir) / GENERATION_FILE_NAME
+        self._cached = (None, 0)
+
+    def current(self):
+        """Pašreizējā paaudze (0, ja datnes vēl nav); nolasīta no jauna tikai pēc izmaiņām"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return 0
+        # Datne tiek aizstāta (os.replace), tāpēc mainās arī inode
+        version = (stat.st_mtime_ns, stat.st_ino)
+        if self._cached[0] != version:
+            try:
+                self._cached = (version, int(self.path.read_text(encoding='utf-8').strip() or 0))
+            except (OSError, ValueError):
+                return 0
+        return self._cached[1]
+
+    def bump(self):
+        """Palielina paaudzi (atomāri - caur pagaidu datni), atgriež jauno vērtību"""
+        generation = self.current() + 1
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(str(generation), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+        return generation
+
+
+class ResultCache:
+    """LRU kešs {atslēga: (paaudze, JSON baiti)}, ierobežots ar max_bytes"""
+
+    def __init__(self, max_bytes, generation):
+        self.max_bytes = max_bytes
+        self.generation = generation
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        _, payload = self.entries.pop(key)
+        self.bytes -= len(payload)
+
+    def get(self, key):
+        """Rezultāti (jauna kopija) vai None, ja to nav vai tie ir no vecākas paaudzes"""
+        generation = self.generation.current()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != generation:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[1]
+        return json.loads(payload)
+
+    def put(self, key, results, generation=None):
+        """Saglabā rezultātus; vecākie ieraksti tiek izmesti, līdz izmērs ir robežās
+
+        generation - paaudze pirms meklēšanas sākuma (ja dati mainījās meklēšanas
+        laikā, ieraksts nākamajā get netiks izmantots).
+        """
+        payload = json.dumps(results, ensure_ascii=False, default=str).encode('utf-8')
+        if len(payload) > self.max_bytes:
+            return False
+        if generation is None:
+            generation = self.generation.current()
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (generation, payload)
+            self.bytes += len(payload)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        """Izmet visus ierakstus (skaitītāji paliek)"""
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Trāpījumu/netrāpījumu skaitītāji un izmērs"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'generation': self.generation.current(),
+            }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Testē dienas arhīvus ar nobīžu indeksu - pārpakošana, lasīšana un meklēšana bez atarhivēšanas
+"""
+
+import gzip
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+
+from archive_pack import ArchivePack, pack_archive, pack_folder, pack_path_for, remove_pack
+from benchmark_search import build_corpus
+from local_procurement_searcher import LokalaisMekletajs
+
+
+def make_tar(folder, tar_path, names=None):
+    """tar.gz no mapes XML failiem (apakšmapē, kā EIS arhīvos)"""
+    with tarfile.open(tar_path, 'w:gz') as tar:
+        for xml_path in sorted(Path(folder).glob('*.xml')):
+            if names is None or xml_path.name in names:
+                tar.add(xml_path, arcname=f"dati/{xml_path.name}")
+
+
+def test_pack_and_read():
+    """Katrs fails nolasāms pēc nobīdes; pievienošana un aizstāšana"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        build_corpus(workdir, days=1, per_day=6)
+        folder = workdir / '01_04_2025'
+        names = sorted(path.name for path in folder.glob('*.xml'))
+        make_tar(folder, workdir / 'a.tar.gz', names[:4])
+        make_tar(folder, workdir / 'b.tar.gz', names[4:])
+
+        pack_path = pack_path_for(workdir / '01_04_2025')
+        assert pack_archive(workdir / 'a.tar.gz', pack_path) == 4
+        assert pack_archive(workdir / 'b.tar.gz', pack_path) == 2
+        pack = ArchivePack.for_folder(folder)
+        assert [member.name for member in pack.xml_files()] == names
+        for name in names:
+            assert pack.read(name) == (folder / name).read_bytes()
+        assert pack.xml_files()[0].parent == folder
+
+        # Arhīvs ir derīgs vairāku posmu .gz fails
+        with gzip.open(pack_path, 'rb') as f:
+            assert f.read() == b''.join((folder / name).read_bytes() for name in names)
+        pack.close()
+
+        assert pack_archive(workdir / 'b.tar.gz', pack_path, replace=True) == 2
+        assert sorted(ArchivePack.for_folder(folder).members) == names[4:]
+
+        remove_pack(folder)
+        assert ArchivePack.for_folder(folder) is None and not pack_path.exists()
+        print(f"✅ Dienas arhīvs: {len(names)} faili")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_replace_keeps_open_pack():
+    """Aizstāšana neskar atvērtu arhīvu; mapes pārpakošana atstāj tikai arhīvu un indeksu"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        build_corpus(workdir, days=1, per_day=6)
+        folder = workdir / '01_04_2025'
+        names = sorted(path.name for path in folder.glob('*.xml'))
+        make_tar(folder, workdir / 'a.tar.gz', names[:4])
+        make_tar(folder, workdir / 'b.tar.gz', names[4:])
+
+        pack_path = pack_path_for(folder)
+        pack_archive(workdir / 'a.tar.gz', pack_path)
+        old = ArchivePack.for_folder(folder)
+        assert pack_archive(workdir / 'b.tar.gz', pack_path, replace=True) == 2
+        # Lasītājs ar veco indeksu turpina lasīt veco arhīvu
+        for name in names[:4]:
+            assert old.read(name) == (folder / name).read_bytes()
+        old.close()
+
+        assert pack_folder(folder) == len(names)
+        pack = ArchivePack.for_folder(folder)
+        assert [pack.read(name) for name in names] == [(folder / name).read_bytes() for name in names]
+        pack.close()
+        assert sorted(path.name for path in workdir.glob('01_04_2025.*')) == [
+            '01_04_2025.xmlpack', '01_04_2025.xmlpack.json']
+        print("✅ Atomāra arhīva aizstāšana")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_search_packed_days():
+    """Meklēšana dienas arhīvos sakrīt ar meklēšanu atarhivētos failos"""
+    workdir = Path(tempfile.mkdtemp())
+    packed = Path(tempfile.mkdtemp())
+    try:
+        end_date = build_corpus(workdir, days=3, per_day=8)
+        for folder in sorted(workdir.glob('*_*_*')):
+            make_tar(folder, packed / 'dienas.tar.gz')
+            pack_archive(packed / 'dienas.tar.gz', pack_path_for(packed / folder.name))
+        (packed / 'dienas.tar.gz').unlink()
+
+        criteria = {'keywords': ['akumulators'], 'statuses': ['IZSLUDINĀTS']}
+        for mode in ('thread', 'process'):
+            config = {'parse_cache': False, 'parallel_mode': mode, 'date_manifest': False}
+            expected = LokalaisMekletajs(config=config, xml_dir=str(workdir))
+            expected.search_criteria = dict(criteria)
+            searcher = LokalaisMekletajs(config=config, xml_dir=str(packed))
+            searcher.search_criteria = dict(criteria)
+
+            results = searcher.search_date_range_parallel('2025-04-01', end_date)
+            assert results and results == expected.search_date_range_parallel('2025-04-01', end_date)
+            print(f"✅ Meklēšana arhīvos ({mode}): {len(results)} rezultāti")
+        assert not any(path.is_dir() for path in packed.iterdir())
+    finally:
+        shutil.rmtree(workdir)
+        shutil.rmtree(packed)
+
+
+if __name__ == "__main__":
+    test_pack_and_read()
+    test_replace_keeps_open_pack()
+    test_search_packed_days()
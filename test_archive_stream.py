@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Testē tar.gz atarhivēšanu no lejupielādes plūsmas - XML faili, kontrolsumma un pārrāvumi
+"""
+
+import hashlib
+import io
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+
+from archive_stream import ArchiveStream
+
+
+def make_archive(count=5):
+    """tar.gz ar XML failiem apakšmapē un vienu ne-XML failu"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for n in range(count):
+            data = f'<notice><id>{n}</id>{"x" * 5000 * n}</notice>'.encode()
+            info = tarfile.TarInfo(f'dati/{n}.xml')
+            info.size = len(data)
+            info.mtime = 1743465600
+            tar.addfile(info, io.BytesIO(data))
+        info = tarfile.TarInfo('lasimani.txt')
+        info.size = 3
+        tar.addfile(info, io.BytesIO(b'abc'))
+    return buffer.getvalue()
+
+
+def feed(stream, data, chunk_size=777):
+    for position in range(0, len(data), chunk_size):
+        stream.feed(position, data[position:position + chunk_size])
+
+
+def test_stream_extract():
+    """XML faili ierakstīti mapē, SHA-256 sakrīt ar arhīvu"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        data = make_archive()
+        stream = ArchiveStream(workdir / '01_04_2025', queue_size=2)
+        feed(stream, data)
+        assert stream.finish() == 5
+        assert stream.sha256() == hashlib.sha256(data).hexdigest()
+        files = sorted(path.name for path in (workdir / '01_04_2025').iterdir())
+        assert files == [f'{n}.xml' for n in range(5)]
+        assert (workdir / '01_04_2025' / '3.xml').read_bytes().startswith(b'<notice><id>3</id>')
+        assert (workdir / '01_04_2025' / '3.xml').stat().st_mtime == 1743465600
+        print(f"✅ Plūsmas atarhivēšana: {len(files)} XML faili")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_incomplete_stream():
+    """Pārrāvums plūsmā, saīsināts vai bojāts arhīvs - finish() atgriež None"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        data = make_archive()
+
+        stream = ArchiveStream(workdir / 'a', queue_size=2)
+        stream.feed(0, data[:1000])
+        stream.feed(2000, data[2000:])
+        assert stream.finish() is None
+
+        stream = ArchiveStream(workdir / 'b', queue_size=2)
+        feed(stream, data[:len(data) // 2])
+        assert stream.finish() is None
+
+        # Bojāta CRC32 gzip beigās - tar dati ir veseli, bet arhīvs netiek pieņemts
+        broken = data[:-8] + bytes(8)
+        stream = ArchiveStream(workdir / 'c', queue_size=2)
+        feed(stream, broken)
+        assert stream.finish() is None
+        print("✅ Nepilnīga plūsma")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_stream_extract()
+    test_incomplete_stream()
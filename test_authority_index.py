@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Testē pasūtītāju trigrammu indeksu un contracting_authorities filtru
+"""
+
+import random
+
+from authority_index import AuthorityIndex, AuthorityFilter, normalize_authority
+from local_procurement_searcher import LokalaisMekletajs, new_notice_info
+
+PARTS = ['Rīgas', 'Ogres', 'novada', 'pilsētas', 'pašvaldība', 'PAŠVALDĪBAS', 'sporta', 'centrs',
+         'skola', 'vidusskola', 'ģimnāzija', 'dome', 'SIA', 'VAS', 'Latvijas', 'dzelzceļš', 'slimnīca']
+
+PATTERNS = ['pašvaldīb', 'skola', 'ģimnāzij', 'sporta centr', 'dome', 'do', 'rīgas pilsētas pašvaldība']
+
+
+def make_names(count, seed=5):
+    """Sintētiski pasūtītāju nosaukumi"""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(PARTS) for _ in range(rng.randint(1, 5))) for _ in range(count)]
+
+
+def test_search_matches_substring_scan():
+    """Trigrammu šķēlums + pārbaude dod tieši apakšvirknes rezultātus"""
+    names = make_names(500)
+    index = AuthorityIndex(names)
+    assert len(index) == len(set(names))
+
+    for pattern in PATTERNS:
+        expected = {index.ids[name] for name in names if normalize_authority(pattern) in normalize_authority(name)}
+        assert index.search(pattern) == expected, pattern
+        print(f"✅ {pattern}: {len(expected)} nosaukumi")
+
+
+def test_filter_incremental_and_cached():
+    """Filtrs pārbauda tikai jaunos nosaukumus un kešo rezultātu"""
+    names = make_names(300, seed=9)
+    authority_filter = AuthorityFilter(['pašvaldīb', 'sporta centr'])
+    expected = {name for name in names
+                if 'pasvaldib' in normalize_authority(name) or 'sporta centr' in normalize_authority(name)}
+
+    assert {name for name in names[:100] if authority_filter.matches(name)} == expected & set(names[:100])
+    assert authority_filter.allowed(names) == expected
+    assert authority_filter.matches('OGRES NOVADA PAŠVALDĪBA')
+    assert not authority_filter.matches('SIA Sporta')
+    assert not authority_filter.matches('')
+    assert AuthorityFilter([]).matches('jebkas')
+    print("✅ Filtrs")
+
+
+def test_matches_criteria():
+    """contracting_authorities tiek piemērots _matches_criteria"""
+    searcher = LokalaisMekletajs(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': ['akumulators'], 'contracting_authorities': ['pašvaldīb', 'skola'],
+                                'statuses': ['IZSLUDINĀTS']}
+
+    info = new_notice_info()
+    info['title'] = 'Akumulatoru piegāde'
+    info['contracting_authority'] = 'Ogres novada pašvaldība'
+    assert searcher._matches_criteria(dict(info), '')
+
+    info['contracting_authority'] = 'VAS "Latvijas dzelzceļš"'
+    assert not searcher._matches_criteria(dict(info), '')
+
+    searcher.search_criteria = {'keywords': ['akumulators'], 'statuses': ['IZSLUDINĀTS']}
+    assert searcher._matches_criteria(dict(info), '')
+    print("✅ _matches_criteria")
+
+
+def test_config_authorities_not_shared():
+    """Meklētāja pasūtītāju saraksts ir kopija - konfigurācija netiek mainīta"""
+    authorities = ['pašvaldīb', 'skola']
+    config = {'parse_cache': False,
+              'search_criteria': {'keywords': ['akumulators'], 'contracting_authorities': authorities}}
+    searcher = LokalaisMekletajs(config=config)
+    searcher.search_criteria['contracting_authorities'].append('dome')
+    assert authorities == ['pašvaldīb', 'skola'] and config['search_criteria']['contracting_authorities'] is authorities
+
+    info = new_notice_info()
+    info['title'] = 'Akumulatoru piegāde'
+    info['contracting_authority'] = 'Tukuma dome'
+    assert searcher._matches_criteria(dict(info), '')
+    assert not LokalaisMekletajs(config=config)._matches_criteria(dict(info), '')
+    print("✅ Pasūtītāju saraksts nav kopīgs ar konfigurāciju")
+
+
+if __name__ == "__main__":
+    test_search_matches_substring_scan()
+    test_filter_incremental_and_cached()
+    test_matches_criteria()
+    test_config_authorities_not_shared()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Testē CompiledCriteria - rezultātiem jāsakrīt ar iepriekšējo _text_contains_keyword
+"""
+
+import re
+
+from local_procurement_searcher import OptimizedLocalSearcher
+from compiled_criteria import trie_regex
+from benchmark_keywords import legacy_text_contains_keyword, make_documents
+
+KEYWORDS = ['sporta inventārs', 'skola', 'akumulators', 'ceļš', 'DOME', 'piegāde',
+            'zāles remonts', 'ūdensapgāde', 'e-pasts', '']
+
+TEXTS = [
+    'Skolu sporta inventāra piegāde',
+    'SPORTA INVENTĀRA IEGĀDE ĢIMNĀZIJAI',
+    'Celu uzturesana un cela remonts',
+    'Rīgas domes zāles remonta darbi',
+    'Akumulatoru un rezerves daļu piegādes',
+    'Udensapgades tīklu izbūve; e-pasta serveris',
+    'Pakalpojumi bez atslēgvārdiem',
+    '',
+]
+
+
+def test_trie_regex():
+    """Prefiksu koka izteiksme atrod tieši dotos vārdus"""
+    words = {'sport', 'sporta', 'sportam', 'sports', 'spole'}
+    pattern = re.compile(r'^(?:' + trie_regex(words) + r')$')
+    assert all(pattern.match(word) for word in words)
+    assert not any(pattern.match(word) for word in ('spor', 'sportas', 'spolee', 'port'))
+    print(f"✅ {trie_regex(words)}")
+
+
+def test_matches_legacy():
+    """Atrastie un izslēgtie atslēgvārdi sakrīt ar veco implementāciju"""
+    searcher = OptimizedLocalSearcher(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': KEYWORDS, 'exclude_keywords': ['remonts', 'e-pasts']}
+    criteria = searcher.get_compiled_criteria()
+
+    for text in TEXTS + make_documents(40):
+        expected = [kw for kw in KEYWORDS if legacy_text_contains_keyword(searcher, text, kw)]
+        assert criteria.matched_keywords(text) == expected, text
+        assert criteria.is_excluded(text) == any(
+            legacy_text_contains_keyword(searcher, text, ex) for ex in ('remonts', 'e-pasts'))
+        for kw in KEYWORDS:
+            assert searcher._text_contains_keyword(text, kw) == (kw in expected)
+
+    print(f"✅ {len(TEXTS) + 40} teksti sakrīt ar veco implementāciju")
+
+
+def test_built_once():
+    """Kritēriji tiek kompilēti vienreiz un pārveidoti tikai pēc izmaiņām"""
+    searcher = OptimizedLocalSearcher(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': ['skola']}
+    first = searcher.get_compiled_criteria()
+    assert searcher.get_compiled_criteria() is first
+
+    searcher.search_criteria['keywords'].append('dome')
+    second = searcher.get_compiled_criteria()
+    assert second is not first
+    assert second.matched_keywords('Novada domes skolai') == ['skola', 'dome']
+    print("✅ Kritēriji kompilēti vienreiz")
+
+
+if __name__ == "__main__":
+    test_trie_regex()
+    test_matches_legacy()
+    test_built_once()
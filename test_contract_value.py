@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Testē līguma summu centos, summu indeksu un min_value/max_value filtru
+"""
+
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+from benchmark_search import build_corpus
+from contract_value import ValueIndex, apply_value_filter, parse_cents, value_in_range
+from local_procurement_searcher import LokalaisMekletajs, new_notice_info
+from test_notice_index import index_all
+
+PRICES = ['4790.4', '150000', '12 345,67', '999.99', '1.234,50', '', '0']
+
+
+def test_parse_cents():
+    """Teksta summas veselos centos"""
+    cases = {
+        '4790.4': 479040,
+        '12 345,67': 1234567,
+        '1.234,50': 123450,
+        '1,234.50': 123450,
+        '0.005': 1,
+        '150000': 15000000,
+        '': None,
+        'nav': None,
+        None: None,
+    }
+    for text, cents in cases.items():
+        assert parse_cents(text) == cents, text
+    print("✅ parse_cents")
+
+
+def test_value_index():
+    """Divi bisect dod tos pašus paziņojumus kā pilna pārbaude"""
+    rng = random.Random(4)
+    pairs = [(rng.randint(0, 10 ** 8), notice_id) for notice_id in range(2000)]
+    index = ValueIndex(pairs)
+    for min_cents, max_cents in [(None, None), (500000, None), (None, 2500000), (10 ** 6, 5 * 10 ** 7)]:
+        expected = {notice_id for cents, notice_id in pairs if value_in_range(cents, 'EUR', min_cents, max_cents)}
+        assert index.in_range(min_cents, max_cents) == expected
+        assert index.outside(min_cents, max_cents) == set(range(2000)) - expected
+    print("✅ ValueIndex")
+
+
+def test_apply_value_filter():
+    """/api/search robežas - validācija un ierakstīšana kritērijos"""
+    criteria = apply_value_filter({'min_value': 10}, {'min_value': '1 000,50', 'max_value': 0})
+    assert criteria == {'min_value': 1000.5}
+    for payload in ({'min_value': -5}, {'max_value': 'daudz'}, {'min_value': 500, 'max_value': 100}):
+        try:
+            apply_value_filter({}, payload)
+        except ValueError:
+            continue
+        raise AssertionError(payload)
+    print("✅ apply_value_filter")
+
+
+def test_config_limits_copy_criteria():
+    """Konfigurācijas summu robežas tiek pievienotas jaunai kritēriju vārdnīcai"""
+    config = {'parse_cache': False, 'min_contract_value': 1000, 'max_contract_value': 5000,
+              'search_criteria': {'keywords': ['akumulators']}}
+    searcher = LokalaisMekletajs(config=config)
+    assert searcher.search_criteria == {'keywords': ['akumulators'], 'min_value': 1000, 'max_value': 5000}
+    assert config['search_criteria'] == {'keywords': ['akumulators']}
+
+    criteria = {'min_value': 10}
+    searcher.apply_config(config, criteria)
+    assert searcher.search_criteria == {'min_value': 10, 'max_value': 5000} and criteria == {'min_value': 10}
+    print("✅ Konfigurācijas kritēriji netiek mainīti")
+
+
+def test_matches_criteria():
+    """min_value/max_value - nezināma summa un cita valūta netiek izslēgta"""
+    searcher = LokalaisMekletajs(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': ['akumulators'], 'min_value': 1000, 'max_value': 5000,
+                                'statuses': ['IZSLUDINĀTS']}
+    info = new_notice_info()
+    info['title'] = 'Akumulatoru piegāde'
+    for cents, currency, expected in [(479040, 'EUR', True), (99999, 'EUR', False), (500001, '', False),
+                                      (99999, 'LVL', True), (None, '', True)]:
+        info.update(value_cents=cents, currency_code=currency)
+        assert searcher._matches_criteria(dict(info), '') == expected, (cents, currency)
+    print("✅ _matches_criteria")
+
+
+def test_index_same_results():
+    """Summu indekss izslēdz tikai tos failus, ko izslēgtu pilnā pārbaude"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = build_corpus(workdir, days=2, per_day=14)
+        for n, xml_path in enumerate(sorted(Path(workdir).rglob('*.xml'))):
+            content = xml_path.read_text(encoding='utf-8')
+            content = content.replace('<price>4790.4</price>', f'<price>{PRICES[n % len(PRICES)]}</price>')
+            if n % 5 == 0:
+                content = content.replace('<currency>2</currency>', '<currency>1</currency>')
+            xml_path.write_text(content, encoding='utf-8')
+        index_all(workdir)
+
+        for limits in [{'min_value': 1000}, {'max_value': '5000'}, {'min_value': 1000, 'max_value': 20000}]:
+            results = []
+            for use_index in (False, True):
+                config = {'parse_cache': False, 'parallel_mode': 'thread', 'fulltext_index': use_index}
+                searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+                searcher.search_criteria = dict(limits, keywords=['akumulators', 'sporta'],
+                                                statuses=['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS'])
+                results.append(searcher.search_date_range_parallel('2025-04-01', end_date))
+            assert results[0] == results[1], limits
+            print(f"✅ {limits}: {len(results[1])} rezultāti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_parse_cents()
+    test_value_index()
+    test_apply_value_filter()
+    test_config_limits_copy_criteria()
+    test_matches_criteria()
+    test_index_same_results()
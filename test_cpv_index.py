@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Testē hierarhisko CPV indeksu un meklēšanu pēc CPV grupām
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from cpv_index import CpvIndex, cpv_prefix
+from local_procurement_searcher import LokalaisMekletajs
+from test_notice_index import index_all
+
+# Faila nosaukums -> CPV kods (768142.xml ir 31400000-0)
+NOTICE_CODES = {
+    'group.xml': '31400000-0',
+    'class.xml': '31410000-3',
+    'category.xml': '31411000-0',
+    'other_group.xml': '31500000-1',
+    'other_division.xml': '37411000-4',
+}
+
+
+def test_cpv_prefix():
+    """Koda nozīmīgā daļa pēc līmeņa"""
+    assert cpv_prefix('37000000') == '37'
+    assert cpv_prefix('37400000-4') == '374'
+    assert cpv_prefix('37411000') == '37411'
+    assert cpv_prefix('37411300') == '374113'
+    assert cpv_prefix('10000000') == '10'
+    print("✅ CPV prefiksi")
+
+
+def test_sorted_arrays():
+    """Prefiksa vaicājums ir intervāls sakārtotajā masīvā"""
+    index = CpvIndex([('37411000', 1), ('37400000', 2), ('37500000', 3), ('03000000', 4), ('37411000', 5)])
+    assert index.codes == sorted(index.codes)
+    assert index.exact('37411000-4') == {1, 5}
+    assert index.lookup('37400000', hierarchy=True) == {1, 2, 5}
+    assert index.lookup('37000000', hierarchy=True) == {1, 2, 3, 5}
+    assert index.lookup('37400000') == {2}
+    assert index.lookup('99000000', hierarchy=True) == set()
+    print("✅ CPV indeksa masīvi")
+
+
+def make_corpus(workdir):
+    """Viena dienas mape ar dažādu CPV līmeņu paziņojumiem"""
+    folder = Path(workdir) / '01_04_2025'
+    folder.mkdir()
+    template = Path('768142.xml').read_text(encoding='utf-8')
+    for number, (name, code) in enumerate(NOTICE_CODES.items()):
+        content = template.replace('31400000-0', code).replace('768142', str(900000 + number))
+        content = content.replace('LDZ 2025/39-SPAV', f'LDZ 2025/{number}')
+        (folder / name).write_text(content, encoding='utf-8')
+    return folder
+
+
+def search(workdir, cpv_codes, hierarchy, use_index=False, prefilter=False):
+    """Atrasto failu nosaukumi"""
+    config = {'parse_cache': False, 'parallel_mode': 'thread', 'prefilter': prefilter,
+              'fulltext_index': use_index, 'cpv_hierarchy': hierarchy}
+    searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+    searcher.search_criteria = {'keywords': [], 'cpv_codes': cpv_codes,
+                                'statuses': ['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS']}
+    results = searcher.search_date_range_parallel('2025-04-01', '2025-04-01')
+    return sorted(result['xml_file'] for result in results)
+
+
+def test_hierarchical_search():
+    """Grupas kods atrod klases un kategorijas; indekss un priekšfiltrs rezultātus nemaina"""
+    workdir = tempfile.mkdtemp()
+    try:
+        make_corpus(workdir)
+        index_all(workdir)
+
+        assert search(workdir, ['31400000-0'], hierarchy=False) == ['group.xml']
+        assert search(workdir, ['31400000-0'], hierarchy=True) == ['category.xml', 'class.xml', 'group.xml']
+        assert search(workdir, ['31000000'], hierarchy=True) == ['category.xml', 'class.xml', 'group.xml',
+                                                                 'other_group.xml']
+
+        for cpv_codes in (['31400000'], ['31410000', '37000000'], ['45000000']):
+            for hierarchy in (False, True):
+                slow = search(workdir, cpv_codes, hierarchy)
+                assert search(workdir, cpv_codes, hierarchy, use_index=True) == slow
+                assert search(workdir, cpv_codes, hierarchy, prefilter=True) == slow
+                print(f"✅ {cpv_codes} (hierarhija: {hierarchy}): {slow}")
+
+        # search_xml atgriež paziņojuma kodus, kas atbilst meklētajai grupai
+        searcher = LokalaisMekletajs(config={'parse_cache': False, 'cpv_hierarchy': True}, xml_dir=workdir)
+        searcher.search_criteria = {'keywords': [], 'cpv_codes': ['31400000'], 'statuses': ['IZSLUDINĀTS']}
+        matches = searcher.search_xml(str(Path(workdir) / '01_04_2025' / 'category.xml'))
+        assert '31411000' in matches[0]['found_cpv_codes']
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_cpv_prefix()
+    test_sorted_arrays()
+    test_hierarchical_search()
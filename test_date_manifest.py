@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Testē dienu mapju manifestu - meklēšana un statuss bez mapju pārlasīšanas
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from benchmark_search import build_corpus
+from date_manifest import DateManifest
+from local_procurement_searcher import LokalaisMekletajs
+
+
+def search(workdir, end_date, use_manifest):
+    """Meklēšanas rezultāti ar vai bez manifesta"""
+    config = {'parse_cache': False, 'parallel_mode': 'thread', 'date_manifest': use_manifest}
+    searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+    searcher.search_criteria = {'keywords': ['akumulators', 'sporta'], 'statuses': ['IZSLUDINĀTS']}
+    return searcher.search_date_range_parallel('2025-04-01', end_date)
+
+
+def test_manifest_search():
+    """Manifesta failu saraksti dod tos pašus rezultātus; mainīta mape tiek pārlasīta"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = build_corpus(workdir, days=3, per_day=10)
+        manifest = DateManifest(workdir)
+        folders = sorted(path for path in Path(workdir).iterdir() if path.is_dir())
+        for folder in folders:
+            entry = manifest.record_folder(folder)
+            assert entry['xml_count'] == 10
+            assert entry['total_bytes'] == sum(path.stat().st_size for path in folder.glob('*.xml'))
+
+        assert search(workdir, end_date, True) == search(workdir, end_date, False)
+
+        # Mapes saturs netiek lasīts - manifests nosaka failu sarakstu
+        searcher = LokalaisMekletajs(config={'parse_cache': False}, xml_dir=workdir)
+        assert searcher.list_xml_files(folders[0]) == sorted(folders[0].glob('*.xml'))
+
+        # Mainīta mape (jauns fails) - ieraksts nav aktuāls
+        shutil.copy(folders[0] / '000000.xml', folders[0] / 'new.xml')
+        assert DateManifest(workdir).xml_files(folders[0]) is None
+        assert folders[0] / 'new.xml' in searcher.list_xml_files(folders[0])
+
+        assert manifest.remove_folder(folders[1])
+        assert DateManifest(workdir).xml_files(folders[1]) is None
+        print("✅ Manifests")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_status_from_manifest():
+    """check_local_files_status nolasa skaitus no manifesta"""
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        build_corpus(Path(workdir) / 'EIS-XML-Files', days=2, per_day=5)
+        download_dir = Path(workdir) / 'EIS-Automatic-Download'
+        download_dir.mkdir()
+        (download_dir / 'download_metadata.json').write_text(
+            json.dumps({'downloads': {}, 'last_update': None, 'total_files': 2}), encoding='utf-8')
+
+        manifest = DateManifest(Path(workdir) / 'EIS-XML-Files')
+        for folder in sorted((Path(workdir) / 'EIS-XML-Files').iterdir()):
+            manifest.record_folder(folder, notice_count=4)
+
+        os.chdir(workdir)
+        searcher = LokalaisMekletajs(config={'parse_cache': False}, xml_dir='EIS-XML-Files')
+        status = searcher.check_local_files_status()
+        assert status['total_xml_files'] == 10
+        assert status['total_notices'] == 8
+        assert status['total_xml_bytes'] > 0
+        print(f"✅ Statuss: {status['message']}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_manifest_search()
+    test_status_from_manifest()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Testē termiņu dienu numurus, termiņu indeksu un deadline_status filtru
+"""
+
+import random
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from benchmark_search import build_corpus
+from deadline_index import DeadlineIndex, deadline_epoch_day, epoch_day, format_date, today_epoch_day
+from local_procurement_searcher import LokalaisMekletajs, new_notice_info
+from test_notice_index import index_all
+
+DATES = ['20250401', '2025-04-01', '2025-4-1', '01.04.2025', '1/4/2025', '31/12/2099', '2025-02-30',
+         '30.02.2025', '2025/04/01', 'nav', '', '2025-04-01 12:00']
+
+
+def strptime_format(date_str):
+    """Iepriekšējā _format_date loģika - salīdzināšanai"""
+    if not date_str:
+        return ''
+    for fmt in ['%Y%m%d', '%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y']:
+        try:
+            return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return date_str
+
+
+def test_format_date():
+    """format_date sakrīt ar strptime formātu mēģināšanu"""
+    for date_str in DATES:
+        assert format_date(date_str) == strptime_format(date_str), date_str
+    assert deadline_epoch_day('1970-01-02') == 1
+    assert deadline_epoch_day('2025-02-30') is None
+    assert deadline_epoch_day('') is None
+    print("✅ format_date")
+
+
+def test_deadline_index():
+    """Viens bisect dod tos pašus paziņojumus kā pilna pārbaude"""
+    rng = random.Random(6)
+    pairs = [(rng.randint(19000, 21000), notice_id) for notice_id in range(1000)]
+    index = DeadlineIndex(pairs)
+    for today in (18000, 19500, 20123, 22000):
+        assert index.expired(today) == {notice_id for day, notice_id in pairs if day < today}
+        assert index.active(today) == {notice_id for day, notice_id in pairs if day >= today}
+    print("✅ DeadlineIndex")
+
+
+def test_today_is_active():
+    """Termiņš ir aktīvs visu savu dienu; diena tiek noteikta katrā pārbaudē"""
+    searcher = LokalaisMekletajs(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': ['akumulators'], 'deadline_status': 'active', 'statuses': ['IZSLUDINĀTS']}
+    info = new_notice_info()
+    info['title'] = 'Akumulatoru piegāde'
+
+    today = today_epoch_day()
+    for deadline_day, expected in [(today, True), (today - 1, False), (today + 1, True), (None, True)]:
+        info['deadline_day'] = deadline_day
+        assert searcher._matches_criteria(dict(info), '') == expected, deadline_day
+
+    # Pēc pusnakts (nākamā diena) vakardienas termiņš vairs nav aktīvs
+    info['deadline_day'] = today
+    searcher.today = today + 1
+    assert not searcher._matches_criteria(dict(info), '')
+    searcher.today = None
+    assert searcher._matches_criteria(dict(info), '')
+    print("✅ Šodienas termiņš")
+
+
+def test_index_same_results():
+    """Termiņu indekss atlasa tos pašus failus kā pilnā pārbaude"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = build_corpus(workdir, days=2, per_day=12)
+        today = date.today()
+        for n, xml_path in enumerate(sorted(Path(workdir).rglob('*.xml'))):
+            if n % 4 == 3:
+                continue
+            deadline = (today + timedelta(days=n % 4 - 1)).strftime('%d/%m/%Y')
+            content = xml_path.read_text(encoding='utf-8')
+            content = content.replace('<decision_date>', f'<submit_date>{deadline}</submit_date>\n<decision_date>')
+            xml_path.write_text(content, encoding='utf-8')
+        index = index_all(workdir)
+        assert len(index.deadline_index()) == 18
+        assert len(index.expired_paths(epoch_day(today))) == 6
+
+        for deadline_status in ('active', 'expired'):
+            results = []
+            for use_index in (False, True):
+                config = {'parse_cache': False, 'parallel_mode': 'thread', 'fulltext_index': use_index}
+                searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+                searcher.search_criteria = {'keywords': ['akumulators', 'sporta'], 'deadline_status': deadline_status,
+                                            'statuses': ['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS']}
+                results.append(searcher.search_date_range_parallel('2025-04-01', end_date))
+            assert results[0] == results[1], deadline_status
+            print(f"✅ {deadline_status}: {len(results[1])} rezultāti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_format_date()
+    test_deadline_index()
+    test_today_is_active()
+    test_index_same_results()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Testē lauku plānus - katram izkārtojumam savi ceļi bez daļējas tagu atbilstības
+"""
+
+import os
+import tempfile
+
+from local_procurement_searcher import ImprovedXMLParser, detect_layout
+from benchmark_parser import WalkCounter, legacy_lookups
+
+TED_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<TED_EXPORT xmlns="http://publications.europa.eu/resource/schema/ted/R2.0.9/publication">
+  <CODED_DATA_SECTION>
+    <NOTICE_DATA><NO_DOC_OJS>2025/S 123-456789</NO_DOC_OJS></NOTICE_DATA>
+  </CODED_DATA_SECTION>
+  <FORM_SECTION>
+    <F02_2014>
+      <CONTRACTING_BODY>
+        <ADDRESS_CONTRACTING_BODY>
+          <OFFICIALNAME>Rīgas pilsētas pašvaldība</OFFICIALNAME>
+          <TOWN>Rīga</TOWN>
+        </ADDRESS_CONTRACTING_BODY>
+      </CONTRACTING_BODY>
+      <OBJECT_CONTRACT>
+        <TITLE><P>Sporta inventāra piegāde</P></TITLE>
+        <CPV_MAIN><CPV_CODE CODE="37400000"/></CPV_MAIN>
+        <VAL_TOTAL CURRENCY="EUR">125000</VAL_TOTAL>
+      </OBJECT_CONTRACT>
+      <PROCEDURE>
+        <PT_OPEN/>
+        <DATE_RECEIPT_TENDERS>2025-09-01</DATE_RECEIPT_TENDERS>
+      </PROCEDURE>
+    </F02_2014>
+  </FORM_SECTION>
+</TED_EXPORT>
+"""
+
+
+def parse_string(content):
+    """Parsē XML virkni caur pagaidu failu"""
+    with tempfile.NamedTemporaryFile('w', suffix='.xml', encoding='utf-8', delete=False) as f:
+        f.write(content)
+    try:
+        return ImprovedXMLParser().parse_xml_comprehensive(f.name)
+    finally:
+        os.unlink(f.name)
+
+
+def test_eis_layout():
+    """768142.xml - plakanais <document> izkārtojums"""
+    parser = ImprovedXMLParser()
+    root = parser.load_root('768142.xml')
+    assert detect_layout(root) == 'eis'
+
+    info = parser.parse_root(root)
+    assert info['title'] == 'Akumulatoru piegāde'
+    assert info['id'] == 'LDZ 2025/39-SPAV'
+    assert info['type'] == 'sps_iv_results'  # Nevis main_cpv/type
+    assert info['cpv_codes'] == ['31400000']
+    assert info['authority_address'] == 'Emīlijas Benjamiņas iela 3, Rīga, LV-1547'
+    assert info['publication_date'] == '2025-07-01'
+    assert info['award_info']['contractor'] == 'SIA "Lemona Latvija"'
+    assert info['award_info']['award_date'] == '2025-06-16'
+    print(f"✅ EIS: {info['title']} ({info['id']})")
+
+
+def test_ted_layout():
+    """TED stila paziņojums ar namespace"""
+    info = parse_string(TED_XML)
+    assert info['title'] == 'Sporta inventāra piegāde'
+    assert info['contracting_authority'] == 'Rīgas pilsētas pašvaldība'
+    assert info['cpv_codes'] == ['37400000']
+    assert info['value'] == '125000'
+    assert info['currency'] == 'EUR'
+    assert info['deadline'] == '2025-09-01'
+    assert info['procedure_type'] == 'Open'
+    print(f"✅ TED: {info['title']} ({info['id']})")
+
+
+def test_unknown_tags_ignored():
+    """Nezināmi tagi vairs netiek atrasti ar daļēju atbilstību"""
+    info = parse_string(
+        '<document><general><main_cpv><type>1</type></main_cpv></general>'
+        '<contactplaces><contactplace><name>Kontaktpunkts</name></contactplace></contactplaces>'
+        '<old_price_range>100</old_price_range></document>'
+    )
+    assert info['title'] == ''
+    assert info['type'] == ''
+    assert info['value'] == ''
+    print("✅ Nezināmi tagi ignorēti")
+
+
+def test_no_full_tree_walks():
+    """Plāns iet tikai pa saviem ceļiem - pilni koka gājieni nav vajadzīgi"""
+    root = ImprovedXMLParser().load_root('768142.xml')
+    counter = WalkCounter(root)
+    ImprovedXMLParser().parse_root(counter)
+
+    # Sākotnējā find_element meklēšana tiem pašiem laukiem - gājiens katram tagam
+    legacy = WalkCounter(root)
+    legacy_lookups(legacy)
+
+    print(f"Pilni koka gājieni: {counter.walks} (find_element: {legacy.walks})")
+    assert counter.walks == 0 and legacy.walks > 1
+
+
+if __name__ == "__main__":
+    test_eis_layout()
+    test_ted_layout()
+    test_unknown_tags_ignored()
+    test_no_full_tree_walks()
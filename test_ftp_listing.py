@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Testē mēneša mapju sarakstus - MLSD izmēri/laiki, NLST rezerve un no jauna publicēti arhīvi
+"""
+
+import ftplib
+
+from ftp_listing import MonthListingCache, archive_changed, list_directory
+
+
+class ListingFTP:
+    """FTP servera aizvietotājs - mapju saraksti un izsaukumu skaitītājs"""
+
+    def __init__(self, folders, mlsd=True):
+        self.folders = folders
+        self.mlsd_supported = mlsd
+        self.calls = 0
+        self.error = None
+
+    def mlsd(self, path, facts=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        if path not in self.folders:
+            raise ftplib.error_perm('550 No such file or directory')
+        if not self.mlsd_supported:
+            raise ftplib.error_perm('500 Unknown command MLSD')
+        yield '.', {'type': 'cdir'}
+        for name, (size, modify) in self.folders[path].items():
+            yield name, {'type': 'file', 'size': str(size), 'modify': modify}
+
+    def nlst(self, path):
+        self.calls += 1
+        return [f"{path}/{name}" for name in self.folders[path]]
+
+
+FOLDERS = {'/2025/04_2025': {
+    '01_04_2025.tar.gz': (1200, '20250402030000'),
+    '02_04_2025.tar.gz': (900, '20250403030000'),
+}}
+
+
+def test_mlsd_and_nlst():
+    """MLSD dod izmēru un laiku; bez MLSD - tikai nosaukumi"""
+    files = list_directory(ListingFTP(FOLDERS), '/2025/04_2025')
+    assert files == {'01_04_2025.tar.gz': {'size': 1200, 'modify': '20250402030000'},
+                     '02_04_2025.tar.gz': {'size': 900, 'modify': '20250403030000'}}
+
+    files = list_directory(ListingFTP(FOLDERS, mlsd=False), '/2025/04_2025')
+    assert files == {'01_04_2025.tar.gz': {'size': None, 'modify': None},
+                     '02_04_2025.tar.gz': {'size': None, 'modify': None}}
+    print("✅ MLSD un NLST")
+
+
+def test_month_listed_once():
+    """Katra mēneša mape tiek nolasīta vienreiz"""
+    ftp = ListingFTP(FOLDERS)
+    listings = MonthListingCache(ftp)
+    for _ in range(30):
+        assert len(listings.files('/2025/04_2025')) == 2
+    assert ftp.calls == 1
+    print("✅ Viens saraksts mēnesim")
+
+
+def test_missing_month_cached():
+    """Neesoša mēneša mape (550) tiek pieprasīta vienreiz; citas kļūdas netiek kešotas"""
+    ftp = ListingFTP(FOLDERS)
+    listings = MonthListingCache(ftp)
+    for _ in range(30):
+        assert listings.files('/2025/05_2025') == {}
+    assert ftp.calls == 1
+
+    ftp.error = ftplib.error_temp('421 Too many connections')
+    for _ in range(2):
+        try:
+            listings.files('/2025/04_2025')
+        except ftplib.error_temp:
+            pass
+        else:
+            raise AssertionError("kļūda netika nodota tālāk")
+    assert ftp.calls == 3 and '/2025/04_2025' not in listings.listings
+    print("✅ Neesoša mape kešota")
+
+
+def test_archive_changed():
+    """Mainīts izmērs vai laiks - arhīvs publicēts no jauna; nezināmas vērtības netiek salīdzinātas"""
+    entry = {'remote_size': 1200, 'remote_modify': '20250402030000'}
+    assert not archive_changed(entry, {'size': 1200, 'modify': '20250402030000'})
+    assert archive_changed(entry, {'size': 1300, 'modify': '20250402030000'})
+    assert archive_changed(entry, {'size': 1200, 'modify': '20250405120000'})
+    assert not archive_changed(entry, {'size': None, 'modify': None})
+    assert not archive_changed({'size': 1200}, {'size': 1300, 'modify': '20250402030000'})
+    assert not archive_changed(None, {'size': 1200, 'modify': '20250402030000'})
+    print("✅ No jauna publicēti arhīvi")
+
+
+if __name__ == "__main__":
+    test_mlsd_and_nlst()
+    test_month_listed_once()
+    test_missing_month_cached()
+    test_archive_changed()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Testē FTP savienojumu kopumu - paralēla lejupielāde, atkārtojumi un jauni savienojumi
+"""
+
+import ftplib
+import gzip
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ftp_pool import FTPConnectionPool, verify_archive
+
+FILES = {f'/2025/04_2025/{n:02d}.tar.gz': bytes([n]) * (1000 + n) for n in range(12)}
+
+
+class LocalFTP:
+    """FTP servera aizvietotājs testiem - faili atmiņā un ieplānotas kļūdas"""
+
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self, host, timeout=None, failures=None):
+        self.failures = failures if failures is not None else {}
+        self.closed = False
+        self.offsets = []
+
+    def login(self, user, password):
+        pass
+
+    def voidcmd(self, command):
+        if self.closed:
+            raise EOFError("savienojums aizvērts")
+
+    def retrbinary(self, command, callback, rest=None):
+        if self.closed:
+            raise EOFError("savienojums aizvērts")
+        path = command.split(' ', 1)[1]
+        self.offsets.append(rest)
+        with LocalFTP.lock:
+            LocalFTP.active += 1
+            LocalFTP.max_active = max(LocalFTP.max_active, LocalFTP.active)
+        try:
+            time.sleep(0.01)
+            failure = self.failures.get(path, [])
+            if failure:
+                error = failure.pop(0)
+                callback(FILES[path][rest or 0:(rest or 0) + 10])
+                if isinstance(error, EOFError):
+                    self.closed = True
+                raise error
+            if path not in FILES:
+                raise ftplib.error_perm('550 Fails nav atrasts')
+            callback(FILES[path][rest or 0:])
+        finally:
+            with LocalFTP.lock:
+                LocalFTP.active -= 1
+
+    def close(self):
+        self.closed = True
+
+    def quit(self):
+        self.closed = True
+
+
+def test_parallel_retrieve():
+    """Visi faili lejupielādēti ne vairāk kā size savienojumos"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        LocalFTP.max_active = 0
+        pool = FTPConnectionPool('localhost', size=3, backoff=0, factory=LocalFTP)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sizes = list(executor.map(lambda path: pool.retrieve(path, workdir / Path(path).name), FILES))
+        assert sizes == [len(data) for data in FILES.values()]
+        for path, data in FILES.items():
+            assert (workdir / Path(path).name).read_bytes() == data
+        assert LocalFTP.max_active <= 3 and pool.connections_opened <= 3
+        pool.close()
+        print(f"✅ {len(FILES)} faili, {pool.connections_opened} savienojumi")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_retries_and_reconnect():
+    """4xx - atkārto tajā pašā savienojumā, 421/EOF - jauns savienojums, 5xx - neatkārto"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        paths = list(FILES)
+        failures = {
+            paths[0]: [ftplib.error_temp('450 Fails aizņemts')],
+            paths[1]: [EOFError(), ftplib.error_temp('421 Savienojums aizvērts')],
+        }
+        pool = FTPConnectionPool('localhost', size=1, backoff=0,
+                                 factory=lambda host, timeout=None: LocalFTP(host, timeout, failures))
+
+        assert pool.retrieve(paths[0], workdir / 'a.tar.gz') == len(FILES[paths[0]])
+        assert pool.connections_opened == 1
+        assert pool.retrieve(paths[1], workdir / 'b.tar.gz') == len(FILES[paths[1]])
+        assert pool.connections_opened == 3
+        assert (workdir / 'b.tar.gz').read_bytes() == FILES[paths[1]]
+
+        try:
+            pool.retrieve('/nav.tar.gz', workdir / 'nav.tar.gz')
+        except ftplib.error_perm:
+            pass
+        else:
+            raise AssertionError("5xx netika izmesta")
+        assert not (workdir / 'nav.tar.gz').exists()
+
+        failures[paths[2]] = [ftplib.error_temp('450 Aizņemts')] * 5
+        try:
+            pool.retrieve(paths[2], workdir / 'c.tar.gz')
+        except ftplib.error_temp:
+            pass
+        else:
+            raise AssertionError("kļūda pēc visiem mēģinājumiem netika izmesta")
+        assert not (workdir / 'c.tar.gz').exists()
+        print("✅ Atkārtojumi un jauni savienojumi")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_idle_connection_replaced():
+    """Ilgi neizmantots, serverī aizvērts savienojums tiek aizstāts"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        pool = FTPConnectionPool('localhost', size=1, backoff=0, idle_timeout=0, factory=LocalFTP)
+        path = next(iter(FILES))
+        pool.retrieve(path, workdir / 'a.tar.gz')
+        ftp, _ = pool._idle.queue[0]
+        ftp.closed = True
+        time.sleep(0.01)
+        pool.retrieve(path, workdir / 'b.tar.gz')
+        assert pool.connections_opened == 2
+        print("✅ Neaktīvs savienojums")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_resume_and_verify():
+    """Pārtraukta lejupielāde turpinās no saņemtā baita; bojāts gzip netiek pieņemts"""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        path = list(FILES)[3]
+        failures = {path: [EOFError(), ftplib.error_temp('450 Aizņemts')]}
+        connections = []
+
+        def factory(host, timeout=None):
+            connections.append(LocalFTP(host, timeout, failures))
+            return connections[-1]
+
+        pool = FTPConnectionPool('localhost', size=1, backoff=0, factory=factory)
+        part = workdir / 'a.tar.gz.part'
+        assert pool.retrieve(path, part, resume=True, expected_size=len(FILES[path])) == len(FILES[path])
+        assert part.read_bytes() == FILES[path]
+        assert [offset for ftp in connections for offset in ftp.offsets] == [None, 10, 20]
+
+        # Jau pilnībā saņemts fails netiek lejupielādēts vēlreiz
+        assert pool.retrieve(path, part, resume=True, expected_size=len(FILES[path])) == len(FILES[path])
+        assert sum(len(ftp.offsets) for ftp in connections) == 3
+
+        archive = workdir / 'b.tar.gz'
+        archive.write_bytes(gzip.compress(b'x' * 5000))
+        assert len(verify_archive(archive, archive.stat().st_size)) == 64
+        for broken in (archive.read_bytes()[:-6], archive.read_bytes()[:-8] + b'\0' * 8):
+            archive.write_bytes(broken)
+            try:
+                verify_archive(archive)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("bojāts arhīvs netika atpazīts")
+        print("✅ Turpināta lejupielāde un pārbaude")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_parallel_retrieve()
+    test_retries_and_reconnect()
+    test_idle_connection_replaced()
+    test_resume_and_verify()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Testē latviešu celmu meklēšanas režīmu
+"""
+
+from local_procurement_searcher import OptimizedLocalSearcher
+from latvian_stemmer import stem
+
+FORMS = [
+    ['sports', 'sporta', 'sportam', 'sportu'],
+    ['skola', 'skolas', 'skolām', 'skolai', 'skolu'],
+    ['ceļš', 'ceļa', 'ceļu', 'ceļiem'],
+    ['pašvaldība', 'pašvaldības', 'pašvaldībām'],
+    ['zaļš', 'zaļā', 'zaļajiem', 'zaļajai'],
+    ['ūdens', 'ūdeni', 'ūdenim'],
+]
+
+
+def make_searcher(keywords, exclude_keywords=()):
+    """Meklētājs celmu režīmā"""
+    searcher = OptimizedLocalSearcher(config={'parse_cache': False, 'keyword_matcher': 'stem'})
+    searcher.search_criteria = {'keywords': list(keywords), 'exclude_keywords': list(exclude_keywords)}
+    return searcher
+
+
+def test_inflections_share_stem():
+    """Viena vārda locījumiem ir viens celms"""
+    searcher = make_searcher([])
+    for forms in FORMS:
+        stems = {stem(searcher.normalize_latvian_text(form)) for form in forms}
+        assert len(stems) == 1, (forms, stems)
+        print(f"✅ {', '.join(forms)} -> {stems.pop()}")
+
+
+def test_stem_matcher():
+    """Vienam vārdam - celmu kopa, frāzei - celmu secība"""
+    searcher = make_searcher(['ceļš', 'sporta inventārs', 'zaļš'], exclude_keywords=['remonts'])
+    criteria = searcher.get_compiled_criteria()
+
+    assert criteria.matched_keywords('Ceļu uzturēšana') == ['ceļš']
+    assert criteria.matched_keywords('SPORTA un fitnesa INVENTĀRA iegāde') == ['sporta inventārs']
+    assert criteria.matched_keywords('Inventārs sportam') == []
+    assert criteria.matched_keywords('Zaļajiem ceļiem') == ['ceļš', 'zaļš']
+    assert criteria.matched_keywords('Celtniecība') == []
+    assert criteria.is_excluded('Ceļa remonta darbi')
+    assert searcher._text_contains_keyword('Ceļiem', 'ceļš')
+    print("✅ Celmu režīms")
+
+
+if __name__ == "__main__":
+    test_inflections_share_stem()
+    test_stem_matcher()
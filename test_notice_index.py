@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Testē pilna teksta indeksu - kandidātu atlase nedrīkst zaudēt rezultātus
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from local_procurement_searcher import LokalaisMekletajs, ImprovedXMLParser
+from notice_index import NoticeIndex, INDEX_FILE_NAME
+from test_prefilter import CRITERIA, make_corpus
+
+
+def index_all(workdir):
+    """Indeksē visas korpusa mapes"""
+    index = NoticeIndex(Path(workdir) / INDEX_FILE_NAME, ImprovedXMLParser())
+    for folder in sorted(Path(workdir).iterdir()):
+        if folder.is_dir():
+            index.index_folder(folder)
+    return index
+
+
+def run(workdir, end_date, criteria, use_index, matcher):
+    """Meklē datumu diapazonā ar vai bez indeksa"""
+    config = {'parse_cache': False, 'parallel_mode': 'thread', 'prefilter': False,
+              'keyword_matcher': matcher, 'fulltext_index': use_index}
+    searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+    searcher.search_criteria = dict(criteria, statuses=['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS'])
+    return searcher.search_date_range_parallel('2025-04-01', end_date)
+
+
+def check_same_results(matcher):
+    """Ar un bez indeksa rezultāti ir vienādi"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = make_corpus(workdir)
+        index_all(workdir)
+        for criteria in CRITERIA:
+            slow = run(workdir, end_date, criteria, use_index=False, matcher=matcher)
+            fast = run(workdir, end_date, criteria, use_index=True, matcher=matcher)
+            assert fast == slow, criteria
+            print(f"✅ {criteria}: {len(slow)} rezultāti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_same_results():
+    """Variāciju režīms"""
+    check_same_results('variants')
+
+
+def test_same_results_stem():
+    """Celmu režīms"""
+    check_same_results('stem')
+
+
+def test_incremental_update():
+    """Mainīti, jauni un dzēsti faili; novecojusi mape tiek pārbaudīta pilnībā"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = make_corpus(workdir)
+        index = index_all(workdir)
+        folder = Path(workdir) / '01_04_2025'
+        searcher = LokalaisMekletajs(config={'parse_cache': False, 'prefilter': False}, xml_dir=workdir)
+        searcher.search_criteria = {'keywords': ['šķēps']}
+        searcher.get_compiled_criteria()
+        query = searcher._index_query
+
+        # Tikai cp1257.xml (lxml to lasa kā UTF-8 un šķēpu neatrod)
+        assert index.candidates(query) <= {os.path.abspath(folder / 'cp1257.xml')}
+        assert index.index_folder(folder) == 0
+
+        template = Path('768142.xml').read_text(encoding='utf-8')
+        (folder / 'new.xml').write_text(template.replace('Akumulatoru piegāde', 'Šķēpu metēji'),
+                                        encoding='utf-8')
+        (folder / 'cp1257.xml').unlink()
+
+        # Indekss vēl nav atjaunots - mape tiek pārbaudīta pilnībā
+        xml_files = list(folder.glob('*.xml'))
+        assert not index.is_current(folder, len(xml_files))
+        filtered = searcher.filter_with_index([('2025-04-01', xml_files)], '2025-04-01', end_date)
+        assert filtered == [('2025-04-01', xml_files)]
+
+        assert index.index_folder(folder) == 1
+        assert index.is_current(folder, len(xml_files))
+        assert index.candidates(query) == {os.path.abspath(folder / 'new.xml')}
+        filtered = searcher.filter_with_index([('2025-04-01', xml_files)], '2025-04-01', end_date)
+        assert filtered == [('2025-04-01', [folder / 'new.xml'])]
+
+        # Datumu diapazons un mapes dzēšana
+        assert index.candidates(query, '2025-04-02', end_date) == set()
+        assert index.prune_folder(folder) == len(xml_files)
+        assert index.candidates(query) == set()
+        print("✅ Indekss tiek atjaunots pa failiem")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_same_results()
+    test_same_results_stem()
+    test_incremental_update()
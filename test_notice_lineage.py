@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Testē paziņojumu versiju ķēdes - viena rinda katram iepirkumam
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from local_procurement_searcher import ImprovedXMLParser, LokalaisMekletajs
+from notice_index import INDEX_FILE_NAME, NoticeIndex
+from test_notice_index import index_all
+
+# (mape, paziņojuma numurs, iepriekšējais paziņojums, iepirkuma kods, nosaukums)
+NOTICES = [
+    ('01_04_2025', '1001', '', 'A-1', 'Akumulatoru piegāde'),
+    ('02_04_2025', '1002', '1001', 'A-1', 'Akumulatoru piegāde'),
+    ('03_04_2025', '1003', '1002', 'A-1', 'Ceļa remontdarbi'),
+    ('01_04_2025', '2001', '', '', 'Akumulatoru piegāde'),
+    ('03_04_2025', '2002', '2001', '', 'Akumulatoru piegāde'),
+    ('02_04_2025', '3001', '', 'B-7', 'Akumulatoru noma'),
+    # Divi paziņojumi bez koda, kods parādās tikai trešajā
+    ('01_04_2025', '5001', '', '', 'Akumulatoru uzlāde'),
+    ('02_04_2025', '5002', '5001', '', 'Akumulatoru uzlāde'),
+    ('03_04_2025', '5003', '5002', 'C-9', 'Akumulatoru uzlāde'),
+]
+
+
+def make_chain(workdir):
+    """Viena iepirkuma paziņojumi vairākās dienu mapēs"""
+    template = Path(__file__).with_name('768142.xml').read_text(encoding='utf-8')
+    for folder, number, source, code, title in NOTICES:
+        day, month, year = folder.split('_')
+        content = (template
+                   .replace('<id>768142</id>', f'<id>{number}</id>')
+                   .replace('<source_notice>766984</source_notice>', f'<source_notice>{source}</source_notice>')
+                   .replace('LDZ 2025/39-SPAV', code)
+                   .replace('Akumulatoru piegāde', title)
+                   .replace('<publication_date>01/07/2025', f'<publication_date>{day}/{month}/{year}'))
+        path = Path(workdir) / folder / f'{number}.xml'
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+
+
+def search(workdir, lineage):
+    """Meklē ar vai bez versiju indeksa"""
+    config = {'parse_cache': False, 'parallel_mode': 'thread', 'notice_lineage': lineage, 'fulltext_index': False}
+    searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+    searcher.search_criteria = {'keywords': ['akumulators'], 'statuses': ['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS']}
+    return searcher, searcher.search_date_range_parallel('2025-04-01', '2025-04-03')
+
+
+def test_one_row_per_procurement():
+    """Jaunākā atrastā versija, versiju skaits un vēsture no indeksa"""
+    workdir = tempfile.mkdtemp()
+    try:
+        make_chain(workdir)
+        index_all(workdir)
+
+        searcher, results = search(workdir, lineage=True)
+        by_key = {result['procurement_key']: result for result in results}
+        assert sorted(by_key) == ['A-1', 'B-7', 'C-9', 'notice:2001']
+
+        chain = by_key['A-1']
+        assert chain['notice_number'] == '1002' and chain['matched_versions'] == 2
+        assert chain['versions'] == 3
+        assert chain['latest_version']['notice_number'] == '1003'
+        assert by_key['notice:2001']['notice_number'] == '2002'
+        assert by_key['C-9']['notice_number'] == '5003' and by_key['C-9']['matched_versions'] == 3
+        assert [version['notice_number'] for version in searcher.procurement_history('C-9')] == \
+               ['5001', '5002', '5003']
+
+        history = searcher.procurement_history('A-1')
+        assert [version['notice_number'] for version in history] == ['1001', '1002', '1003']
+        assert [version['xml_file'] for version in history] == ['1001.xml', '1002.xml', '1003.xml']
+
+        # Bez indeksa - tās pašas rindas no paziņojumu laukiem
+        _, plain = search(workdir, lineage=False)
+        assert [(result['procurement_key'], result['notice_number']) for result in plain] == \
+               [(result['procurement_key'], result['notice_number']) for result in results]
+        print(f"✅ {len(results)} iepirkumi no {len(NOTICES)} paziņojumiem")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_prune_removes_versions():
+    """Dzēstas mapes versijas pazūd no vēstures"""
+    workdir = tempfile.mkdtemp()
+    try:
+        make_chain(workdir)
+        index = index_all(workdir)
+        index.prune_folder(Path(workdir) / '01_04_2025')
+        assert [version['notice_number'] for version in index.history('A-1')] == ['1002', '1003']
+        assert [version['notice_number'] for version in index.history('notice:2001')] == ['2002']
+        print("✅ Vēsture pēc mapes dzēšanas")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_successor_indexed_first():
+    """Mapes indeksētas apgrieztā secībā - pēcteči pievienojas vēlāk indeksētajiem priekštečiem"""
+    workdir = tempfile.mkdtemp()
+    try:
+        make_chain(workdir)
+        index = NoticeIndex(Path(workdir) / INDEX_FILE_NAME, ImprovedXMLParser())
+        for folder in sorted(Path(workdir).iterdir(), reverse=True):
+            index.index_folder(folder)
+
+        assert [version['notice_number'] for version in index.history('A-1')] == ['1001', '1002', '1003']
+        assert [version['notice_number'] for version in index.history('C-9')] == ['5001', '5002', '5003']
+        assert [version['notice_number'] for version in index.history('notice:2001')] == ['2001', '2002']
+        assert index.history('notice:5001') == [] and index.history('notice:1002') == []
+        print("✅ Pēctecis indeksēts pirms priekšteča")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_one_row_per_procurement()
+    test_prune_removes_versions()
+    test_successor_indexed_first()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Testē dienu kolonnu momentuzņēmumus - maskām jāsakrīt ar _matches_criteria
+"""
+
+import itertools
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+from benchmark_search import build_corpus
+from contract_value import notice_value_cents
+from deadline_index import deadline_epoch_day
+from local_procurement_searcher import (LokalaisMekletajs, ImprovedXMLParser, PARSER_VERSION,
+                                        new_notice_info)
+import notice_snapshot
+from notice_snapshot import SnapshotSet, NoticeSnapshot, load_snapshot, snapshot_path, write_snapshot
+
+try:
+    import numpy
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+FIELD_VALUES = {
+    'status': ['', 'IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS', 'PĀRTRAUKTS'],
+    'procedure_type': ['', 'Atklāts konkurss', 'Sarunu procedūra'],
+    'procedure_category': ['virs_es', 'zem_es', 'cits'],
+    'notice_type': ['sps_iv_results', 'notice_contract', ''],
+    'value': ['', '4790.4', '150000', '12 500,50', 'nav'],
+    'currency_code': ['', 'EUR', 'LVL'],
+    'deadline': ['', '2020-01-01', '2099-12-31', '31/12/2099'],
+    'contracting_authority': ['Rīgas pilsētas pašvaldība', 'Ogres sporta centrs', 'VAS "Latvijas dzelzceļš"', ''],
+}
+
+CRITERIA = [
+    {},
+    {'statuses': ['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS']},
+    {'deadline_status': 'active'},
+    {'deadline_status': 'expired', 'statuses': ['PĀRTRAUKTS']},
+    {'procedure_types': ['Atklāts konkurss']},
+    {'procedure_categories': ['virs_es', 'zem_es'], 'notice_types': ['notice_contract']},
+    {'min_value': 5000},
+    {'min_value': 1000, 'max_value': 20000, 'deadline_status': 'active'},
+    {'min_value': '4790.40', 'max_value': 4790.4},
+    {'contracting_authorities': ['pašvaldīb', 'SPORTA CENTR'], 'statuses': ['IZSLUDINĀTS']},
+]
+
+
+def make_days(workdir, days=3, per_day=40, seed=3):
+    """Dienu mapes ar tukšiem XML failiem un sintētiskām vārdnīcām"""
+    rng = random.Random(seed)
+    notices = {}
+    for day in range(days):
+        folder = Path(workdir) / f'0{day + 1}_04_2025'
+        folder.mkdir()
+        for n in range(per_day):
+            xml_path = folder / f'{day}{n:03d}.xml'
+            xml_path.write_text('<notice/>', encoding='utf-8')
+            info = new_notice_info()
+            info.update({field: rng.choice(values) for field, values in FIELD_VALUES.items()})
+            info['value_cents'] = notice_value_cents(info)
+            info['deadline_day'] = deadline_epoch_day(info['deadline'])
+            info['title'] = f'Paziņojums {day}-{n}'
+            notices[str(xml_path)] = info
+        write_snapshot(workdir, folder, notices.__getitem__)
+    return notices
+
+
+def check_masks(use_numpy):
+    """Maska katrai rindai sakrīt ar _matches_criteria (show_all - tikai lauku filtri)"""
+    workdir = tempfile.mkdtemp()
+    saved = notice_snapshot.USE_NUMPY
+    notice_snapshot.USE_NUMPY = use_numpy
+    try:
+        notices = make_days(workdir)
+        folders = sorted(path for path in Path(workdir).iterdir() if path.name != 'snapshots')
+        snapshots = [NoticeSnapshot(snapshot_path(workdir, folder)) for folder in folders]
+        snapshot_set = SnapshotSet(snapshots)
+        searcher = LokalaisMekletajs(config={'parse_cache': False}, xml_dir=workdir)
+
+        for criteria in CRITERIA:
+            searcher.search_criteria = dict(criteria, show_all=True)
+            authorities = searcher.get_compiled_criteria().authorities
+            mask = list(snapshot_set.mask(searcher.search_criteria, authorities=authorities))
+            expected = [searcher._matches_criteria(dict(notices[str(folder / snapshot.text('file', row))]), '')
+                        for folder, snapshot in zip(folders, snapshots) for row in range(snapshot.rows)]
+            assert [bool(value) for value in mask] == expected, criteria
+
+            rows = snapshot_set.surviving(mask)
+            assert sum(len(day_rows) for day_rows in rows) == sum(expected)
+            for folder, snapshot, day_rows in zip(folders, snapshots, rows):
+                for row in day_rows:
+                    assert snapshot.notice(row) == notices[str(folder / snapshot.text('file', row))]
+            print(f"✅ {criteria}: {sum(expected)} no {len(expected)}")
+    finally:
+        notice_snapshot.USE_NUMPY = saved
+        shutil.rmtree(workdir)
+
+
+def test_masks_python():
+    """Maskas ar Python sarakstiem (bez NumPy)"""
+    check_masks(use_numpy=False)
+
+
+def test_masks_numpy():
+    """Maskas ar NumPy masīviem (tiek izlaists, ja NumPy nav instalēts)"""
+    if not HAVE_NUMPY:
+        print("⏭️ NumPy nav instalēts - tests izlaists")
+        return
+    check_masks(use_numpy=True)
+
+
+def test_search_with_snapshots():
+    """Meklēšana ar momentuzņēmumiem atgriež tos pašus rezultātus; novecojis netiek izmantots"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = build_corpus(workdir, days=3, per_day=12)
+        parser = ImprovedXMLParser()
+        folders = sorted(path for path in Path(workdir).iterdir() if path.is_dir())
+        for folder in folders:
+            write_snapshot(workdir, folder, parser.parse_xml_comprehensive, PARSER_VERSION)
+
+        for criteria, matcher in itertools.product(
+                [{'keywords': ['akumulators']}, {'keywords': ['sporta'], 'min_value': 5000},
+                 {'keywords': [], 'cpv_codes': ['31400000']}, {'show_all': True}],
+                ['variants', 'stem']):
+            results = []
+            for use_snapshots in (False, True):
+                config = {'parse_cache': False, 'parallel_mode': 'thread', 'keyword_matcher': matcher,
+                          'snapshots': use_snapshots}
+                searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+                searcher.search_criteria = dict(criteria, statuses=['IZSLUDINĀTS'])
+                results.append(searcher.search_date_range_parallel('2025-04-01', end_date))
+            assert results[0] == results[1], criteria
+            print(f"✅ {criteria} ({matcher}): {len(results[1])} rezultāti")
+
+        # JSON vārdnīcas tiek atjaunotas tikai rindām, kas atbilst atslēgvārdiem
+        decoded = []
+        notice = NoticeSnapshot.notice
+        NoticeSnapshot.notice = lambda self, row: decoded.append(row) or notice(self, row)
+        try:
+            searcher = LokalaisMekletajs(config={'parse_cache': False, 'parallel_mode': 'thread'}, xml_dir=workdir)
+            searcher.search_criteria = {'keywords': ['akumulators'], 'statuses': ['IZSLUDINĀTS']}
+            results = searcher.search_date_range_parallel('2025-04-01', end_date)
+        finally:
+            NoticeSnapshot.notice = notice
+        assert results and len(decoded) == len(results)
+
+        # Jauns fails mapē - momentuzņēmums vairs nav aktuāls
+        shutil.copy(folders[0] / '000000.xml', folders[0] / 'copy.xml')
+        assert load_snapshot(workdir, folders[0], 12, PARSER_VERSION) is None
+        assert load_snapshot(workdir, folders[1], 12, PARSER_VERSION) is not None
+        assert load_snapshot(workdir, folders[1], 12, 'cits') is None
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_masks_python()
+    test_masks_numpy()
+    test_search_with_snapshots()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Testē parsēšanas kešatmiņu - trāpījumi, invalidācija un tīrīšana
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from local_procurement_searcher import ImprovedXMLParser, PARSER_VERSION
+from parse_cache import ParseCache
+
+
+def make_workdir():
+    """Pagaidu mape ar 768142.xml kopiju"""
+    workdir = Path(tempfile.mkdtemp())
+    folder = workdir / '01.07.2025'
+    folder.mkdir()
+    shutil.copy('768142.xml', folder / '768142.xml')
+    return workdir, folder / '768142.xml'
+
+
+def test_hit_and_miss():
+    """Pirmā reize parsē, otrā atgriež kešoto rezultātu"""
+    workdir, xml_path = make_workdir()
+    try:
+        cache = ParseCache(workdir / 'parse_cache.db', PARSER_VERSION)
+        parser = ImprovedXMLParser()
+
+        first = cache.get_or_parse(xml_path, parser.parse_xml_comprehensive)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        # Jauns savienojums - kešatmiņa saglabājas starp palaišanām
+        cache = ParseCache(workdir / 'parse_cache.db', PARSER_VERSION)
+        second = cache.get_or_parse(xml_path, lambda path: None)
+        assert (cache.hits, cache.misses) == (1, 0)
+        assert second == first
+        assert second['title'] == 'Akumulatoru piegāde'
+        print(f"✅ Kešatmiņas trāpījums: {second['id']}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_invalidation():
+    """Mainīts saturs invalidē ierakstu, tikai mtime maiņa - nē"""
+    workdir, xml_path = make_workdir()
+    try:
+        cache = ParseCache(workdir / 'parse_cache.db', PARSER_VERSION)
+        cache.put(xml_path, {'title': 'veca'})
+
+        # Tas pats saturs ar jaunu mtime (piem. atkārtoti atarhivēts)
+        stat = os.stat(xml_path)
+        os.utime(xml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.get(xml_path) == {'title': 'veca'}
+
+        # Cits saturs
+        content = xml_path.read_text(encoding='utf-8')
+        xml_path.write_text(content.replace('Akumulatoru', 'Bateriju'), encoding='utf-8')
+        assert cache.get(xml_path) is None
+
+        # Cita parsētāja versija
+        cache.put(xml_path, {'title': 'jauna'})
+        assert ParseCache(workdir / 'parse_cache.db', 'cita').get(xml_path) is None
+        print("✅ Novecojuši ieraksti netiek atgriezti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_prune_folder():
+    """Dzēšot mapi, tās ieraksti tiek izņemti no kešatmiņas"""
+    workdir, xml_path = make_workdir()
+    try:
+        cache = ParseCache(workdir / 'parse_cache.db', PARSER_VERSION)
+        cache.put(xml_path, {'title': 'a'})
+        cache.put(xml_path, {'xml_id': '768142'}, kind='scan')
+
+        assert cache.prune_folder(xml_path.parent) == 2
+        assert cache.get(xml_path) is None
+        assert cache.get(xml_path, kind='scan') is None
+        print("✅ Mapes ieraksti dzēsti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_hit_and_miss()
+    test_invalidation()
+    test_prune_folder()
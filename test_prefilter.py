@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Testē neparsētu baitu priekšfiltru - tas nedrīkst atmest nevienu atbilstošu failu
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from local_procurement_searcher import LokalaisMekletajs
+from benchmark_search import build_corpus
+
+# Sarežģītāki gadījumi: lielie burti, rakstzīmju atsauces, CDATA, cits kodējums
+SPECIAL_TITLES = {
+    'upper.xml': 'SPORTA INVENTĀRA PIEGĀDE SKOLĀM',
+    'charref.xml': 'Akumul&#257;toru piegāde',
+    'cdata.xml': '<![CDATA[Ceļu remontdarbi & uzturēšana]]>',
+    'longs.xml': 'Datortehnikaſ noma',
+}
+
+CRITERIA = [
+    {'keywords': ['akumulators']},
+    {'keywords': ['AKUMULĀTORU']},
+    {'keywords': ['sporta inventārs']},
+    {'keywords': ['ceļš', 'noma']},
+    {'keywords': ['remontdarbs uzturēšana']},
+    {'keywords': ['dzelzceļš']},
+    {'keywords': ['šķēps']},
+    {'keywords': [], 'cpv_codes': ['31400000-4']},
+    {'keywords': ['šķēps'], 'cpv_codes': ['45000000']},
+    {'keywords': ['piegāde'], 'exclude_keywords': ['sporta']},
+]
+
+
+def make_corpus(workdir):
+    """Sintētiskais korpuss un īpašie faili pirmās dienas mapē"""
+    end_date = build_corpus(workdir, days=2, per_day=8)
+    folder = Path(workdir) / '01_04_2025'
+    template = Path('768142.xml').read_text(encoding='utf-8')
+    for name, title in SPECIAL_TITLES.items():
+        (folder / name).write_text(template.replace('Akumulatoru piegāde', title), encoding='utf-8')
+
+    content = template.replace('Akumulatoru piegāde', 'Šķēpu iegāde').replace('UTF-8', 'windows-1257')
+    (folder / 'cp1257.xml').write_bytes(content.encode('cp1257', errors='replace'))
+    return end_date
+
+
+def run(workdir, end_date, criteria, prefilter, matcher='variants'):
+    """Meklē ar abiem ceļiem (process_xml_batch un search_xml)"""
+    config = {'parse_cache': False, 'parallel_mode': 'thread', 'prefilter': prefilter,
+              'keyword_matcher': matcher}
+    searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+    searcher.search_criteria = dict(criteria, statuses=['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS'])
+
+    batch_results = searcher.search_date_range_parallel('2025-04-01', end_date)
+    xml_results = []
+    for xml_path in sorted(Path(workdir).rglob('*.xml')):
+        searcher.processed_ids.clear()
+        xml_results.extend(searcher.search_xml(str(xml_path)))
+    return batch_results, xml_results, searcher.get_prefilter()
+
+
+def check_no_false_negatives(matcher):
+    """Ar un bez priekšfiltra rezultāti ir vienādi"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = make_corpus(workdir)
+        rejected = 0
+        for criteria in CRITERIA:
+            slow = run(workdir, end_date, criteria, prefilter=False, matcher=matcher)
+            fast = run(workdir, end_date, criteria, prefilter=True, matcher=matcher)
+            assert fast[0] == slow[0], criteria
+            assert fast[1] == slow[1], criteria
+            rejected += fast[2].rejected
+            print(f"✅ {criteria}: {len(slow[0])}/{len(slow[1])} rezultāti, atmesti {fast[2].rejected}")
+
+        assert rejected > 0
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_no_false_negatives():
+    """Variāciju režīms"""
+    check_no_false_negatives('variants')
+
+
+def test_no_false_negatives_stem():
+    """Celmu režīms"""
+    check_no_false_negatives('stem')
+
+
+def test_uncertain_files_pass():
+    """Rakstzīmju atsauces un cits kodējums vienmēr tiek palaisti tālāk"""
+    searcher = LokalaisMekletajs(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': ['šķēps']}
+    prefilter = searcher.get_prefilter()
+
+    assert not prefilter.may_match_bytes('<name>Akumulatori</name>'.encode('utf-8'))
+    assert prefilter.may_match_bytes('<name>ŠĶĒPI</name>'.encode('utf-8'))
+    assert prefilter.may_match_bytes(b'<name>&#352;&#311;&#275;pi</name>')
+    assert prefilter.may_match_bytes('<?xml version="1.0" encoding="windows-1257"?><name>x</name>'.encode('cp1257'))
+    assert prefilter.may_match_bytes(b'\xff\xfe<\x00n\x00')
+    print("✅ Neskaidri faili netiek atmesti")
+
+
+if __name__ == "__main__":
+    test_no_false_negatives()
+    test_no_false_negatives_stem()
+    test_uncertain_files_pass()
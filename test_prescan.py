@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Testē search_xml priekšskenēšanu - viens koka gājiens un viena faila nolasīšana
+"""
+
+import os
+import re
+import tempfile
+
+from local_procurement_searcher import LokalaisMekletajs, ImprovedXMLParser
+from benchmark_parser import WalkCounter
+from test_field_plans import TED_XML
+
+STATUS_XML = """<document>
+  <authority_id>90000000001</authority_id>
+  <notice_status>draft</notice_status>
+  <procurement_status>Contract awarded</procurement_status>
+  <name>Skolas <b>sporta</b> zāles remonts</name>
+  <cpv_list><code>45000000-7</code><code>45000000-7</code></cpv_list>
+</document>
+"""
+
+
+def make_searcher(criteria):
+    """Meklētājs bez kešatmiņas ar dotajiem kritērijiem"""
+    searcher = LokalaisMekletajs(config={'parse_cache': False})
+    searcher.search_criteria = criteria
+    return searcher
+
+
+def separate_scan(searcher, root):
+    """Priekšskenēšana ar atsevišķiem gājieniem (iepriekšējā search_xml loģika)"""
+    text_parts = []
+    cpv_codes = []
+    for elem in root.iter():
+        if elem.text and elem.text.strip():
+            text_parts.append(elem.text.strip())
+            if re.match(r'^\d{8}(-\d)?$', elem.text.strip()):
+                clean_cpv = elem.text.strip().split('-')[0]
+                if clean_cpv not in cpv_codes:
+                    cpv_codes.append(clean_cpv)
+        if elem.tail and elem.tail.strip():
+            text_parts.append(elem.tail.strip())
+    return {
+        'xml_id': searcher.extract_xml_id(root),
+        'status': searcher.extract_status(root),
+        'text': ' '.join(text_parts),
+        'cpv_codes': cpv_codes
+    }
+
+
+def test_fused_scan_matches_separate_walks():
+    """Viena gājiena rezultāts sakrīt ar atsevišķajiem gājieniem"""
+    searcher = make_searcher({})
+    parser = ImprovedXMLParser()
+
+    for content in (open('768142.xml', encoding='utf-8').read(), TED_XML, STATUS_XML):
+        with tempfile.NamedTemporaryFile('w', suffix='.xml', encoding='utf-8', delete=False) as f:
+            f.write(content)
+        try:
+            root = parser.load_root(f.name)
+        finally:
+            os.unlink(f.name)
+
+        counter = WalkCounter(root)
+        scan = searcher.scan_root(counter)
+        assert counter.walks == 1
+        assert scan == separate_scan(searcher, root)
+        print(f"✅ {scan['xml_id']}: {scan['status']}, CPV {scan['cpv_codes']}")
+
+
+def test_search_reads_file_once():
+    """Atbilstošam paziņojumam fails tiek nolasīts tikai vienreiz"""
+    searcher = make_searcher({'keywords': ['akumulators'], 'statuses': ['LĪGUMS NOSLĒGTS', 'IZSLUDINĀTS']})
+    loads = []
+    load_root = searcher.parser.load_root
+    searcher.parser.load_root = lambda path: loads.append(path) or load_root(path)
+
+    results = searcher.search_xml('768142.xml')
+    assert len(results) == 1
+    assert loads == ['768142.xml']
+
+    expected = ImprovedXMLParser().parse_xml_comprehensive('768142.xml')
+    assert all(results[0][key] == value for key, value in expected.items() if key != 'status')
+    print(f"✅ {results[0]['title']} - nolasīts {len(loads)} reizi")
+
+
+if __name__ == "__main__":
+    test_fused_scan_matches_separate_walks()
+    test_search_reads_file_once()
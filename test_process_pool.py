@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Testē procesu režīmu - rezultātiem jāsakrīt ar pavedienu režīmu
+"""
+
+import shutil
+import tempfile
+
+from local_procurement_searcher import (OptimizedLocalSearcher, ImprovedXMLParser,
+                                        compact_notice, expand_notice)
+from benchmark_search import build_corpus
+
+
+def search(xml_dir, mode, end_date):
+    """Meklē sintētiskajā korpusā norādītajā režīmā"""
+    config = {
+        'search_criteria': {'keywords': ['akumulators'], 'cpv_codes': []},
+        'parallel_mode': mode,
+        'parse_cache': False
+    }
+    searcher = OptimizedLocalSearcher(config=config, xml_dir=xml_dir)
+    searcher.num_workers = 2
+    searcher.batch_size = 7
+    return searcher.search_date_range_parallel('2025-04-01', end_date)
+
+
+def test_compact_roundtrip():
+    """Kompaktais rezultāts atjaunojas par to pašu vārdnīcu"""
+    info = ImprovedXMLParser().parse_xml_comprehensive('768142.xml')
+    info['date'] = '2025-07-01'
+
+    compact = compact_notice(info)
+    assert len(compact) < len(info)
+    assert 'lots' not in compact
+    assert expand_notice(compact) == info
+    print(f"✅ Kompakts rezultāts: {len(compact)} no {len(info)} laukiem")
+
+
+def test_process_matches_thread():
+    """Procesu un pavedienu režīms atrod tos pašus paziņojumus"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = build_corpus(workdir, days=3, per_day=20)
+        thread_results = search(workdir, 'thread', end_date)
+        process_results = search(workdir, 'process', end_date)
+
+        assert len(thread_results) == 15  # Katrs ceturtais virsraksts
+        assert process_results == thread_results
+        assert process_results[0]['matched_keywords'] == ['akumulators']
+        print(f"✅ Procesu režīms: {len(process_results)} rezultāti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_compact_roundtrip()
+    test_process_matches_thread()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Testē BM25 vērtējumu, indeksa statistiku un lapošanu ar kursoru
+"""
+
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+from benchmark_search import build_corpus
+from local_procurement_searcher import LokalaisMekletajs, ImprovedXMLParser
+from relevance import CorpusStats, bm25_score, field_stems, query_stems, rank_key, rank_page
+from test_notice_index import index_all
+
+
+def test_title_boost():
+    """Atslēgvārds nosaukumā vērtēts augstāk nekā aprakstā; biežāks celms - zemāk"""
+    docs = [
+        field_stems({'title': 'Akumulatoru piegāde', 'description': 'Piegāde Rīgā'}),
+        field_stems({'title': 'Piegāde', 'description': 'Akumulatori un piegāde'}),
+        field_stems({'title': 'Sporta inventārs', 'description': 'Bumbu piegāde'}),
+    ]
+    terms = query_stems(['akumulators'])
+    stats = CorpusStats.from_documents(docs, terms)
+    scores = [bm25_score(doc, terms, stats) for doc in docs]
+    assert scores[0] > scores[1] > scores[2] == 0
+
+    terms = query_stems(['akumulators', 'piegāde'])
+    stats = CorpusStats.from_documents(docs, terms)
+    assert stats.idf('akumulator') > stats.idf('piegad')
+    print("✅ Nosaukuma svars un idf")
+
+
+def test_pages_match_full_sort():
+    """Lapas pēc kārtas sakrīt ar pilnībā sakārtotu sarakstu"""
+    rng = random.Random(8)
+    results = [{'score': rng.choice([0.0, 1.5, 2.25, rng.random()]), 'date': f'2025-04-0{rng.randint(1, 9)}',
+                'xml_file': f'{n}.xml'} for n in range(237)]
+    expected = sorted(results, key=rank_key)
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = rank_page(results, limit=20, cursor=cursor)
+        pages.extend(page)
+        if cursor is None:
+            break
+    assert pages == expected
+
+    # Vērtējums aprēķināts atlases laikā
+    scores = {result['xml_file']: result['score'] for result in results}
+    unscored = [{'date': result['date'], 'xml_file': result['xml_file']} for result in results]
+    page, cursor = rank_page(unscored, limit=20, score=lambda result: scores[result['xml_file']])
+    assert page == expected[:20] and rank_page(results, limit=20, cursor=cursor)[0] == expected[20:40]
+
+    for kwargs in ({'cursor': 'nav-kursors'}, {'limit': 0}, {'limit': -5}):
+        try:
+            rank_page(results, **kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"nederīgi parametri: {kwargs}")
+    print(f"✅ {len(pages)} rezultāti lapās")
+
+
+def test_index_stats():
+    """Indeksa statistika sakrīt ar statistiku no visiem paziņojumiem"""
+    workdir = tempfile.mkdtemp()
+    try:
+        build_corpus(workdir, days=2, per_day=8)
+        index = index_all(workdir)
+        parser = ImprovedXMLParser()
+        docs = [field_stems(parser.parse_xml_comprehensive(str(path))) for path in sorted(Path(workdir).rglob('*.xml'))]
+
+        terms = query_stems(['akumulators', 'sporta', 'dzelzceļš', 'nekas'])
+        stats = index.rank_stats(terms)
+        expected = CorpusStats.from_documents(docs, terms)
+        assert stats.docs == expected.docs == 16
+        assert stats.doc_freq == expected.doc_freq
+        for field, length in expected.avg_lengths.items():
+            assert abs(stats.avg_lengths[field] - length) < 1e-9
+
+        # Meklēšana - lapas sakrīt ar visiem rezultātiem pēc vērtējuma
+        criteria = {'keywords': ['akumulators', 'sporta'], 'statuses': ['IZSLUDINĀTS']}
+        searcher = LokalaisMekletajs(config={'parse_cache': False, 'parallel_mode': 'thread'}, xml_dir=workdir)
+        searcher.search_criteria = dict(criteria)
+        first = searcher.search_ranked('2025-04-01', '2025-04-02', limit=3)
+        second = searcher.search_ranked('2025-04-01', '2025-04-02', limit=3, cursor=first['next_cursor'])
+        everything = searcher.score_results(searcher.search_date_range_parallel('2025-04-01', '2025-04-02'))
+        assert len(everything) == 8 and first['total'] is None
+        assert first['results'] + second['results'] == sorted(everything, key=rank_key)[:6]
+        assert 'Akumulatoru' in first['results'][0]['title']
+
+        # Bez pilna teksta indeksa - visi rezultāti tiek novērtēti
+        plain = LokalaisMekletajs(config={'parse_cache': False, 'parallel_mode': 'thread', 'fulltext_index': False},
+                                  xml_dir=workdir)
+        plain.search_criteria = dict(criteria)
+        page = plain.search_ranked('2025-04-01', '2025-04-02', limit=3)
+        assert page['total'] == 8 and page['results'] == first['results']
+        try:
+            searcher.search_ranked('2025-04-01', '2025-04-02', limit=0)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("limit=0")
+        print(f"✅ Indeksa statistika, {len(everything)} rezultāti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_index_ranked_pages():
+    """Lapas no indeksa sakrīt ar pilnu meklēšanu; parsēti tikai lapas iepirkumi"""
+    workdir = tempfile.mkdtemp()
+    try:
+        build_corpus(workdir, days=6, per_day=20)
+        index_all(workdir)
+        criteria = {'keywords': ['akumulators', 'sporta', 'remonts'], 'statuses': ['IZSLUDINĀTS']}
+
+        searcher = LokalaisMekletajs(config={'parse_cache': False, 'parallel_mode': 'thread'}, xml_dir=workdir)
+        searcher.search_criteria = dict(criteria)
+        expected = sorted(searcher.score_results(searcher.search_date_range_parallel('2025-04-01', '2025-04-06')),
+                          key=rank_key)
+
+        parsed = []
+        process_xml_batch = searcher.process_xml_batch
+        searcher.process_xml_batch = lambda xml_files, date_str: parsed.extend(xml_files) or \
+            process_xml_batch(xml_files, date_str)
+        first = searcher.search_ranked('2025-04-01', '2025-04-06', limit=5)
+        assert first['results'] == expected[:5]
+        first_parsed = len(parsed)
+        assert first_parsed < len(expected)
+
+        pages, cursor = [], None
+        while True:
+            page = searcher.search_ranked('2025-04-01', '2025-04-06', limit=7, cursor=cursor)
+            pages.extend(page['results'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert pages == expected
+        print(f"✅ Lapa no indeksa: parsēti {first_parsed} no {len(expected)} rezultātiem")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_title_boost()
+    test_pages_match_full_sort()
+    test_index_stats()
+    test_index_ranked_pages()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Testē meklēšanas rezultātu kešu - LRU baitu robeža un datu paaudzes invalidācija
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from benchmark_search import build_corpus
+from local_procurement_searcher import LokalaisMekletajs
+from result_cache import DataGeneration, ResultCache, search_cache_key
+
+
+def test_cache_key_canonical():
+    """Statusu un CPV secība neietekmē atslēgu; atslēgvārdi un datumi - ietekmē"""
+    criteria = {'keywords': ['akumulators', 'sporta'], 'cpv_codes': ['37400000', '92600000'],
+                'statuses': ['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS']}
+    key = search_cache_key(criteria, '2025-04-01', '2025-04-02')
+    assert key == search_cache_key({'statuses': ['LĪGUMS NOSLĒGTS', 'IZSLUDINĀTS'],
+                                    'cpv_codes': ['92600000', '37400000'],
+                                    'keywords': ['akumulators', 'sporta']}, '2025-04-01', '2025-04-02')
+    assert key != search_cache_key(dict(criteria, keywords=['sporta', 'akumulators']), '2025-04-01', '2025-04-02')
+    # Atstarpe atslēgvārdā - frāze, nevis tas pats vaicājums
+    assert key != search_cache_key(dict(criteria, keywords=['akumulators ', 'sporta']), '2025-04-01', '2025-04-02')
+    assert key != search_cache_key(criteria, '2025-04-01', '2025-04-03')
+    assert criteria['statuses'] == ['IZSLUDINĀTS', 'LĪGUMS NOSLĒGTS']
+    print("✅ Atslēga")
+
+
+def test_lru_bytes_and_generation():
+    """Vecākie ieraksti tiek izmesti pēc baitiem; jauna paaudze padara ierakstus nederīgus"""
+    workdir = tempfile.mkdtemp()
+    try:
+        generation = DataGeneration(workdir)
+        assert generation.current() == 0
+        results = [{'title': 'x' * 100}]
+        size = len(b'[{"title": "' + b'x' * 100 + b'"}]')
+        cache = ResultCache(size * 2, generation)
+
+        assert cache.put('a', results) and cache.put('b', results)
+        assert cache.get('a') == results  # 'a' tagad ir jaunākais
+        cache.put('c', results)
+        assert cache.get('b') is None and cache.get('a') == results and cache.get('c') == results
+        assert not cache.put('liels', [{'title': 'x' * 1000}])
+
+        cache.get('a')[0]['title'] = 'mainīts'
+        assert cache.get('a') == results
+
+        assert generation.bump() == 1
+        assert DataGeneration(workdir).current() == 1
+        assert cache.get('a') is None
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (5, 2, 1)
+        assert stats['entries'] == 1 and stats['bytes'] == size and stats['generation'] == 1
+        print(f"✅ LRU: {stats}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_search_cached():
+    """Kešotie rezultāti sakrīt ar meklēšanu; pēc paaudzes maiņas meklē no jauna"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = build_corpus(workdir, days=2, per_day=6)
+        config = {'parse_cache': False, 'parallel_mode': 'thread', 'result_cache_mb': 1}
+        searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+        searcher.search_criteria = {'keywords': ['akumulators'], 'statuses': ['IZSLUDINĀTS']}
+
+        first = searcher.search_cached('2025-04-01', end_date)
+        assert first == searcher.search_date_range_parallel('2025-04-01', end_date)
+        assert searcher.search_cached('2025-04-01', end_date) == first
+        assert searcher.result_cache.stats()['hits'] == 1
+
+        # Jauns paziņojums - bez paaudzes maiņas kešs atgriež vecos rezultātus
+        folder = Path(workdir) / '01_04_2025'
+        content = (folder / '000000.xml').read_text(encoding='utf-8')
+        (folder / 'new.xml').write_text(content.replace('<id>000000</id>', '<id>999999</id>')
+                                        .replace('LDZ 2025/000000', 'LDZ 2025/999999'), encoding='utf-8')
+        assert len(searcher.search_cached('2025-04-01', end_date)) == len(first)
+
+        DataGeneration(workdir).bump()
+        assert len(searcher.search_cached('2025-04-01', end_date)) == len(first) + 1
+        assert searcher.result_cache.stats()['misses'] == 2
+        print(f"✅ Kešota meklēšana: {len(first)} rezultāti")
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_search_date_range_uses_cache():
+    """Lietotnes ieejas punkts search_date_range izmanto rezultātu kešu"""
+    workdir = tempfile.mkdtemp()
+    try:
+        end_date = build_corpus(workdir, days=2, per_day=6)
+        config = {'parse_cache': False, 'parallel_mode': 'thread', 'result_cache_mb': 1}
+        searcher = LokalaisMekletajs(config=config, xml_dir=workdir)
+        searcher.search_criteria = {'keywords': ['akumulators'], 'statuses': ['IZSLUDINĀTS']}
+
+        first = searcher.search_date_range('2025-04-01', end_date)
+        assert first and searcher.search_date_range('2025-04-01', end_date) == first
+        stats = searcher.result_cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+        print(f"✅ search_date_range caur kešu: {stats}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    test_cache_key_canonical()
+    test_lru_bytes_and_generation()
+    test_search_cached()
+    test_search_date_range_uses_cache()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Testē iterparse plūsmas režīmu - rezultātam jāsakrīt ar koka režīmu,
+bet atmiņā jāpaliek tikai vajadzīgajiem elementiem
+"""
+
+import os
+import tempfile
+import tracemalloc
+
+from local_procurement_searcher import ImprovedXMLParser, LokalaisMekletajs, USE_LXML
+from test_field_plans import TED_XML
+
+
+def write_temp_xml(content):
+    """Ieraksta XML pagaidu failā un atgriež ceļu"""
+    with tempfile.NamedTemporaryFile('w', suffix='.xml', encoding='utf-8', delete=False) as f:
+        f.write(content)
+    return f.name
+
+
+def make_many_lots_xml(lot_count):
+    """TED paziņojums ar daudzām lotēm un gariem aprakstiem"""
+    lots = ''.join(
+        f"<OBJECT_DESCR><LOT_NO>{i}</LOT_NO><TITLE>Lote {i}</TITLE>"
+        f"<CPV_ADDITIONAL><CPV_CODE CODE=\"37400000\"/></CPV_ADDITIONAL>"
+        f"<SHORT_DESCR>{'Sporta inventāra piegāde un uzstādīšana. ' * 40}</SHORT_DESCR>"
+        f"<INFO_ADD>Papildu informācija {i}</INFO_ADD>"
+        f"</OBJECT_DESCR>"
+        for i in range(1, lot_count + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><TED_EXPORT><FORM_SECTION><F02_2014>'
+        '<CONTRACTING_BODY><ADDRESS_CONTRACTING_BODY><OFFICIALNAME>Sporta pārvalde</OFFICIALNAME>'
+        '</ADDRESS_CONTRACTING_BODY></CONTRACTING_BODY>'
+        f'<OBJECT_CONTRACT><TITLE>Inventārs</TITLE>{lots}</OBJECT_CONTRACT>'
+        '</F02_2014></FORM_SECTION></TED_EXPORT>'
+    )
+
+
+def test_streaming_matches_tree():
+    """Plūsmas režīmam jāaizpilda tāda pati info vārdnīca kā koka režīmam"""
+    parser = ImprovedXMLParser()
+    ted_path = write_temp_xml(TED_XML)
+    lots_path = write_temp_xml(make_many_lots_xml(20))
+
+    try:
+        for path in ['768142.xml', ted_path, lots_path]:
+            tree_info = parser.parse_xml_comprehensive(path)
+            stream_info = parser.parse_xml_streaming(path)
+            assert tree_info == stream_info
+            print(f"✅ {os.path.basename(path)}: rezultāti sakrīt")
+    finally:
+        os.unlink(ted_path)
+        os.unlink(lots_path)
+
+
+def test_streaming_keeps_only_needed_elements():
+    """Atmiņā paliek tikai saglabātie elementi, nevis viss koks"""
+    parser = ImprovedXMLParser()
+    path = write_temp_xml(make_many_lots_xml(2000))
+
+    try:
+        total = sum(len(elem.text or '') for elem in parser.load_root(path).iter())
+        root, _ = parser._stream_root(path)
+        retained = sum(len(elem.text or '') for elem in root.iter())
+
+        print(f"Teksts: kopā {total} simboli, saglabāti {retained}")
+        assert retained < total / 10
+
+        if not USE_LXML:
+            tracemalloc.start()
+            parser.parse_xml_comprehensive(path)
+            tree_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            parser.parse_xml_streaming(path)
+            stream_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"Atmiņas maksimums: koks {tree_peak / 1e6:.1f} MB, plūsma {stream_peak / 1e6:.1f} MB")
+            assert stream_peak < tree_peak / 3
+    finally:
+        os.unlink(path)
+
+
+def test_streaming_only_for_large_files():
+    """Plūsmas režīms tikai failiem no streaming_parser_min_bytes, mazākiem - koka režīms"""
+    small_path = write_temp_xml(TED_XML)
+    large_path = write_temp_xml(make_many_lots_xml(200))
+    config = {'parse_cache': False, 'streaming_parser': True, 'streaming_parser_min_bytes': 64 * 1024}
+    searcher = LokalaisMekletajs(config=config, xml_dir=tempfile.gettempdir())
+    calls = []
+    for name in ('parse_xml_streaming', 'parse_xml_comprehensive'):
+        method = getattr(searcher.parser, name)
+        setattr(searcher.parser, name, lambda path, name=name, method=method: calls.append(name) or method(path))
+
+    try:
+        assert os.path.getsize(small_path) < 64 * 1024 <= os.path.getsize(large_path)
+        searcher.parse_notice(small_path)
+        searcher.parse_notice(large_path)
+        with open(large_path, 'rb') as f:
+            searcher.parse_raw(f.read())
+        assert calls == ['parse_xml_comprehensive', 'parse_xml_streaming', 'parse_xml_streaming']
+
+        searcher.streaming_parser = False
+        calls.clear()
+        searcher.parse_notice(large_path)
+        assert calls == ['parse_xml_comprehensive']
+        print("✅ Plūsmas režīms tikai lieliem failiem")
+    finally:
+        os.unlink(small_path)
+        os.unlink(large_path)
+
+
+if __name__ == "__main__":
+    test_streaming_matches_tree()
+    test_streaming_keeps_only_needed_elements()
+    test_streaming_only_for_large_files()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Testē str.translate normalizāciju un vienreiz aprēķināto dokumenta tekstu
+"""
+
+from local_procurement_searcher import LokalaisMekletajs
+from text_normalizer import NormalizedText, normalize_latvian_text
+
+REPLACEMENTS = {
+    'ā': 'a', 'č': 'c', 'ē': 'e', 'ģ': 'g', 'ī': 'i', 'ķ': 'k', 'ļ': 'l', 'ņ': 'n',
+    'š': 's', 'ū': 'u', 'ž': 'z', 'Ā': 'A', 'Č': 'C', 'Ē': 'E', 'Ģ': 'G', 'Ī': 'I',
+    'Ķ': 'K', 'Ļ': 'L', 'Ņ': 'N', 'Š': 'S', 'Ū': 'U', 'Ž': 'Z'
+}
+
+
+class CountingText(str):
+    """Virkne, kas skaita lower() izsaukumus"""
+    calls = 0
+
+    def lower(self):
+        CountingText.calls += 1
+        return str.lower(self)
+
+
+def replace_normalize(text):
+    """Iepriekšējā normalizācija ar secīgiem str.replace"""
+    for latvian, ascii in REPLACEMENTS.items():
+        text = text.replace(latvian, ascii)
+    return text.lower()
+
+
+def test_same_as_replace():
+    """Tulkošanas tabula dod to pašu, ko str.replace virkne"""
+    samples = ['ĀBOLS un ābele', 'Ģimnāzijas ŠĶĒPS', 'Ceļš ĶĪLIS žogs', 'ΟΔΟΣ ſ İ', '']
+    for text in samples + [''.join(REPLACEMENTS)]:
+        assert normalize_latvian_text(text) == replace_normalize(text)
+    print("✅ Normalizācija sakrīt")
+
+
+def test_document_text_computed_once():
+    """Atslēgvārdi, izslēgtie vārdi un fragmenti izmanto vienu dokumenta formu"""
+    searcher = LokalaisMekletajs(config={'parse_cache': False})
+    searcher.search_criteria = {'keywords': ['sporta inventārs', 'skola'], 'exclude_keywords': ['ēdināšana']}
+    criteria = searcher.get_compiled_criteria()
+
+    CountingText.calls = 0
+    doc = NormalizedText(CountingText('Skolu SPORTA INVENTĀRA piegāde'))
+    assert criteria.matched_keywords(doc) == ['sporta inventārs', 'skola']
+    assert not criteria.is_excluded(doc)
+    searcher.extract_context_snippets(doc, ['skola'])
+    assert CountingText.calls == 1
+    print(f"✅ lower() izsaukts {CountingText.calls} reizi")
+
+
+if __name__ == "__main__":
+    test_same_as_replace()
+    test_document_text_computed_once()
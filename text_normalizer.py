@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Latviešu teksta normalizācija meklēšanai - viena str.translate tabula
+un dokumenta teksts, kura mazo burtu un normalizētā forma tiek aprēķināta vienreiz
+"""
+
+# Garumzīmes un mīkstinājuma zīmes -> ASCII (mazajiem burtiem, jo teksts vispirms tiek pārveidots ar lower())
+LATVIAN_ASCII = str.maketrans({
+    'ā': 'a', 'č': 'c', 'ē': 'e', 'ģ': 'g',
+    'ī': 'i', 'ķ': 'k', 'ļ': 'l', 'ņ': 'n',
+    'š': 's', 'ū': 'u', 'ž': 'z'
+})
+
+
+def normalize_latvian_text(text):
+    """Normalizē latviešu tekstu meklēšanai (mazie burti, bez garumzīmēm)"""
+    if not text:
+        return ""
+    return text.lower().translate(LATVIAN_ASCII)
+
+
+class NormalizedText:
+    """Dokumenta teksts ar mazo burtu un normalizēto formu
+
+    Abas formas tiek aprēķinātas vienreiz un izmantotas atslēgvārdu,
+    izslēgto vārdu un konteksta fragmentu meklēšanā.
+    """
+
+    __slots__ = ('text', 'lower', 'normalized', 'stemmed')
+
+    def __init__(self, text):
+        self.text = text or ''
+        self.lower = self.text.lower()
+        self.normalized = self.lower.translate(LATVIAN_ASCII)
+        # Celmu režīma dati (aizpilda CompiledCriteria pēc vajadzības)
+        self.stemmed = None
+
+
+def as_normalized(text):
+    """NormalizedText no virknes (vai tas pats objekts, ja jau ir)"""
+    if isinstance(text, NormalizedText):
+        return text
+    return NormalizedText(text)